@@ -1,50 +1,128 @@
 from __future__ import annotations
 
+import json
 import logging
-import re
-from typing import List
-
-import requests
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+import os
+import time
+from typing import TYPE_CHECKING
 
+from backend.common import (
+    build_job_queue,
+    build_perplexity_client,
+    build_prewarmer,
+    build_summary_cache,
+    format_sse,
+    health_payload,
+    start_background_work,
+    normalize_keywords,
+    normalize_url_list,
+    SUMMARY_MODES,
+)
 from backend.config import settings
-from backend.services.perplexity_client import PerplexityClient
-from backend.services.search_service import research_by_keywords
-from backend.services.url_service import summarize_url
-from backend.services.wiki_service import force_summary, original_link, summarize_keyword
+
+if TYPE_CHECKING:
+    from flask import Flask
 
 
 logger = logging.getLogger(__name__)
 
 
 def create_app() -> Flask:
+    # Flask, requests and the services load here, not at import (see benchmarks/bench_startup.py).
+    # pylint: disable=import-outside-toplevel
+    import requests
+    from flask import Flask, Response, g, jsonify, request, stream_with_context
+    from flask_cors import CORS
+
+    from backend.services import metrics
+    from backend.services.batch_service import summarize_batch
+    from backend.services.content_fetcher import normalize_url
+    from backend.services.job_queue import TERMINAL_STATES, QueueFullError, parse_priority
+    from backend.services.long_summary import summarize_long_url
+    from backend.services.search_service import research_by_keywords
+    from backend.services.url_service import fast_summarize_url, stream_summarize_url, summarize_url
+    from backend.services.wiki_service import force_summary, search_keyword
+
     app = Flask(__name__)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
-    perplexity_error = None
-    client = None
-    if settings.perplexity_enabled:
-        try:
-            client = PerplexityClient(
-                api_key=settings.perplexity_api_key,
-                model=settings.perplexity_model,
-                temperature=settings.perplexity_temperature,
-                timeout=settings.request_timeout,
-            )
-        except ValueError as exc:
-            perplexity_error = str(exc)
-            logger.warning("Perplexity 클라이언트 초기화 실패: %s", exc)
-    else:
-        perplexity_error = "; ".join(settings.validation_errors)
-
+    client, perplexity_error = build_perplexity_client()
     app.config["perplexity_client"] = client
     app.config["perplexity_error"] = perplexity_error
+    app.config["summary_cache"] = build_summary_cache()
+    app.config["job_queue"] = build_job_queue(client, perplexity_error, app.config["summary_cache"])
+    app.config["prewarmer"] = build_prewarmer(client, perplexity_error, app.config["summary_cache"])
+
+    @app.before_request
+    def start_request_timer() -> None:
+        g.metrics_route = request.url_rule.rule if request.url_rule else "unmatched"
+        g.metrics_started = time.perf_counter()
+        metrics.begin_request(g.metrics_route)
+
+    @app.after_request
+    def record_request_timer(response: Response) -> Response:
+        # Streamed responses are measured up to their first byte.
+        elapsed = time.perf_counter() - g.metrics_started
+        metrics.observe_request(g.metrics_route, request.method, response.status_code, elapsed)
+        if settings.server_timing:
+            response.headers["Server-Timing"] = metrics.server_timing_header(elapsed)
+        return response
+
+    @app.teardown_request
+    def clear_request_timer(_exc) -> None:
+        metrics.end_request()
 
     @app.get("/health")
     def health() -> tuple:
-        client_ready = app.config["perplexity_client"] is not None
-        return jsonify({"status": "ok", "perplexity": client_ready, "detail": app.config.get("perplexity_error")})
+        return jsonify(
+            health_payload(
+                app.config["perplexity_client"],
+                app.config.get("perplexity_error"),
+                app.config.get("summary_cache"),
+                app.config.get("job_queue"),
+                app.config.get("prewarmer"),
+            )
+        )
+
+    def enqueue_job(kind: str, params: dict, raw_priority):
+        queue = app.config.get("job_queue")
+        if queue is None:
+            return jsonify({"error": "작업 대기열을 사용할 수 없습니다."}), 503
+        try:
+            job = queue.submit(kind, params, parse_priority(raw_priority))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except QueueFullError as exc:
+            return jsonify({"error": str(exc)}), 503, {"Retry-After": "5"}
+        status_url = f"/api/jobs/{job['jobId']}"
+        return jsonify({**job, "statusUrl": status_url}), 202, {"Location": status_url}
+
+    @app.get("/api/jobs/<job_id>")
+    def api_job_status(job_id: str):
+        queue = app.config.get("job_queue")
+        if queue is None:
+            return jsonify({"error": "작업 대기열을 사용할 수 없습니다."}), 503
+        wait = min(request.args.get("wait", default=0.0, type=float) or 0.0, settings.job_max_wait)
+        job = queue.wait(job_id, wait) if wait > 0 else queue.get(job_id)
+        if job is None:
+            return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+        return jsonify(job)
+
+    @app.delete("/api/jobs/<job_id>")
+    def api_job_cancel(job_id: str):
+        queue = app.config.get("job_queue")
+        if queue is None:
+            return jsonify({"error": "작업 대기열을 사용할 수 없습니다."}), 503
+        job = queue.get(job_id)
+        if job is None:
+            return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+        if job["status"] in TERMINAL_STATES:
+            return jsonify({**job, "error": job["error"] or "이미 끝난 작업입니다."}), 409
+        return jsonify(queue.cancel(job_id))
+
+    @app.get("/metrics")
+    def prometheus_metrics() -> Response:
+        return Response(metrics.render_prometheus(), content_type=metrics.CONTENT_TYPE)
 
     @app.post("/api/summarize-url")
     def api_summarize_url():
@@ -52,9 +130,27 @@ def create_app() -> Flask:
         url = (data.get("url") or "").strip()
         if not url:
             return jsonify({"error": "URL을 입력해 주세요."}), 400
+        mode = (data.get("mode") or "standard").strip().lower()
+        if mode not in SUMMARY_MODES:
+            return jsonify({"error": f"지원하지 않는 mode입니다: {mode}"}), 400
+        if data.get("async"):
+            try:
+                url = normalize_url(url)
+            except ValueError as exc:
+                return jsonify({"error": str(exc)}), 400
+            return enqueue_job("summarize", {"url": url, "mode": mode}, data.get("priority"))
         client = app.config.get("perplexity_client")
         try:
-            _, payload = summarize_url(url, client, app.config.get("perplexity_error"))
+            if mode == "fast":
+                _, payload = fast_summarize_url(url)
+                return jsonify(payload)
+            summarize = summarize_long_url if mode == "long" else summarize_url
+            _, payload = summarize(
+                url,
+                client,
+                app.config.get("perplexity_error"),
+                cache=app.config.get("summary_cache"),
+            )
             return jsonify(payload)
         except ValueError as exc:
             return jsonify({"error": str(exc)}), 400
@@ -65,14 +161,72 @@ def create_app() -> Flask:
             logger.exception("URL 요약 중 오류", exc_info=exc)
             return jsonify({"error": "요약 중 오류가 발생했습니다.", "detail": str(exc)}), 500
 
+    @app.route("/api/summarize-url/stream", methods=["GET", "POST"])
+    def api_summarize_url_stream():
+        if request.method == "POST":
+            data = request.get_json(force=True, silent=True) or {}
+            url = (data.get("url") or "").strip()
+        else:
+            url = (request.args.get("url") or "").strip()
+        if not url:
+            return jsonify({"error": "URL을 입력해 주세요."}), 400
+        try:
+            events = stream_summarize_url(
+                url,
+                app.config.get("perplexity_client"),
+                app.config.get("perplexity_error"),
+                cache=app.config.get("summary_cache"),
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except requests.RequestException as exc:
+            logger.warning("URL fetch 실패: %s", exc)
+            return jsonify({"error": "웹 페이지를 불러오지 못했습니다.", "detail": str(exc)}), 502
+
+        def generate():
+            try:
+                for event, data in events:
+                    yield format_sse(event, data)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception("스트리밍 요약 중 오류", exc_info=exc)
+                yield format_sse("error", {"error": "요약 중 오류가 발생했습니다.", "detail": str(exc)})
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.post("/api/summarize-url/batch")
+    def api_summarize_url_batch():
+        data = request.get_json(force=True, silent=True) or {}
+        urls = normalize_url_list(data.get("urls"))
+        if not urls:
+            return jsonify({"error": "URL 목록을 입력해 주세요."}), 400
+        stream = bool(data.get("stream")) or "application/x-ndjson" in request.headers.get("Accept", "")
+        try:
+            results = summarize_batch(
+                urls,
+                app.config.get("perplexity_client"),
+                app.config.get("perplexity_error"),
+                cache=app.config.get("summary_cache"),
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        if stream:
+            lines = (json.dumps(item, ensure_ascii=False) + "\n" for item in results)
+            return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+        ordered = sorted(results, key=lambda item: item["index"])
+        return jsonify({"results": ordered, "count": len(ordered)})
+
     @app.get("/api/wiki/search")
     def api_wiki_search():
         term = (request.args.get("term") or "").strip()
         lang = request.args.get("lang", "ko")
         if not term:
             return jsonify({"message": "검색어를 입력해 주세요."}), 400
-        result = summarize_keyword(term, lang=lang)
-        return jsonify(_normalize_wiki_response(result, term, lang))
+        return jsonify(search_keyword(term, lang=lang))
 
     @app.get("/api/wiki/force")
     def api_wiki_force():
@@ -96,6 +250,8 @@ def create_app() -> Flask:
         keywords = normalize_keywords(data.get("keywords"))
         if not keywords:
             return jsonify({"error": "최소 한 개의 키워드를 입력해 주세요."}), 400
+        if data.get("async"):
+            return enqueue_job("research", {"keywords": keywords}, data.get("priority"))
         client = app.config.get("perplexity_client")
         try:
             resources, meta = research_by_keywords(keywords, client, app.config.get("perplexity_error"))
@@ -109,60 +265,23 @@ def create_app() -> Flask:
     return app
 
 
-KEYWORD_SANITIZER = re.compile(r"[^0-9A-Za-z가-힣#\+\-\s]")
-
-
-def normalize_keywords(raw_keywords) -> List[str]:
-    tokens: List[str] = []
-    if isinstance(raw_keywords, str):
-        raw_items = raw_keywords.split(",")
-    elif isinstance(raw_keywords, list):
-        raw_items = raw_keywords
-    else:
-        raw_items = []
-
-    for item in raw_items:
-        token = str(item).strip()
-        if not token:
-            continue
-        tokens.append(token)
-
-    cleaned = []
-    for token in tokens:
-        normalized = KEYWORD_SANITIZER.sub(" ", token)
-        normalized = " ".join(normalized.split())
-        normalized = normalized.strip(" ,;/")
-        if normalized:
-            cleaned.append(normalized)
-    return cleaned
-
-
-def _normalize_wiki_response(result, keyword: str, lang: str) -> dict:
-    if isinstance(result, dict) and result.get("disambiguation"):
-        return {
-            "summary": None,
-            "url": None,
-            "options": result.get("options", []),
-            "message": result.get("message", "검색어가 모호합니다."),
-        }
-
-    summary = result if isinstance(result, str) else None
-    url = None
-    message = None
-    if summary and not summary.startswith("검색 결과") and not summary.startswith("알 수"):
-        try:
-            url = original_link(keyword, lang)
-        except Exception:
-            url = None
-    else:
-        message = summary
-        summary = None
-
-    return {"summary": summary, "url": url, "options": None, "message": message}
+def __getattr__(name: str):
+    # ``app`` is built on first access (``from backend.app import app``), not when the module is imported.
+    if name == "app":
+        global app  # pylint: disable=global-variable-undefined
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-app = create_app()
+def run_dev_server() -> None:
+    """Single-process development server with the reloader; no prewarming."""
+    dev_app = create_app()
+    # The reloader's file-watching parent never serves requests, so only its child runs job workers.
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_background_work(dev_app.config["job_queue"], None)
+    dev_app.run(host="0.0.0.0", port=settings.backend_port, debug=True)
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=settings.backend_port, debug=True)
+    run_dev_server()
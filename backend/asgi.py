@@ -0,0 +1,239 @@
+"""ASGI (Quart) entry point serving the same API as :mod:`backend.app` on asyncio.
+
+Fetches and Perplexity calls await the shared httpx client instead of holding a
+thread, so one process can keep many slow upstream calls in flight.
+
+    uvicorn backend.asgi:app --port 8000
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import requests
+from quart import Quart, Response, g, jsonify, request
+from quart_cors import cors
+
+from backend.common import (
+    build_job_queue,
+    build_perplexity_client,
+    build_prewarmer,
+    build_summary_cache,
+    health_payload,
+    start_background_work,
+    warm_up,
+    normalize_keywords,
+    SUMMARY_MODES,
+)
+from backend.config import settings
+from backend.services import metrics
+from backend.services.async_http import aclose_async_clients, get_async_client
+from backend.services.content_fetcher import normalize_url
+from backend.services.job_queue import TERMINAL_STATES, JobQueue, QueueFullError, parse_priority
+from backend.services.long_summary import asummarize_long_url
+from backend.services.search_service import aresearch_by_keywords
+from backend.services.url_service import afast_summarize_url, asummarize_url
+from backend.services.wiki_service import aforce_summary, asearch_keyword
+
+
+logger = logging.getLogger(__name__)
+
+# How often a long-polling job request re-reads the job row.
+JOB_POLL_INTERVAL = 0.25
+
+
+async def await_job(queue: JobQueue, job_id: str, timeout: float) -> Optional[dict]:
+    """Long-poll on the event loop: each check is a short read, so waiting clients hold no executor thread."""
+    deadline = time.monotonic() + max(0.0, timeout)
+    while True:
+        job = await asyncio.to_thread(queue.get, job_id)
+        remaining = deadline - time.monotonic()
+        if job is None or job["status"] in TERMINAL_STATES or remaining <= 0:
+            return job
+        await asyncio.sleep(min(remaining, JOB_POLL_INTERVAL))
+
+
+def create_asgi_app() -> Quart:
+    app = cors(Quart(__name__), allow_origin="*")
+
+    client, perplexity_error = build_perplexity_client()
+    app.config["perplexity_client"] = client
+    app.config["perplexity_error"] = perplexity_error
+    app.config["summary_cache"] = build_summary_cache()
+    app.config["job_queue"] = build_job_queue(client, perplexity_error, app.config["summary_cache"])
+    app.config["prewarmer"] = build_prewarmer(client, perplexity_error, app.config["summary_cache"])
+
+    @app.before_serving
+    async def start_background() -> None:
+        # Seeds are warmed before the server accepts connections; queued or orphaned jobs resume.
+        if settings.warm_up:
+            await asyncio.to_thread(warm_up)
+            get_async_client()
+        await asyncio.to_thread(start_background_work, app.config["job_queue"], app.config["prewarmer"])
+
+    @app.after_serving
+    async def close_clients() -> None:
+        await aclose_async_clients()
+        if app.config["prewarmer"] is not None:
+            app.config["prewarmer"].stop()
+        if app.config["job_queue"] is not None:
+            await asyncio.to_thread(app.config["job_queue"].stop, settings.wsgi_graceful_timeout)
+
+    @app.before_request
+    async def start_request_timer() -> None:
+        g.metrics_route = request.url_rule.rule if request.url_rule else "unmatched"
+        g.metrics_started = time.perf_counter()
+        metrics.begin_request(g.metrics_route)
+
+    @app.after_request
+    async def record_request_timer(response: Response) -> Response:
+        elapsed = time.perf_counter() - g.metrics_started
+        metrics.observe_request(g.metrics_route, request.method, response.status_code, elapsed)
+        if settings.server_timing:
+            response.headers["Server-Timing"] = metrics.server_timing_header(elapsed)
+        return response
+
+    @app.get("/health")
+    async def health():
+        return jsonify(
+            health_payload(
+                app.config["perplexity_client"],
+                app.config.get("perplexity_error"),
+                app.config.get("summary_cache"),
+                app.config.get("job_queue"),
+                app.config.get("prewarmer"),
+            )
+        )
+
+    # Job queue calls are SQLite transactions (submit may wait on the write lock), so they run off the loop.
+    async def enqueue_job(kind: str, params: dict, raw_priority):
+        queue = app.config.get("job_queue")
+        if queue is None:
+            return jsonify({"error": "작업 대기열을 사용할 수 없습니다."}), 503
+        try:
+            job = await asyncio.to_thread(queue.submit, kind, params, parse_priority(raw_priority))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except QueueFullError as exc:
+            return jsonify({"error": str(exc)}), 503, {"Retry-After": "5"}
+        status_url = f"/api/jobs/{job['jobId']}"
+        return jsonify({**job, "statusUrl": status_url}), 202, {"Location": status_url}
+
+    @app.get("/api/jobs/<job_id>")
+    async def api_job_status(job_id: str):
+        queue = app.config.get("job_queue")
+        if queue is None:
+            return jsonify({"error": "작업 대기열을 사용할 수 없습니다."}), 503
+        wait = min(request.args.get("wait", default=0.0, type=float) or 0.0, settings.job_max_wait)
+        job = await await_job(queue, job_id, wait)
+        if job is None:
+            return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+        return jsonify(job)
+
+    @app.delete("/api/jobs/<job_id>")
+    async def api_job_cancel(job_id: str):
+        queue = app.config.get("job_queue")
+        if queue is None:
+            return jsonify({"error": "작업 대기열을 사용할 수 없습니다."}), 503
+        job = await asyncio.to_thread(queue.get, job_id)
+        if job is None:
+            return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+        if job["status"] in TERMINAL_STATES:
+            return jsonify({**job, "error": job["error"] or "이미 끝난 작업입니다."}), 409
+        return jsonify(await asyncio.to_thread(queue.cancel, job_id))
+
+    @app.get("/metrics")
+    async def prometheus_metrics():
+        return Response(metrics.render_prometheus(), content_type=metrics.CONTENT_TYPE)
+
+    @app.post("/api/summarize-url")
+    async def api_summarize_url():
+        data = await request.get_json(force=True, silent=True) or {}
+        url = (data.get("url") or "").strip()
+        if not url:
+            return jsonify({"error": "URL을 입력해 주세요."}), 400
+        mode = (data.get("mode") or "standard").strip().lower()
+        if mode not in SUMMARY_MODES:
+            return jsonify({"error": f"지원하지 않는 mode입니다: {mode}"}), 400
+        if data.get("async"):
+            try:
+                url = normalize_url(url)
+            except ValueError as exc:
+                return jsonify({"error": str(exc)}), 400
+            return await enqueue_job("summarize", {"url": url, "mode": mode}, data.get("priority"))
+        try:
+            if mode == "fast":
+                _, payload = await afast_summarize_url(url)
+                return jsonify(payload)
+            summarize = asummarize_long_url if mode == "long" else asummarize_url
+            _, payload = await summarize(
+                url,
+                app.config.get("perplexity_client"),
+                app.config.get("perplexity_error"),
+                cache=app.config.get("summary_cache"),
+            )
+            return jsonify(payload)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except requests.RequestException as exc:
+            logger.warning("URL fetch 실패: %s", exc)
+            return jsonify({"error": "웹 페이지를 불러오지 못했습니다.", "detail": str(exc)}), 502
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("URL 요약 중 오류", exc_info=exc)
+            return jsonify({"error": "요약 중 오류가 발생했습니다.", "detail": str(exc)}), 500
+
+    @app.get("/api/wiki/search")
+    async def api_wiki_search():
+        term = (request.args.get("term") or "").strip()
+        lang = request.args.get("lang", "ko")
+        if not term:
+            return jsonify({"message": "검색어를 입력해 주세요."}), 400
+        return jsonify(await asearch_keyword(term, lang=lang))
+
+    @app.get("/api/wiki/force")
+    async def api_wiki_force():
+        term = (request.args.get("term") or "").strip()
+        lang = request.args.get("lang", "ko")
+        if not term:
+            return jsonify({"message": "검색어를 입력해 주세요."}), 400
+        summary, url = await aforce_summary(term, lang=lang)
+        return jsonify(
+            {
+                "summary": summary,
+                "url": url,
+                "options": None,
+                "message": None if url else "다른 키워드를 시도해 주세요.",
+            }
+        )
+
+    @app.post("/api/resources/search")
+    async def api_resource_search():
+        data = await request.get_json(force=True, silent=True) or {}
+        keywords = normalize_keywords(data.get("keywords"))
+        if not keywords:
+            return jsonify({"error": "최소 한 개의 키워드를 입력해 주세요."}), 400
+        if data.get("async"):
+            return await enqueue_job("research", {"keywords": keywords}, data.get("priority"))
+        try:
+            resources, meta = await aresearch_by_keywords(
+                keywords, app.config.get("perplexity_client"), app.config.get("perplexity_error")
+            )
+            return jsonify({"results": resources, **meta})
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("키워드 탐색 실패", exc_info=exc)
+            return jsonify({"error": "자료를 불러오지 못했습니다.", "detail": str(exc)}), 500
+
+    return app
+
+
+def __getattr__(name: str):
+    # Built on first access, e.g. when uvicorn resolves ``backend.asgi:app``.
+    if name == "app":
+        global app  # pylint: disable=global-variable-undefined
+        app = create_asgi_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,234 @@
+"""Framework-agnostic pieces shared by the Flask (WSGI) and Quart (ASGI) apps.
+
+The builders import the services they construct, so importing this module (and
+:mod:`backend.app`) does not pull in ``requests`` and the rest of the service graph.
+"""
+# pylint: disable=import-outside-toplevel
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from backend.config import settings
+
+if TYPE_CHECKING:
+    from backend.services.cache import SummaryCache
+    from backend.services.job_queue import JobQueue
+    from backend.services.perplexity_client import PerplexityClient
+    from backend.services.prewarm import Prewarmer
+
+
+logger = logging.getLogger(__name__)
+
+
+def build_perplexity_client() -> Tuple[Optional[PerplexityClient], Optional[str]]:
+    """Return the configured client, or ``None`` plus the reason it is unavailable."""
+    from backend.services.perplexity_client import PerplexityClient
+
+    if not settings.perplexity_enabled:
+        return None, "; ".join(settings.validation_errors)
+    try:
+        client = PerplexityClient(
+            api_key=settings.perplexity_api_key,
+            model=settings.perplexity_model,
+            temperature=settings.perplexity_temperature,
+            api_url=settings.perplexity_api_url,
+        )
+    except ValueError as exc:
+        logger.warning("Perplexity 클라이언트 초기화 실패: %s", exc)
+        return None, str(exc)
+    return client, None
+
+
+def health_payload(
+    client: Optional[PerplexityClient],
+    client_error: Optional[str],
+    summary_cache: Optional[SummaryCache],
+    job_queue: Optional[JobQueue] = None,
+    prewarmer: Optional[Prewarmer] = None,
+) -> dict:
+    from backend.services.content_fetcher import attempt_stats
+    from backend.services.http_session import pool_stats
+    from backend.services.perplexity_client import perplexity_guard
+    from backend.services.singleflight import flight_stats
+    from backend.services.wiki_service import wiki_cache_stats
+
+    return {
+        "status": "ok",
+        "perplexity": client is not None,
+        "detail": client_error,
+        "httpPools": pool_stats(),
+        "fetchAttempts": attempt_stats.to_dict(),
+        "summaryCache": summary_cache.stats() if summary_cache else None,
+        "wikiCache": wiki_cache_stats(),
+        "singleFlight": flight_stats(),
+        "perplexityGuard": perplexity_guard().to_dict(),
+        "jobs": job_queue.stats() if job_queue else None,
+        "prewarm": prewarmer.to_dict() if prewarmer else None,
+    }
+
+
+def drain_upstream(timeout: float) -> bool:
+    """Wait for in-flight Perplexity calls to finish, then close pooled sessions."""
+    from backend.services.http_session import close_sessions
+    from backend.services.perplexity_client import perplexity_guard
+
+    guard = perplexity_guard()
+    drained = guard.drain(timeout)
+    if not drained:
+        logger.warning("종료 전 Perplexity 호출 %d건이 끝나지 않았습니다.", guard.inflight)
+    close_sessions()
+    return drained
+
+
+def build_summary_cache() -> SummaryCache | None:
+    from backend.services.cache import SummaryCache, create_cache
+
+    if settings.summary_cache_backend.lower() == "none":
+        return None
+    try:
+        backend = create_cache(
+            settings.summary_cache_backend,
+            max_entries=settings.summary_cache_max_entries,
+            ttl=settings.summary_cache_ttl,
+            path=settings.summary_cache_path,
+        )
+    except (ValueError, OSError, sqlite3.Error) as exc:
+        logger.warning("요약 캐시 초기화 실패, 캐시 없이 동작합니다: %s", exc)
+        return None
+    return SummaryCache(backend)
+
+
+def build_job_queue(
+    client: Optional[PerplexityClient],
+    client_error: Optional[str],
+    summary_cache: Optional[SummaryCache],
+) -> JobQueue | None:
+    """Queue for ``"async": true`` requests; its handlers run the same services as the sync routes."""
+    if not settings.job_queue_enabled:
+        return None
+    from backend.services.job_queue import JobQueue
+    from backend.services.long_summary import summarize_long_url
+    from backend.services.search_service import research_by_keywords
+    from backend.services.url_service import fast_summarize_url, summarize_url
+
+    def summarize(params: dict) -> dict:
+        if params.get("mode") == "fast":
+            return fast_summarize_url(params["url"])[1]
+        summarize_fn = summarize_long_url if params.get("mode") == "long" else summarize_url
+        return summarize_fn(params["url"], client, client_error, cache=summary_cache)[1]
+
+    def research(params: dict) -> dict:
+        resources, meta = research_by_keywords(params["keywords"], client, client_error)
+        return {"results": resources, **meta}
+
+    handlers: Dict[str, Callable[[dict], dict]] = {"summarize": summarize, "research": research}
+    try:
+        return JobQueue(
+            settings.job_db_path,
+            handlers,
+            workers=settings.job_workers,
+            lease=settings.job_lease,
+            max_attempts=settings.job_max_attempts,
+            max_queued=settings.job_max_queued,
+            ttl=settings.job_ttl,
+        )
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("작업 대기열 초기화 실패, 비동기 요청을 받지 않습니다: %s", exc)
+        return None
+
+
+def build_prewarmer(
+    client: Optional[PerplexityClient],
+    client_error: Optional[str],
+    summary_cache: Optional[SummaryCache],
+) -> Prewarmer | None:
+    if not settings.prewarm_enabled:
+        return None
+    from backend.services.prewarm import Prewarmer
+
+    return Prewarmer(
+        client,
+        client_error,
+        summary_cache,
+        budget_per_minute=settings.prewarm_budget_per_minute,
+        interval=settings.prewarm_interval,
+        top_n=settings.prewarm_top_n,
+        ahead=settings.prewarm_ahead,
+        min_hits=settings.prewarm_min_hits,
+    )
+
+
+WARM_UP_TEXT = " ".join(
+    f"Warm-up sentence {index} keeps the first real summary from paying for imports." for index in range(8)
+)
+
+
+def warm_up() -> None:
+    """Load what the first request would otherwise pay for: NumPy, the HTML extractor and the upstream guard.
+
+    Everything here is built lazily anyway; this only moves the cost to startup.
+    """
+    from backend.services.extractive import summarize_extractive
+    from backend.services.extractors import get_extractor
+    from backend.services.perplexity_client import perplexity_guard
+
+    get_extractor(settings.extractor_backend)
+    summarize_extractive("warm-up", WARM_UP_TEXT, max_sentences=2)
+    perplexity_guard()
+
+
+def start_background_work(job_queue: Optional[JobQueue], prewarmer: Optional[Prewarmer]) -> None:
+    """Per-process startup: warm the seed list (blocking, before traffic), then start the workers."""
+    if prewarmer is not None:
+        prewarmer.warm_seeds(settings.prewarm_seed_path, settings.prewarm_seed_timeout)
+        prewarmer.start()
+    if job_queue is not None:
+        job_queue.start()
+
+
+SUMMARY_MODES = ("standard", "long", "fast")
+KEYWORD_SANITIZER = re.compile(r"[^0-9A-Za-z가-힣#\+\-\s]")
+
+
+def normalize_keywords(raw_keywords) -> List[str]:
+    tokens: List[str] = []
+    if isinstance(raw_keywords, str):
+        raw_items = raw_keywords.split(",")
+    elif isinstance(raw_keywords, list):
+        raw_items = raw_keywords
+    else:
+        raw_items = []
+
+    for item in raw_items:
+        token = str(item).strip()
+        if not token:
+            continue
+        tokens.append(token)
+
+    cleaned = []
+    for token in tokens:
+        normalized = KEYWORD_SANITIZER.sub(" ", token)
+        normalized = " ".join(normalized.split())
+        normalized = normalized.strip(" ,;/")
+        if normalized:
+            cleaned.append(normalized)
+    return cleaned
+
+
+def normalize_url_list(raw_urls) -> List[str]:
+    if isinstance(raw_urls, str):
+        raw_items = raw_urls.split()
+    elif isinstance(raw_urls, list):
+        raw_items = raw_urls
+    else:
+        raw_items = []
+    return [str(item).strip() for item in raw_items if str(item).strip()]
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Serialize one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
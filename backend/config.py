@@ -15,8 +15,85 @@ class Settings:
     perplexity_api_key: str = os.getenv("PERPLEXITY_API_KEY", "")
     perplexity_model: str = os.getenv("PERPLEXITY_MODEL", "llama-3.1-sonar-small-128k-chat")
     perplexity_temperature: float = float(os.getenv("PERPLEXITY_TEMPERATURE", "0.2"))
+    perplexity_api_url: str = os.getenv("PERPLEXITY_API_URL", "https://api.perplexity.ai/chat/completions")
     backend_port: int = int(os.getenv("BACKEND_PORT", "8000"))
     request_timeout: int = int(os.getenv("REQUEST_TIMEOUT", "20"))
+    warm_up: bool = os.getenv("WARM_UP", "true").lower() == "true"
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    server_timing: bool = os.getenv("SERVER_TIMING", "false").lower() == "true"
+    wsgi_workers: int = int(os.getenv("WSGI_WORKERS", "0"))
+    wsgi_threads: int = int(os.getenv("WSGI_THREADS", "16"))
+    wsgi_timeout: int = int(os.getenv("WSGI_TIMEOUT", "120"))
+    wsgi_graceful_timeout: int = int(os.getenv("WSGI_GRACEFUL_TIMEOUT", "30"))
+    wsgi_keepalive: int = int(os.getenv("WSGI_KEEPALIVE", "5"))
+    wsgi_max_requests: int = int(os.getenv("WSGI_MAX_REQUESTS", "0"))
+    http_pool_connections: int = int(os.getenv("HTTP_POOL_CONNECTIONS", "32"))
+    http_pool_maxsize: int = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+    http_pool_block: bool = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+    http_keepalive_timeout: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))
+    fetch_streaming: bool = os.getenv("FETCH_STREAMING", "true").lower() == "true"
+    fetch_max_bytes: int = int(os.getenv("FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+    fetch_chunk_size: int = int(os.getenv("FETCH_CHUNK_SIZE", str(64 * 1024)))
+    fetch_text_budget: int = int(os.getenv("FETCH_TEXT_BUDGET", "20000"))
+    fetch_hedge: bool = os.getenv("FETCH_HEDGE", "false").lower() == "true"
+    fetch_hedge_delay: float = float(os.getenv("FETCH_HEDGE_DELAY", "1.0"))
+    fetch_deadline: float = float(os.getenv("FETCH_DEADLINE", "15"))
+    fetch_hedge_workers: int = int(os.getenv("FETCH_HEDGE_WORKERS", "32"))
+    extractor_backend: str = os.getenv("EXTRACTOR_BACKEND", "bs4")
+    fetch_validator_max_entries: int = int(os.getenv("FETCH_VALIDATOR_MAX_ENTRIES", "512"))
+    fetch_validator_ttl: float = float(os.getenv("FETCH_VALIDATOR_TTL", "86400"))
+    batch_max_urls: int = int(os.getenv("BATCH_MAX_URLS", "500"))
+    batch_fetch_concurrency: int = int(os.getenv("BATCH_FETCH_CONCURRENCY", "16"))
+    batch_per_host_concurrency: int = int(os.getenv("BATCH_PER_HOST_CONCURRENCY", "2"))
+    batch_llm_concurrency: int = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+    batch_result_timeout: float = float(os.getenv("BATCH_RESULT_TIMEOUT", "120"))
+    summary_cache_backend: str = os.getenv("SUMMARY_CACHE_BACKEND", "memory")
+    summary_cache_path: str = os.getenv("SUMMARY_CACHE_PATH", "summary_cache.sqlite3")
+    summary_cache_ttl: float = float(os.getenv("SUMMARY_CACHE_TTL", "3600"))
+    summary_cache_max_entries: int = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "2048"))
+    wiki_api_url: str = os.getenv("WIKI_API_URL", "https://{lang}.wikipedia.org/w/api.php")
+    wiki_timeout: float = float(os.getenv("WIKI_TIMEOUT", "10"))
+    wiki_cache_max_entries: int = int(os.getenv("WIKI_CACHE_MAX_ENTRIES", "1024"))
+    wiki_cache_ttl: float = float(os.getenv("WIKI_CACHE_TTL", "21600"))
+    wiki_cache_negative_ttl: float = float(os.getenv("WIKI_CACHE_NEGATIVE_TTL", "600"))
+    research_group_size: int = int(os.getenv("RESEARCH_GROUP_SIZE", "3"))
+    research_concurrency: int = int(os.getenv("RESEARCH_CONCURRENCY", "4"))
+    research_cache_ttl: float = float(os.getenv("RESEARCH_CACHE_TTL", "21600"))
+    research_cache_max_entries: int = int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", "1024"))
+    perplexity_rate_per_minute: float = float(os.getenv("PERPLEXITY_RATE_PER_MINUTE", "50"))
+    perplexity_burst: int = int(os.getenv("PERPLEXITY_BURST", "5"))
+    perplexity_max_attempts: int = int(os.getenv("PERPLEXITY_MAX_ATTEMPTS", "3"))
+    perplexity_retry_deadline: float = float(os.getenv("PERPLEXITY_RETRY_DEADLINE", "45"))
+    perplexity_backoff_base: float = float(os.getenv("PERPLEXITY_BACKOFF_BASE", "0.5"))
+    perplexity_backoff_max: float = float(os.getenv("PERPLEXITY_BACKOFF_MAX", "8"))
+    perplexity_breaker_threshold: int = int(os.getenv("PERPLEXITY_BREAKER_THRESHOLD", "5"))
+    perplexity_breaker_reset: float = float(os.getenv("PERPLEXITY_BREAKER_RESET", "30"))
+    prompt_token_budget: int = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+    extractive_sentences: int = int(os.getenv("EXTRACTIVE_SENTENCES", "5"))
+    extractive_method: str = os.getenv("EXTRACTIVE_METHOD", "textrank")
+    extractive_max_candidates: int = int(os.getenv("EXTRACTIVE_MAX_CANDIDATES", "300"))
+    long_text_budget: int = int(os.getenv("LONG_TEXT_BUDGET", "200000"))
+    long_chunk_tokens: int = int(os.getenv("LONG_CHUNK_TOKENS", "1500"))
+    long_max_chunks: int = int(os.getenv("LONG_MAX_CHUNKS", "8"))
+    long_map_concurrency: int = int(os.getenv("LONG_MAP_CONCURRENCY", "8"))
+    job_queue_enabled: bool = os.getenv("JOB_QUEUE_ENABLED", "true").lower() == "true"
+    job_db_path: str = os.getenv("JOB_DB_PATH", "jobs.sqlite3")
+    job_workers: int = int(os.getenv("JOB_WORKERS", "4"))
+    job_lease: float = float(os.getenv("JOB_LEASE", "30"))
+    job_max_attempts: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    job_max_queued: int = int(os.getenv("JOB_MAX_QUEUED", "1000"))
+    job_ttl: float = float(os.getenv("JOB_TTL", "86400"))
+    job_max_wait: float = float(os.getenv("JOB_MAX_WAIT", "30"))
+    prewarm_enabled: bool = os.getenv("PREWARM_ENABLED", "false").lower() == "true"
+    prewarm_interval: float = float(os.getenv("PREWARM_INTERVAL", "60"))
+    prewarm_top_n: int = int(os.getenv("PREWARM_TOP_N", "50"))
+    prewarm_ahead: float = float(os.getenv("PREWARM_AHEAD", "300"))
+    prewarm_min_hits: float = float(os.getenv("PREWARM_MIN_HITS", "2"))
+    prewarm_budget_per_minute: float = float(os.getenv("PREWARM_BUDGET_PER_MINUTE", "10"))
+    prewarm_seed_path: str = os.getenv("PREWARM_SEED_PATH", "")
+    prewarm_seed_timeout: float = float(os.getenv("PREWARM_SEED_TIMEOUT", "60"))
+    prewarm_max_tracked: int = int(os.getenv("PREWARM_MAX_TRACKED", "2000"))
+    prewarm_half_life: float = float(os.getenv("PREWARM_HALF_LIFE", "3600"))
     validation_errors: List[str] = field(default_factory=list, init=False)
 
     def __post_init__(self) -> None:
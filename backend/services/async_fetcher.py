@@ -0,0 +1,212 @@
+"""asyncio counterpart of :mod:`content_fetcher` built on the shared httpx client.
+
+It shares the attempt list, validator store, body reader and attempt stats with
+the sync fetcher, so both paths return identical :class:`FetchedPage` objects.
+The body is always read incrementally.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from backend.config import settings
+
+from .async_http import get_async_client
+from .metrics import observe_stage
+from .singleflight import get_flight
+from .content_fetcher import (
+    FetchedPage,
+    _BodyReader,
+    _build_attempts,
+    _conditional_headers,
+    _remember_validators,
+    _revalidated_page,
+    _usable_validators,
+    _validators,
+    attempt_stats,
+    normalize_url,
+)
+
+if TYPE_CHECKING:
+    import httpx
+
+
+async def afetch_page(url: str, timeout: int = 8, text_budget: Optional[int] = None) -> FetchedPage:
+    text_budget = text_budget or settings.fetch_text_budget
+    normalized = normalize_url(url)
+    return await get_flight("fetch").ado(
+        (normalized, True, text_budget), lambda: _afetch_page(url, normalized, timeout, text_budget)
+    )
+
+
+async def _afetch_page(url: str, normalized: str, timeout: int, text_budget: int) -> FetchedPage:
+    stored = _usable_validators(_validators.get(normalized), text_budget)
+    attempts = _build_attempts(normalized, _conditional_headers(stored))
+
+    if settings.fetch_hedge:
+        response, records, last_exc = await _request_hedged(attempts, timeout)
+    else:
+        response, records, last_exc = await _request_sequential(attempts, timeout)
+    winner = next((r["attempt"] for r in records if r.get("winner")), None)
+    attempt_stats.record(records, winner)
+
+    if response is None:
+        detail = f"{last_exc}" if last_exc else "알 수 없는 오류"
+        raise ValueError(f"웹 페이지를 불러오지 못했습니다: {detail}")
+
+    try:
+        if response.status_code == 304 and stored is not None:
+            _validators.set(normalized, stored)
+            return _revalidated_page(stored, records, text_budget)
+        reader = _BodyReader(response.headers, response.url, text_budget, original_url=url)
+        async for chunk in response.aiter_bytes(settings.fetch_chunk_size):
+            if reader.feed(chunk):
+                break
+    finally:
+        await response.aclose()
+    page = reader.finish(url)
+    _remember_validators(response, [normalized, page.final_url], page, text_budget)
+    page.attempts = records
+    return page
+
+
+async def _try_attempt(
+    name: str, candidate_url: str, headers: dict, timeout: int
+) -> Tuple[Optional[httpx.Response], dict, Optional[Exception]]:
+    # Loaded with the first async fetch; the WSGI app never imports httpx.
+    import httpx  # pylint: disable=import-outside-toplevel
+
+    started = time.perf_counter()
+    record = {"attempt": name, "url": candidate_url, "status": None, "outcome": "error"}
+    response: httpx.Response | None = None
+    exc: Exception | None = None
+    client = get_async_client()
+    try:
+        request = client.build_request(
+            "GET", candidate_url, headers=headers, timeout=httpx.Timeout(timeout, connect=5)
+        )
+        response = await client.send(request, stream=True)
+        record["status"] = response.status_code
+        if response.status_code == 403:
+            # Try next header set
+            await response.aclose()
+            response = None
+            record["outcome"] = "forbidden"
+        else:
+            if response.status_code != 304:
+                response.raise_for_status()
+            record["outcome"] = "ok"
+    except (httpx.HTTPError, httpx.InvalidURL, UnicodeError) as error:
+        # Neither InvalidURL nor an IDNA error (UnicodeError) is an HTTPError; for the same
+        # URLs requests fails the attempt with a RequestException, so record them the same way.
+        exc = error
+        if response is not None:
+            await response.aclose()
+        response = None
+    except asyncio.CancelledError:
+        if response is not None:
+            await response.aclose()
+        raise
+    elapsed = time.perf_counter() - started
+    record["elapsedMs"] = round(elapsed * 1000, 1)
+    observe_stage("fetch_attempt", elapsed, record["outcome"])
+    return response, record, exc
+
+
+async def _request_sequential(
+    attempts: List[Tuple[str, str, dict]], timeout: int
+) -> Tuple[Optional[httpx.Response], List[dict], Optional[Exception]]:
+    records: List[dict] = []
+    last_exc: Exception | None = None
+    for name, candidate_url, headers in attempts:
+        response, record, exc = await _try_attempt(name, candidate_url, headers, timeout)
+        records.append(record)
+        last_exc = exc or last_exc
+        if response is not None:
+            record["winner"] = True
+            return response, records, last_exc
+    return None, records, last_exc
+
+
+async def _request_hedged(
+    attempts: List[Tuple[str, str, dict]], timeout: int
+) -> Tuple[Optional[httpx.Response], List[dict], Optional[Exception]]:
+    """Same policy as ``content_fetcher._request_hedged``, but losers are really cancelled."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + settings.fetch_deadline
+    tasks: List[asyncio.Task] = []
+    task_info: dict = {}
+    consumed: set = set()
+    records: List[dict] = []
+    last_exc: Exception | None = None
+    winner: httpx.Response | None = None
+
+    def elapsed_ms() -> float:
+        return round((loop.time() - started) * 1000, 1)
+
+    def launch() -> None:
+        name, candidate_url, headers = attempts[len(tasks)]
+        task = asyncio.create_task(_try_attempt(name, candidate_url, headers, timeout))
+        task_info[task] = (name, candidate_url, elapsed_ms())
+        tasks.append(task)
+
+    launch()
+    next_hedge_at = started + settings.fetch_hedge_delay
+    try:
+        while winner is None:
+            for task in tasks:
+                if task in consumed or not task.done():
+                    continue
+                consumed.add(task)
+                response, record, exc = task.result()
+                record["startedAtMs"] = task_info[task][2]
+                records.append(record)
+                last_exc = exc or last_exc
+                if response is None:
+                    continue
+                if winner is None:
+                    record["winner"] = True
+                    winner = response
+                else:
+                    await response.aclose()
+                    record["outcome"] = "cancelled"
+            if winner is not None:
+                break
+            running = [t for t in tasks if not t.done()]
+            can_hedge = len(tasks) < len(attempts)
+            now = loop.time()
+            if (not running and not can_hedge) or now >= deadline:
+                break
+            if can_hedge and (not running or now >= next_hedge_at):
+                launch()
+                next_hedge_at = now + settings.fetch_hedge_delay
+                continue
+            wait_for = deadline - now
+            if can_hedge:
+                wait_for = min(wait_for, next_hedge_at - now)
+            await asyncio.wait(running, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            if task in consumed:
+                continue
+            if task.done() and not task.cancelled():
+                late_response, _, _ = task.result()
+                if late_response is not None:
+                    await late_response.aclose()
+            task.cancel()
+            name, candidate_url, started_ms = task_info[task]
+            records.append(
+                {
+                    "attempt": name,
+                    "url": candidate_url,
+                    "status": None,
+                    "outcome": "cancelled" if winner is not None else "deadline",
+                    "elapsedMs": round(elapsed_ms() - started_ms, 1),
+                    "startedAtMs": started_ms,
+                }
+            )
+    if winner is None and loop.time() >= deadline:
+        last_exc = TimeoutError(f"{settings.fetch_deadline}초 안에 응답이 없습니다.")
+    return winner, records, last_exc
@@ -0,0 +1,43 @@
+"""Shared pooled ``httpx.AsyncClient`` for the asyncio service layer."""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Dict
+
+from backend.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+
+_clients: Dict[int, "httpx.AsyncClient"] = {}
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the client bound to the running event loop, creating it on first use.
+
+    httpx clients cannot be shared across event loops, so there is one per loop.
+    httpx itself is imported here, so the WSGI app never loads it.
+    """
+    import httpx  # pylint: disable=import-outside-toplevel
+
+    loop_id = id(asyncio.get_running_loop())
+    client = _clients.get(loop_id)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.http_pool_connections * settings.http_pool_maxsize,
+                max_keepalive_connections=settings.http_pool_connections,
+                keepalive_expiry=settings.http_keepalive_timeout or None,
+            ),
+            follow_redirects=True,
+        )
+        _clients[loop_id] = client
+    return client
+
+
+async def aclose_async_clients() -> None:
+    loop_id = id(asyncio.get_running_loop())
+    client = _clients.pop(loop_id, None)
+    if client is not None:
+        await client.aclose()
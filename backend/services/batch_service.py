@@ -0,0 +1,302 @@
+"""Concurrent summarization of many URLs on top of the url_service stages."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from backend.config import settings
+
+from .cache import SummaryCache
+from .content_fetcher import FetchedPage, fetch_page, normalize_url
+from .metrics import in_context
+from .perplexity_client import PerplexityClient
+from .resilience import BATCH, priority_scope
+from .url_service import cached_by_url, content_key_for, summarize_page
+
+
+# Shared by every batch so concurrent batches still respect one Perplexity concurrency limit.
+_llm_pool: Optional[ThreadPoolExecutor] = None
+# host -> [semaphore, users]; an entry is dropped when its last user leaves.
+_host_gates: Dict[str, list] = {}
+_shared_lock = threading.Lock()
+
+
+def summarize_batch(
+    urls: List[str],
+    client: Optional[PerplexityClient],
+    client_error: Optional[str] = None,
+    cache: Optional[SummaryCache] = None,
+) -> Iterator[dict]:
+    """Yield one result dict per input URL, in completion order.
+
+    Identical URLs are fetched once, and pages whose extracted content is identical
+    are summarized once; the copies carry ``duplicateOf`` with the index they reused.
+    """
+    if not urls:
+        raise ValueError("URL 목록이 비어 있습니다.")
+    if len(urls) > settings.batch_max_urls:
+        raise ValueError(f"한 번에 최대 {settings.batch_max_urls}개의 URL만 요약할 수 있습니다.")
+    return _BatchRun(urls, client, client_error, cache).run()
+
+
+class _BatchRun:
+    def __init__(
+        self,
+        urls: List[str],
+        client: Optional[PerplexityClient],
+        client_error: Optional[str],
+        cache: Optional[SummaryCache],
+    ) -> None:
+        self.urls = urls
+        self.client = client
+        self.client_error = client_error
+        self.cache = cache
+        self.results: "queue.Queue[dict]" = queue.Queue()
+        self._lock = threading.Lock()
+        # content key -> followers waiting on the first page with that content, or the finished payload
+        self._content_waiters: Dict[str, List[Tuple[List[int], FetchedPage, float]]] = {}
+        self._content_done: Dict[str, Tuple[int, Optional[Dict], Optional[Exception]]] = {}
+        # host -> URLs not yet handed to the fetch pool
+        self._host_queues: Dict[str, Deque[Tuple[str, List[int]]]] = {}
+        self._fetch_pool: Optional[ThreadPoolExecutor] = None
+
+    def run(self) -> Iterator[dict]:
+        started = time.perf_counter()
+        jobs: Dict[str, List[int]] = {}
+        for index, raw_url in enumerate(self.urls):
+            try:
+                requested_url = normalize_url(str(raw_url))
+            except ValueError as exc:
+                self._emit([index], started, error=exc)
+                continue
+            jobs.setdefault(requested_url, []).append(index)
+
+        # Each host gets at most batch_per_host_concurrency URLs in the pool at a time and hands its
+        # next URL over when one finishes, so a host with many URLs cannot park every pool thread.
+        for requested_url, indices in jobs.items():
+            self._host_queues.setdefault(_host(requested_url), deque()).append((requested_url, indices))
+        self._fetch_pool = ThreadPoolExecutor(
+            max_workers=max(1, min(settings.batch_fetch_concurrency, len(jobs) or 1)),
+            thread_name_prefix="batch-fetch",
+        )
+        for host in list(self._host_queues):
+            for _ in range(max(1, settings.batch_per_host_concurrency)):
+                self._submit_next(host, started)
+
+        try:
+            reported = set()
+            while len(reported) < len(self.urls):
+                try:
+                    result = self.results.get(timeout=settings.batch_result_timeout)
+                except queue.Empty:
+                    break
+                reported.add(result["index"])
+                yield result
+            # Items that never reported (a stuck upstream or a bug) are closed out instead of hanging the stream.
+            for index in range(len(self.urls)):
+                if index not in reported:
+                    yield _timeout_entry(self.urls[index], index, started)
+        finally:
+            self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_next(self, host: str, started: float) -> None:
+        with self._lock:
+            pending = self._host_queues.get(host)
+            if not pending:
+                return
+            requested_url, indices = pending.popleft()
+        try:
+            self._fetch_pool.submit(in_context(self._fetch_then_next, host, requested_url, indices, started))
+        except RuntimeError as exc:  # the batch already finished or its reader went away
+            self._emit(indices, started, error=exc)
+
+    def _fetch_then_next(self, host: str, requested_url: str, indices: List[int], started: float) -> None:
+        try:
+            self._fetch(requested_url, indices, started)
+        finally:
+            self._submit_next(host, started)
+
+    def _fetch(self, requested_url: str, indices: List[int], started: float) -> None:
+        fetch_started = time.perf_counter()
+        try:
+            cached = cached_by_url(requested_url, self.cache)
+            if cached is not None:
+                self._emit(indices, started, payload=cached, fetch_started=fetch_started)
+                return
+            with _host_gate(requested_url):
+                page = fetch_page(requested_url)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._emit(indices, started, error=exc, fetch_started=fetch_started)
+            return
+        fetch_ms = _ms_since(fetch_started)
+
+        key: Optional[str] = None
+        try:
+            key = content_key_for(page, self.client) if page.text else None
+            if key is not None:
+                with self._lock:
+                    if key in self._content_done:
+                        owner, payload, error = self._content_done[key]
+                        self._emit_duplicate(indices, page, owner, payload, error, started, fetch_ms)
+                        return
+                    if key in self._content_waiters:
+                        self._content_waiters[key].append((indices, page, fetch_ms))
+                        return
+                    self._content_waiters[key] = []
+            _get_llm_pool().submit(in_context(self._summarize, requested_url, indices, page, key, fetch_ms, started))
+        except Exception as exc:  # pylint: disable=broad-except
+            # e.g. RuntimeError from a pool that was shut down; followers already waiting on ``key`` get it too.
+            self._finish(indices, key, None, exc, started, {"fetch": fetch_ms, "summarize": 0.0})
+
+    def _summarize(
+        self,
+        requested_url: str,
+        indices: List[int],
+        page: FetchedPage,
+        key: Optional[str],
+        fetch_ms: float,
+        started: float,
+    ) -> None:
+        summarize_started = time.perf_counter()
+        payload: Optional[Dict] = None
+        error: Optional[Exception] = None
+        try:
+            with priority_scope(BATCH):
+                _, payload = summarize_page(page, requested_url, self.client, self.client_error, self.cache)
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        self._finish(indices, key, payload, error, started, {"fetch": fetch_ms, "summarize": _ms_since(summarize_started)})
+
+    def _finish(
+        self,
+        indices: List[int],
+        key: Optional[str],
+        payload: Optional[Dict],
+        error: Optional[Exception],
+        started: float,
+        timing: Dict[str, float],
+    ) -> None:
+        self._emit(indices, started, payload=payload, error=error, timing=timing)
+        if key is None:
+            return
+        with self._lock:
+            self._content_done[key] = (indices[0], payload, error)
+            followers = self._content_waiters.pop(key, [])
+        for follower_indices, follower_page, follower_fetch_ms in followers:
+            self._emit_duplicate(follower_indices, follower_page, indices[0], payload, error, started, follower_fetch_ms)
+
+    def _emit_duplicate(
+        self,
+        indices: List[int],
+        page: FetchedPage,
+        owner: int,
+        payload: Optional[Dict],
+        error: Optional[Exception],
+        started: float,
+        fetch_ms: float,
+    ) -> None:
+        if payload is not None:
+            payload = {**payload, "sourceTitle": page.title, "sourceUrl": page.final_url}
+        self._emit(indices, started, payload=payload, error=error, duplicate_of=owner,
+                   timing={"fetch": fetch_ms, "summarize": 0.0})
+
+    def _emit(
+        self,
+        indices: List[int],
+        started: float,
+        payload: Optional[Dict] = None,
+        error: Optional[Exception] = None,
+        fetch_started: Optional[float] = None,
+        timing: Optional[Dict[str, float]] = None,
+        duplicate_of: Optional[int] = None,
+    ) -> None:
+        if timing is None:
+            timing = {"fetch": _ms_since(fetch_started) if fetch_started else 0.0, "summarize": 0.0}
+        status, message = _describe_error(error)
+        for position, index in enumerate(indices):
+            self.results.put(
+                {
+                    "index": index,
+                    "url": self.urls[index],
+                    "ok": error is None,
+                    "status": status,
+                    "result": payload,
+                    "error": message,
+                    "duplicateOf": duplicate_of if duplicate_of is not None else (indices[0] if position else None),
+                    "timingMs": {**timing, "total": _ms_since(started)},
+                }
+            )
+
+
+def _timeout_entry(url: str, index: int, started: float) -> dict:
+    return {
+        "index": index,
+        "url": url,
+        "ok": False,
+        "status": 504,
+        "result": None,
+        "error": f"{settings.batch_result_timeout:g}초 안에 결과가 오지 않았습니다.",
+        "duplicateOf": None,
+        "timingMs": {"fetch": 0.0, "summarize": 0.0, "total": _ms_since(started)},
+    }
+
+
+def _describe_error(error: Optional[Exception]) -> Tuple[int, Optional[str]]:
+    if error is None:
+        return 200, None
+    if isinstance(error, ValueError):
+        return 400, str(error)
+    if isinstance(error, requests.RequestException):
+        return 502, f"웹 페이지를 불러오지 못했습니다: {error}"
+    return 500, f"요약 중 오류가 발생했습니다: {error}"
+
+
+@contextmanager
+def _host_gate(url: str) -> Iterator[None]:
+    """Hold one of ``batch_per_host_concurrency`` slots for the URL's host.
+
+    Within a batch :meth:`_BatchRun.run` already keeps each host to this many URLs;
+    the gate applies the same cap across concurrent batches.
+    """
+    host = _host(url)
+    with _shared_lock:
+        entry = _host_gates.get(host)
+        if entry is None:
+            entry = [threading.BoundedSemaphore(max(1, settings.batch_per_host_concurrency)), 0]
+            _host_gates[host] = entry
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _shared_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _host_gates[host]
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def _get_llm_pool() -> ThreadPoolExecutor:
+    global _llm_pool  # pylint: disable=global-statement
+    if _llm_pool is None:
+        with _shared_lock:
+            if _llm_pool is None:
+                _llm_pool = ThreadPoolExecutor(
+                    max_workers=max(1, settings.batch_llm_concurrency), thread_name_prefix="batch-llm"
+                )
+    return _llm_pool
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
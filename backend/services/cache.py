@@ -0,0 +1,304 @@
+"""Size-bounded TTL caches with an in-process and an on-disk (SQLite) backend."""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else None,
+                "sets": self.sets,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class MemoryCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds (``0`` keeps them forever)."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 0) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.record("misses")
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at <= time.time():
+                del self._entries[key]
+                self.stats.record("expirations")
+                self.stats.record("misses")
+                return None
+            self._entries.move_to_end(key)
+        self.stats.record("hits")
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        self.stats.record("sets")
+        if evicted:
+            self.stats.record("evictions", evicted)
+
+    def ttl_remaining(self, key: str) -> Optional[float]:
+        """Seconds until ``key`` expires (``inf`` if never), ``None`` if absent; leaves stats and LRU order alone."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[0] - time.time() if entry[0] else math.inf
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """On-disk variant of :class:`MemoryCache`; values must be JSON serializable."""
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl: float = 0) -> None:
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+        self._pid = os.getpid()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # A connection must not cross fork(); preloaded gunicorn workers reopen their own.
+        if self._pid != os.getpid():
+            self._connection = self._connect()
+            self._pid = os.getpid()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        # WAL lets several worker processes read while one writes.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+        conn.commit()
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.record("misses")
+                return None
+            value, expires_at = row
+            if expires_at and expires_at <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.record("expirations")
+                self.stats.record("misses")
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        self.stats.record("hits")
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl else 0.0
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                )
+            self._conn.commit()
+        self.stats.record("sets")
+        if overflow > 0:
+            self.stats.record("evictions", overflow)
+
+    def ttl_remaining(self, key: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0] - time.time() if row[0] else math.inf
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        return count
+
+
+class HitTracker:
+    """Request counts per key that halve every ``half_life`` seconds, to find the currently hot keys."""
+
+    def __init__(self, max_keys: int = 2000, half_life: float = 3600.0) -> None:
+        self.max_keys = max(1, max_keys)
+        self.half_life = half_life
+        self._scores: Dict[Hashable, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: Hashable, weight: float = 1.0) -> None:
+        now = time.time()
+        with self._lock:
+            score, updated = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decay(score, now - updated) + weight, now)
+            if len(self._scores) > self.max_keys * 1.25:
+                # Prune in batches so the sort is amortized over many records.
+                ranked = sorted(self._scores.items(), key=lambda item: self._decay(item[1][0], now - item[1][1]))
+                for stale, _ in ranked[: len(ranked) - self.max_keys]:
+                    del self._scores[stale]
+
+    def top(self, limit: int, min_score: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """Up to ``limit`` keys with their decayed scores, hottest first."""
+        now = time.time()
+        with self._lock:
+            scored = [(key, self._decay(score, now - updated)) for key, (score, updated) in self._scores.items()]
+        scored = [item for item in scored if item[1] >= min_score]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def _decay(self, score: float, age: float) -> float:
+        return score * 0.5 ** (age / self.half_life) if self.half_life > 0 else score
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+def create_cache(backend: str, max_entries: int, ttl: float, path: str = "") -> MemoryCache | SQLiteCache:
+    backend = (backend or "memory").lower()
+    if backend == "sqlite":
+        return SQLiteCache(path, max_entries=max_entries, ttl=ttl)
+    if backend == "memory":
+        return MemoryCache(max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"지원하지 않는 캐시 백엔드입니다: {backend}")
+
+
+class SummaryCache:
+    """Two-level summary cache: by request/redirect URL, then by extracted content + model settings."""
+
+    def __init__(self, backend: MemoryCache | SQLiteCache) -> None:
+        self.backend = backend
+        self.url_stats = CacheStats()
+        self.content_stats = CacheStats()
+        self.chunk_stats = CacheStats()
+
+    @staticmethod
+    def content_key(text: str, model: str, temperature: float) -> str:
+        digest = hashlib.sha256()
+        for part in (model, repr(float(temperature)), text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return f"content:{digest.hexdigest()}"
+
+    def get_by_url(self, url: str, namespace: str = "") -> Optional[Dict[str, Any]]:
+        return self._lookup(self._url_key(url, namespace), self.url_stats)
+
+    def get_by_content(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._lookup(key, self.content_stats)
+
+    def store(
+        self, urls: Iterable[str], content_key: Optional[str], payload: Dict[str, Any], namespace: str = ""
+    ) -> None:
+        if content_key:
+            self.backend.set(content_key, {"summary": payload["summary"], "citations": payload["citations"]})
+        for url in dict.fromkeys(u for u in urls if u):
+            self.backend.set(self._url_key(url, namespace), payload)
+
+    def url_ttl_remaining(self, url: str, namespace: str = "") -> Optional[float]:
+        return self.backend.ttl_remaining(self._url_key(url, namespace))
+
+    def get_chunk(self, key: str) -> Optional[str]:
+        """Partial (map-step) summary of one chunk of a long document."""
+        hit = self._lookup(key, self.chunk_stats)
+        return hit["summary"] if hit else None
+
+    def store_chunk(self, key: str, summary: str) -> None:
+        self.backend.set(key, {"summary": summary})
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url_stats.to_dict(),
+            "content": self.content_stats.to_dict(),
+            "chunk": self.chunk_stats.to_dict(),
+            "backend": self.backend.stats.to_dict(),
+            "entries": len(self.backend),
+        }
+
+    @staticmethod
+    def _url_key(url: str, namespace: str) -> str:
+        # Summaries produced in a different mode (e.g. long) must not answer default requests.
+        return f"url:{namespace}:{url}" if namespace else f"url:{url}"
+
+    def _lookup(self, key: str, stats: CacheStats) -> Optional[Dict[str, Any]]:
+        value = self.backend.get(key)
+        stats.record("hits" if value is not None else "misses")
+        return value
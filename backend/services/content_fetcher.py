@@ -1,11 +1,29 @@
 from __future__ import annotations
 
+import codecs
+import logging
 import re
-from typing import List, Tuple
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+
+from backend.config import settings
+
+from backend.utils.security import SecurityScanner
+
+from .cache import MemoryCache
+from .extractors import collapse_spaces, get_extractor
+from .http_session import get_session
+from .metrics import in_context, observe_stage, stage
+from .singleflight import get_flight
+
+
+logger = logging.getLogger(__name__)
 
 
 USER_AGENT = (
@@ -32,6 +50,65 @@ FALLBACK_HEADERS = {
 }
 
 
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "application/xml", "text/xml", "text/plain")
+HEADER_CHARSET = re.compile(r"""charset=["']?([A-Za-z0-9_\-]+)""", re.IGNORECASE)
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_\-]+)""", re.IGNORECASE)
+
+
+@dataclass
+class FetchedPage:
+    title: str
+    text: str
+    final_url: str
+    html: str
+    revalidated: bool = False
+    truncated: bool = False
+    attempts: List[dict] = field(default_factory=list)
+    security: Optional[dict] = None
+
+
+class AttemptStats:
+    """Per-attempt latency/outcome counters, used to tune ``fetch_hedge_delay``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, dict] = {}
+
+    def record(self, attempts: List[dict], winner: Optional[str]) -> None:
+        with self._lock:
+            for attempt in attempts:
+                entry = self._stats.setdefault(
+                    attempt["attempt"], {"count": 0, "ok": 0, "wins": 0, "totalMs": 0.0, "maxMs": 0.0}
+                )
+                entry["count"] += 1
+                entry["ok"] += attempt["outcome"] == "ok"
+                entry["wins"] += attempt["attempt"] == winner
+                entry["totalMs"] += attempt["elapsedMs"]
+                entry["maxMs"] = max(entry["maxMs"], attempt["elapsedMs"])
+
+    def to_dict(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                name: {
+                    "count": entry["count"],
+                    "ok": entry["ok"],
+                    "wins": entry["wins"],
+                    "avgMs": round(entry["totalMs"] / entry["count"], 1),
+                    "maxMs": round(entry["maxMs"], 1),
+                }
+                for name, entry in self._stats.items()
+            }
+
+
+attempt_stats = AttemptStats()
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+_hedge_pool_lock = threading.Lock()
+
+
+# ETag/Last-Modified validators plus the extracted title/text, keyed by request and final URL.
+_validators = MemoryCache(max_entries=settings.fetch_validator_max_entries, ttl=settings.fetch_validator_ttl)
+
+
 def normalize_url(raw_url: str) -> str:
     raw_url = (raw_url or "").strip()
     if not raw_url:
@@ -44,56 +121,380 @@ def normalize_url(raw_url: str) -> str:
 
 def fetch_webpage(url: str, timeout: int = 8) -> Tuple[str, str, str, str]:
     """Return title, clean text, final_url, and raw html for the page."""
+    page = fetch_page(url, timeout=timeout)
+    return page.title, page.text, page.final_url, page.html
+
+
+def fetch_page(
+    url: str, timeout: int = 8, streaming: Optional[bool] = None, text_budget: Optional[int] = None
+) -> FetchedPage:
+    """Fetch and extract a page, revalidating a previously seen copy with ETag/Last-Modified.
+
+    On a 304 the stored title/text are reused and ``html`` is empty, since raw
+    markup is not kept in the validator store. In streaming mode the body is read
+    in chunks up to ``settings.fetch_max_bytes`` and parsed incrementally until
+    the text budget is filled, so ``html`` only holds the part that was read.
+    ``text_budget`` overrides ``settings.fetch_text_budget`` (e.g. for long-document mode).
+    Concurrent calls for the same URL share one fetch (see :mod:`singleflight`).
+    """
+    streaming = settings.fetch_streaming if streaming is None else streaming
+    text_budget = text_budget or settings.fetch_text_budget
     normalized = normalize_url(url)
-    attempts: List[Tuple[str, dict]] = [
-        (normalized, BASE_HEADERS),
+    return get_flight("fetch").do(
+        (normalized, streaming, text_budget), lambda: _fetch_page(url, normalized, timeout, streaming, text_budget)
+    )
+
+
+def _fetch_page(url: str, normalized: str, timeout: int, streaming: bool, text_budget: int) -> FetchedPage:
+    stored = _usable_validators(_validators.get(normalized), text_budget)
+    attempts = _build_attempts(normalized, _conditional_headers(stored))
+
+    if settings.fetch_hedge:
+        response, records, last_exc = _request_hedged(attempts, timeout, streaming)
+    else:
+        response, records, last_exc = _request_sequential(attempts, timeout, streaming)
+    winner = next((r["attempt"] for r in records if r.get("winner")), None)
+    attempt_stats.record(records, winner)
+
+    if response is None:
+        detail = f"{last_exc}" if last_exc else "알 수 없는 오류"
+        raise ValueError(f"웹 페이지를 불러오지 못했습니다: {detail}")
+
+    if response.status_code == 304 and stored is not None:
+        response.close()
+        _validators.set(normalized, stored)
+        return _revalidated_page(stored, records, text_budget)
+
+    final_url = response.url
+    if streaming:
+        page = _read_streaming(response, fallback_title=url, text_budget=text_budget)
+    else:
+        html = response.text
+        with stage("parse"):
+            title, text = get_extractor(settings.extractor_backend).extract(html, url, text_budget)
+        with stage("security_scan"):
+            security = SecurityScanner(url, final_url, response.content).run_all().to_dict()
+        page = FetchedPage(title, text, final_url, html, security=security)
+    _remember_validators(response, [normalized, final_url], page, text_budget)
+    page.attempts = records
+    return page
+
+
+def _build_attempts(normalized: str, conditional: dict) -> List[Tuple[str, str, dict]]:
+    attempts: List[Tuple[str, str, dict]] = [
+        ("base", normalized, {**BASE_HEADERS, **conditional}),
     ]
 
     if normalized.startswith("https://"):
-        attempts.append((normalized.replace("https://", "http://", 1), BASE_HEADERS))
+        attempts.append(("http", normalized.replace("https://", "http://", 1), {**BASE_HEADERS, **conditional}))
 
-    attempts.append((normalized, FALLBACK_HEADERS))
+    attempts.append(("alt-headers", normalized, {**FALLBACK_HEADERS, **conditional}))
+    return attempts
 
-    last_exc: Exception | None = None
+
+def _try_attempt(
+    name: str, candidate_url: str, headers: dict, timeout: int, streaming: bool
+) -> Tuple[Optional[requests.Response], dict, Optional[Exception]]:
+    started = time.perf_counter()
+    record = {"attempt": name, "url": candidate_url, "status": None, "outcome": "error"}
     response: requests.Response | None = None
-    for candidate_url, headers in attempts:
-        try:
-            response = requests.get(
-                candidate_url,
-                timeout=(5, timeout),
-                headers=headers,
-                allow_redirects=True,
-            )
-            if response.status_code >= 500:
-                response.raise_for_status()
-            if response.status_code == 403:
-                # Try next header set
-                response = None
-                continue
+    exc: Exception | None = None
+    try:
+        response = get_session("fetcher").get(
+            candidate_url,
+            timeout=(5, timeout),
+            headers=headers,
+            allow_redirects=True,
+            stream=streaming,
+        )
+        record["status"] = response.status_code
+        if response.status_code >= 500:
             response.raise_for_status()
-            break
-        except requests.RequestException as exc:
-            last_exc = exc
+        if response.status_code == 403:
+            # Try next header set
+            response.close()
             response = None
+            record["outcome"] = "forbidden"
+        else:
+            response.raise_for_status()
+            record["outcome"] = "ok"
+    except requests.RequestException as error:
+        exc = error
+        if response is not None:
+            response.close()
+        response = None
+    elapsed = time.perf_counter() - started
+    record["elapsedMs"] = round(elapsed * 1000, 1)
+    observe_stage("fetch_attempt", elapsed, record["outcome"])
+    return response, record, exc
+
+
+def _request_sequential(
+    attempts: List[Tuple[str, str, dict]], timeout: int, streaming: bool
+) -> Tuple[Optional[requests.Response], List[dict], Optional[Exception]]:
+    records: List[dict] = []
+    last_exc: Exception | None = None
+    for name, candidate_url, headers in attempts:
+        response, record, exc = _try_attempt(name, candidate_url, headers, timeout, streaming)
+        records.append(record)
+        last_exc = exc or last_exc
+        if response is not None:
+            record["winner"] = True
+            return response, records, last_exc
+    return None, records, last_exc
+
+
+def _request_hedged(
+    attempts: List[Tuple[str, str, dict]], timeout: int, streaming: bool
+) -> Tuple[Optional[requests.Response], List[dict], Optional[Exception]]:
+    """Start the next attempt after ``fetch_hedge_delay`` (or as soon as one fails); first success wins.
+
+    Losers that are still running have their response closed when they finish,
+    and nothing is waited on past ``fetch_deadline``.
+    """
+    pool = _get_hedge_pool()
+    started = time.monotonic()
+    deadline = started + settings.fetch_deadline
+    futures: List[Future] = []
+    consumed: set = set()
+    records: List[dict] = []
+    last_exc: Exception | None = None
+    winner: requests.Response | None = None
+
+    def elapsed_ms() -> float:
+        return round((time.monotonic() - started) * 1000, 1)
+
+    def discard_late(future: Future) -> None:
+        if not future.cancelled():
+            response, _, _ = future.result()
+            if response is not None:
+                response.close()
+
+    def launch() -> None:
+        name, candidate_url, headers = attempts[len(futures)]
+        future = pool.submit(in_context(_try_attempt, name, candidate_url, headers, timeout, streaming))
+        future.attempt = (name, candidate_url, elapsed_ms())  # type: ignore[attr-defined]
+        futures.append(future)
+
+    launch()
+    next_hedge_at = started + settings.fetch_hedge_delay
+    while winner is None:
+        for future in futures:
+            if future in consumed or not future.done():
+                continue
+            consumed.add(future)
+            response, record, exc = future.result()
+            record["startedAtMs"] = future.attempt[2]  # type: ignore[attr-defined]
+            records.append(record)
+            last_exc = exc or last_exc
+            if response is None:
+                continue
+            if winner is None:
+                record["winner"] = True
+                winner = response
+            else:
+                response.close()
+                record["outcome"] = "cancelled"
+        if winner is not None:
+            break
+        running = [f for f in futures if not f.done()]
+        can_hedge = len(futures) < len(attempts)
+        now = time.monotonic()
+        if (not running and not can_hedge) or now >= deadline:
+            break
+        if can_hedge and (not running or now >= next_hedge_at):
+            launch()
+            next_hedge_at = now + settings.fetch_hedge_delay
             continue
+        wait_for = deadline - now
+        if can_hedge:
+            wait_for = min(wait_for, next_hedge_at - now)
+        wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
 
-    if response is None:
-        detail = f"{last_exc}" if last_exc else "알 수 없는 오류"
-        raise ValueError(f"웹 페이지를 불러오지 못했습니다: {detail}")
+    for future in futures:
+        if future in consumed:
+            continue
+        if not future.cancel():
+            future.add_done_callback(discard_late)
+        name, candidate_url, started_ms = future.attempt  # type: ignore[attr-defined]
+        records.append(
+            {
+                "attempt": name,
+                "url": candidate_url,
+                "status": None,
+                "outcome": "cancelled" if winner is not None else "deadline",
+                "elapsedMs": round(elapsed_ms() - started_ms, 1),
+                "startedAtMs": started_ms,
+            }
+        )
+    if winner is None and time.monotonic() >= deadline:
+        last_exc = TimeoutError(f"{settings.fetch_deadline}초 안에 응답이 없습니다.")
+    return winner, records, last_exc
 
-    html = response.text
-    soup = BeautifulSoup(html, "html.parser")
 
-    for tag in soup(["script", "style", "noscript", "iframe", "form", "footer", "nav"]):
-        tag.decompose()
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool  # pylint: disable=global-statement
+    if _hedge_pool is None:
+        with _hedge_pool_lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(
+                    max_workers=settings.fetch_hedge_workers, thread_name_prefix="fetch-hedge"
+                )
+    return _hedge_pool
 
-    paragraphs = [collapse_spaces(el.get_text(" ", strip=True)) for el in soup.find_all(["p", "h1", "h2", "h3"])]
-    text = "\n".join([p for p in paragraphs if len(p) > 40])
-    text = text[:5000]  # guardrail for prompt size
-    title = soup.title.get_text(strip=True) if soup.title else url
-    final_url = response.url
-    return title, text, final_url, html
+
+def _read_streaming(response: requests.Response, fallback_title: str, text_budget: int) -> FetchedPage:
+    """Download at most ``fetch_max_bytes`` and stop as soon as the text budget is filled."""
+    try:
+        reader = _BodyReader(response.headers, response.url, text_budget, original_url=fallback_title)
+        for chunk in response.iter_content(chunk_size=settings.fetch_chunk_size):
+            if reader.feed(chunk):
+                break
+    finally:
+        response.close()
+    return reader.finish(fallback_title)
+
+
+class _BodyReader:
+    """Incrementally decodes, extracts and security-scans a capped HTML body.
+
+    Shared by the sync and async fetchers. The scanner sees the raw bytes as
+    they arrive, so the report is ready when the download stops. Time spent
+    scanning and parsing is recorded as its own stage; the rest of the read is
+    reported as ``download``.
+    """
+
+    def __init__(self, headers, final_url: str, text_budget: Optional[int] = None, original_url: str = "") -> None:
+        self.started = time.perf_counter()
+        self.scan_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.content_type = headers.get("Content-Type", "")
+        self.final_url = str(final_url)
+        self.scanner = SecurityScanner(original_url or self.final_url, self.final_url)
+        mime = self.content_type.split(";", 1)[0].strip().lower()
+        if mime and mime not in HTML_CONTENT_TYPES:
+            raise ValueError(f"HTML 문서가 아닙니다 (Content-Type: {mime}).")
+        self.max_bytes = settings.fetch_max_bytes
+        declared = headers.get("Content-Length", "")
+        if declared.isdigit() and int(declared) > self.max_bytes:
+            logger.info("본문이 %s바이트로 상한(%s)을 넘어 앞부분만 읽습니다: %s", declared, self.max_bytes, self.final_url)
+        self.extractor = get_extractor(settings.extractor_backend).start(text_budget or settings.fetch_text_budget)
+        self.decoder = None
+        self.html_parts: List[str] = []
+        self.received = 0
+        self.truncated = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume one chunk; returns True once reading can stop."""
+        if not chunk:
+            return False
+        if self.received + len(chunk) > self.max_bytes:
+            chunk = chunk[: self.max_bytes - self.received]
+            self.truncated = True
+        self.received += len(chunk)
+        started = time.perf_counter()
+        self.scanner.feed(chunk)
+        scanned = time.perf_counter()
+        if self.decoder is None:
+            self.decoder = codecs.getincrementaldecoder(_sniff_encoding(self.content_type, chunk))(errors="replace")
+        piece = self.decoder.decode(chunk)
+        self.html_parts.append(piece)
+        self.extractor.feed(piece)
+        self.scan_seconds += scanned - started
+        self.parse_seconds += time.perf_counter() - scanned
+        return self.extractor.done or self.truncated
+
+    def finish(self, fallback_title: str) -> FetchedPage:
+        finishing = time.perf_counter()
+        download_seconds = finishing - self.started - self.scan_seconds - self.parse_seconds
+        if self.decoder is not None:
+            tail = self.decoder.decode(b"", final=True)
+            if tail:
+                self.html_parts.append(tail)
+                self.extractor.feed(tail)
+        title, text = self.extractor.finish(fallback_title)
+        self.parse_seconds += time.perf_counter() - finishing
+        page = FetchedPage(
+            title=title,
+            text=text,
+            final_url=self.final_url,
+            html="".join(self.html_parts),
+            truncated=self.truncated,
+            security=self.scanner.run_all().to_dict(),
+        )
+        observe_stage("download", download_seconds)
+        observe_stage("security_scan", self.scan_seconds)
+        observe_stage("parse", self.parse_seconds)
+        return page
+
+
+def _sniff_encoding(content_type: str, first_chunk: bytes) -> str:
+    candidates = []
+    declared = HEADER_CHARSET.search(content_type or "")
+    if declared:
+        candidates.append(declared.group(1))
+    match = META_CHARSET.search(first_chunk[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii"))
+    for candidate in candidates:
+        try:
+            return codecs.lookup(candidate or "").name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def _usable_validators(stored: Optional[dict], text_budget: int) -> Optional[dict]:
+    """A stored copy can only answer a 304 if it was extracted with at least this budget
+    (or the whole page fit into the smaller one)."""
+    if stored is None:
+        return None
+    budget = stored.get("budget", 0)
+    if budget >= text_budget or len(stored["text"]) < budget:
+        return stored
+    return None
+
+
+def _conditional_headers(stored: Optional[dict]) -> dict:
+    if not stored:
+        return {}
+    headers = {}
+    if stored.get("etag"):
+        headers["If-None-Match"] = stored["etag"]
+    if stored.get("last_modified"):
+        headers["If-Modified-Since"] = stored["last_modified"]
+    return headers
+
+
+def _revalidated_page(stored: dict, records: List[dict], text_budget: int) -> FetchedPage:
+    # The stored copy may come from a larger-budget (long mode) fetch; cut it like a fresh extraction would.
+    return FetchedPage(
+        stored["title"],
+        stored["text"][:text_budget],
+        stored["final_url"],
+        "",
+        revalidated=True,
+        attempts=records,
+        security=stored.get("security"),
+    )
 
 
-def collapse_spaces(text: str) -> str:
-    return re.sub(r"\s+", " ", text or "").strip()
+def _remember_validators(response, urls: List[str], page: FetchedPage, text_budget: int) -> None:
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+    entry = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "title": page.title,
+        "text": page.text,
+        "final_url": str(response.url),
+        "budget": text_budget,
+        "security": page.security,
+    }
+    for key in dict.fromkeys(urls):
+        # Keep a copy extracted with a larger budget: it can still answer smaller requests.
+        current = _validators.get(key)
+        if current is None or current.get("budget", 0) <= text_budget:
+            _validators.set(key, entry)
@@ -0,0 +1,173 @@
+"""Offline extractive summarizer used when Perplexity is unavailable and for ``mode=fast``.
+
+Sentences are split with rules that cover both Korean and English. Each sentence
+becomes a TF-IDF vector over the same terms as :mod:`prompt_builder`. Scores mix
+TextRank centrality, similarity to the title and a lead bias. Sentences are then
+picked with MMR so near-duplicates do not crowd out other content. Everything
+is NumPy matrix work on at most ``extractive_max_candidates`` sentences, so a
+5 KB page takes a few milliseconds.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List
+
+from .prompt_builder import terms
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+METHODS = ("textrank", "tfidf")
+DAMPING = 0.85
+MMR_LAMBDA = 0.7
+WEIGHTS = {"centrality": 0.6, "title": 0.25, "position": 0.15}
+MIN_SENTENCE_CHARS = 12
+
+SENTENCE_END = re.compile(r"[.!?。！？…]+[\"'”’)\]]*\s+|\n+")
+# Never end a sentence: "Dr. Kim", "No. 5", "J. Smith".
+TITLES = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "no", "fig", "p", "pp"}
+# End a sentence only when the next word is capitalized: "etc. The", but "e.g. the".
+ABBREVIATIONS = {
+    "etc", "e.g", "i.e", "inc", "ltd", "co", "corp", "u.s", "u.k", "approx", "jan", "feb", "mar", "apr", "jun",
+    "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+}
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split on sentence punctuation or line breaks, keeping abbreviations and initials intact."""
+    sentences: List[str] = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        end = match.end()
+        if "\n" not in match.group() and _is_abbreviation(text[start:match.start()], text[end:end + 1]):
+            continue
+        piece = text[start:end].strip()
+        if piece:
+            sentences.append(piece)
+        start = end
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def summarize_extractive(
+    title: str,
+    text: str,
+    max_sentences: int = 5,
+    method: str = "textrank",
+    max_candidates: int = 300,
+) -> List[str]:
+    """Return up to ``max_sentences`` representative sentences of ``text`` in document order."""
+    if method not in METHODS:
+        raise ValueError(f"지원하지 않는 요약 방식입니다: {method}")
+    sentences = [s for s in split_sentences(text) if len(s) >= MIN_SENTENCE_CHARS][:max_candidates]
+    if len(sentences) <= max_sentences:
+        return sentences
+    np = _numpy()
+
+    matrix, vocabulary, idf = _tfidf([terms(sentence) for sentence in sentences])
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+    if method == "textrank":
+        centrality = _textrank(similarity)
+    else:
+        # Cheaper variant: similarity to the document centroid.
+        centroid = matrix.sum(axis=0)
+        centrality = matrix @ (centroid / (np.linalg.norm(centroid) or 1.0))
+
+    query = np.zeros(len(vocabulary))
+    for term, count in Counter(terms(title)).items():
+        column = vocabulary.get(term)
+        if column is not None:
+            query[column] = (1 + np.log(count)) * idf[column]
+    title_similarity = matrix @ (query / (np.linalg.norm(query) or 1.0))
+    position = 1.0 / (1.0 + np.arange(len(sentences)) / 3.0)
+
+    scores = (
+        WEIGHTS["centrality"] * _rescale(centrality)
+        + WEIGHTS["title"] * _rescale(title_similarity)
+        + WEIGHTS["position"] * position
+    )
+    chosen = _mmr(scores, similarity, max_sentences)
+    return [sentences[index] for index in sorted(chosen)]
+
+
+def _tfidf(documents: List[List[str]]) -> tuple:
+    np = _numpy()
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    columns: List[int] = []
+    counts: List[int] = []
+    for row, words in enumerate(documents):
+        for term, count in Counter(words).items():
+            rows.append(row)
+            columns.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+
+    matrix = np.zeros((len(documents), len(vocabulary)))
+    if counts:
+        matrix[rows, columns] = 1.0 + np.log(np.asarray(counts, dtype=float))
+    df = np.count_nonzero(matrix, axis=0)
+    idf = np.log((len(documents) + 1) / (df + 1)) + 1.0
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms, vocabulary, idf
+
+
+def _textrank(similarity: np.ndarray, iterations: int = 50, tolerance: float = 1e-6) -> np.ndarray:
+    np = _numpy()
+    size = similarity.shape[0]
+    totals = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no terms with any other link uniformly instead of trapping rank.
+    transition = np.where(totals > 0, similarity / np.where(totals > 0, totals, 1.0), 1.0 / size)
+    rank = np.full(size, 1.0 / size)
+    for _ in range(iterations):
+        updated = (1 - DAMPING) / size + DAMPING * (transition.T @ rank)
+        if np.abs(updated - rank).sum() < tolerance:
+            return updated
+        rank = updated
+    return rank
+
+
+def _mmr(scores: np.ndarray, similarity: np.ndarray, limit: int) -> List[int]:
+    np = _numpy()
+    chosen: List[int] = []
+    redundancy = np.zeros_like(scores)
+    available = np.ones(len(scores), dtype=bool)
+    for _ in range(min(limit, len(scores))):
+        value = MMR_LAMBDA * scores - (1 - MMR_LAMBDA) * redundancy
+        value[~available] = -np.inf
+        best = int(np.argmax(value))
+        chosen.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[:, best])
+    return chosen
+
+
+def _rescale(values: np.ndarray) -> np.ndarray:
+    np = _numpy()
+    low, high = values.min(), values.max()
+    if high - low < 1e-12:
+        return np.zeros_like(values)
+    return (values - low) / (high - low)
+
+
+def _numpy():
+    """NumPy, imported on first use so importing the app (and every worker) stays fast."""
+    import numpy  # pylint: disable=import-outside-toplevel
+
+    return numpy
+
+
+def _is_abbreviation(before: str, following: str) -> bool:
+    words = before.split()
+    if not words:
+        return False
+    last = words[-1].lower()
+    if last in TITLES or (len(last) == 1 and last.isascii() and last.isalpha()):
+        return True
+    return last in ABBREVIATIONS and not following.isupper()
@@ -0,0 +1,288 @@
+"""HTML → (title, text) extraction backends used by the content fetcher.
+
+Every backend keeps the same rules: drop ``IGNORED_TAGS`` subtrees, take the
+text of ``TEXT_TAGS`` elements, keep paragraphs longer than
+``MIN_PARAGRAPH_LENGTH`` and cut the joined text at the text budget.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Dict, List, Protocol, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+IGNORED_TAGS = ("script", "style", "noscript", "iframe", "form", "footer", "nav")
+TEXT_TAGS = ("p", "h1", "h2", "h3")
+MIN_PARAGRAPH_LENGTH = 40
+
+# Elements BeautifulSoup treats as self-closing; they never open a scope.
+VOID_TAGS = frozenset(
+    (
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem",
+        "meta", "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame",
+        "image", "isindex", "nextid", "spacer",
+    )
+)
+
+
+class ExtractionSession(Protocol):
+    done: bool
+
+    def feed(self, data: str) -> None:
+        ...
+
+    def finish(self, fallback_title: str) -> Tuple[str, str]:
+        ...
+
+
+class Extractor(ABC):
+    """Base extractor; subclasses implement :meth:`extract` and may override :meth:`start`."""
+
+    name = "base"
+
+    @abstractmethod
+    def extract(self, html: str, fallback_title: str, text_budget: int) -> Tuple[str, str]:
+        """Return ``(title, text)`` for a whole document."""
+
+    def start(self, text_budget: int) -> ExtractionSession:
+        """Begin an incremental extraction; non-streaming backends buffer until ``finish``."""
+        return _BufferedSession(self, text_budget)
+
+
+class _BufferedSession:
+    """Buffers markup for a whole-document backend.
+
+    A :class:`StreamingTextExtractor` runs alongside only to count budget text, so
+    the download still stops once enough paragraphs have arrived.
+    """
+
+    def __init__(self, extractor: Extractor, text_budget: int) -> None:
+        self.extractor = extractor
+        self.text_budget = text_budget
+        self._parts: List[str] = []
+        self._counter = StreamingTextExtractor(text_budget)
+
+    @property
+    def done(self) -> bool:
+        return self._counter.done
+
+    def feed(self, data: str) -> None:
+        self._parts.append(data)
+        if not self._counter.done:
+            self._counter.feed(data)
+
+    def finish(self, fallback_title: str) -> Tuple[str, str]:
+        return self.extractor.extract("".join(self._parts), fallback_title, self.text_budget)
+
+
+class SoupExtractor(Extractor):
+    """The original BeautifulSoup(html.parser) + decompose + find_all pipeline."""
+
+    name = "bs4"
+
+    def __init__(self) -> None:
+        # Imported here like lxml, so processes using another backend never load bs4.
+        from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+
+        self._soup = BeautifulSoup
+
+    def extract(self, html: str, fallback_title: str, text_budget: int) -> Tuple[str, str]:
+        soup = self._soup(html, "html.parser")
+
+        for tag in soup(list(IGNORED_TAGS)):
+            tag.decompose()
+
+        paragraphs = [collapse_spaces(el.get_text(" ", strip=True)) for el in soup.find_all(list(TEXT_TAGS))]
+        text = "\n".join([p for p in paragraphs if len(p) > MIN_PARAGRAPH_LENGTH])
+        text = text[:text_budget]  # guardrail for prompt size
+        title = soup.title.get_text(strip=True) if soup.title else fallback_title
+        return title, text
+
+
+class LxmlExtractor(Extractor):
+    """libxml2-backed extraction; requires the optional ``lxml`` package."""
+
+    name = "lxml"
+
+    def __init__(self) -> None:
+        from lxml import etree, html as lxml_html  # pylint: disable=import-outside-toplevel
+
+        self._etree = etree
+        self._html = lxml_html
+
+    def extract(self, html: str, fallback_title: str, text_budget: int) -> Tuple[str, str]:
+        if not html.strip():
+            return fallback_title, ""
+        try:
+            doc = self._html.document_fromstring(html)
+        except (self._etree.ParserError, ValueError):
+            return fallback_title, ""
+        self._etree.strip_elements(doc, *IGNORED_TAGS, with_tail=False)
+
+        paragraphs = []
+        for el in doc.iter(*TEXT_TAGS):
+            paragraph = collapse_spaces(" ".join(s.strip() for s in el.itertext() if s.strip()))
+            if len(paragraph) > MIN_PARAGRAPH_LENGTH:
+                paragraphs.append(paragraph)
+        title_el = doc.find(".//title")
+        title = "".join(s.strip() for s in title_el.itertext()) if title_el is not None else ""
+        return title or fallback_title, "\n".join(paragraphs)[:text_budget]
+
+
+class HtmlParserExtractor(Extractor):
+    """Single pass over ``html.parser`` events; no tree, and stops early once the budget is full."""
+
+    name = "htmlparser"
+
+    def extract(self, html: str, fallback_title: str, text_budget: int) -> Tuple[str, str]:
+        session = StreamingTextExtractor(text_budget)
+        session.feed(html)
+        return session.finish(fallback_title)
+
+    def start(self, text_budget: int) -> ExtractionSession:
+        return StreamingTextExtractor(text_budget)
+
+
+class StreamingTextExtractor(HTMLParser):
+    """Collects the title and p/h1-h3 text without building a tree, skipping ignored subtrees.
+
+    Open elements are tracked on a name stack and an end tag closes everything
+    opened after its match, the way BeautifulSoup's html.parser builder nests
+    elements, so the paragraphs match :class:`SoupExtractor`. ``done`` is set
+    once ``text_budget`` characters have been collected so the caller can stop.
+    """
+
+    def __init__(self, text_budget: int) -> None:
+        super().__init__(convert_charrefs=True)
+        self.text_budget = text_budget
+        self.done = False
+        self._stack: List[Tuple[str, int, int]] = []  # (tag, block order or -1, start index into _texts)
+        self._open_counts: Dict[str, int] = {}
+        self._skip_depth = 0
+        self._open_blocks = 0
+        self._title_depth = 0
+        self._title_seen = False
+        self._title_parts: List[str] = []
+        self._texts: List[str] = []
+        self._pending: List[str] = []
+        self._paragraphs: List[Tuple[int, str]] = []
+        self._opened = 0
+        self._length = 0
+
+    @property
+    def title(self) -> str:
+        return "".join(self._title_parts)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(text for _, text in sorted(self._paragraphs))[: self.text_budget]
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        self._flush_data()
+        if tag in VOID_TAGS:
+            return
+        order = -1
+        if tag in IGNORED_TAGS:
+            self._skip_depth += 1
+        elif not self._skip_depth:
+            if tag in TEXT_TAGS:
+                order = self._opened
+                self._opened += 1
+                self._open_blocks += 1
+            elif tag == "title" and not self._title_seen:
+                self._title_depth += 1
+        self._stack.append((tag, order, len(self._texts)))
+        self._open_counts[tag] = self._open_counts.get(tag, 0) + 1
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush_data()
+        if not self._open_counts.get(tag):
+            return
+        while True:
+            popped = self._pop()
+            if popped == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        # A text run can arrive in several calls when it spans fed chunks.
+        if not self._skip_depth and not self.done:
+            self._pending.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush_data()
+        while self._stack:
+            self._pop()
+
+    def finish(self, fallback_title: str) -> Tuple[str, str]:
+        self.close()
+        return self.title or fallback_title, self.text
+
+    def _pop(self) -> str:
+        tag, order, start = self._stack.pop()
+        self._open_counts[tag] -= 1
+        if tag in IGNORED_TAGS:
+            self._skip_depth -= 1
+        elif order >= 0:
+            self._open_blocks -= 1
+            self._emit(order, self._texts[start:])
+            if not self._open_blocks:
+                self._texts = []
+        elif tag == "title" and self._title_depth:
+            self._title_depth -= 1
+            self._title_seen = True
+        return tag
+
+    def _flush_data(self) -> None:
+        if not self._pending:
+            return
+        stripped = "".join(self._pending).strip()
+        self._pending = []
+        if not stripped:
+            return
+        if self._title_depth:
+            self._title_parts.append(stripped)
+        if self._open_blocks:
+            self._texts.append(stripped)
+
+    def _emit(self, order: int, parts: List[str]) -> None:
+        paragraph = collapse_spaces(" ".join(parts))
+        if len(paragraph) <= MIN_PARAGRAPH_LENGTH:
+            return
+        self._length += len(paragraph) + (1 if self._paragraphs else 0)
+        self._paragraphs.append((order, paragraph))
+        if self._length >= self.text_budget:
+            self.done = True
+
+
+EXTRACTORS: Dict[str, type] = {
+    SoupExtractor.name: SoupExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+    HtmlParserExtractor.name: HtmlParserExtractor,
+}
+
+_instances: Dict[str, Extractor] = {}
+
+
+def get_extractor(name: str) -> Extractor:
+    """Return the extractor registered as ``name``, falling back to bs4 if its dependency is missing."""
+    name = (name or SoupExtractor.name).lower()
+    if name not in EXTRACTORS:
+        raise ValueError(f"지원하지 않는 추출기입니다: {name}")
+    extractor = _instances.get(name)
+    if extractor is None:
+        try:
+            extractor = EXTRACTORS[name]()
+        except ImportError as exc:
+            logger.warning("%s 추출기를 사용할 수 없어 bs4로 대체합니다: %s", name, exc)
+            extractor = _instances.get(SoupExtractor.name) or SoupExtractor()
+        _instances[name] = extractor
+    return extractor
+
+
+def collapse_spaces(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
@@ -0,0 +1,140 @@
+"""Shared, pooled HTTP sessions so outbound calls reuse keep-alive connections."""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from backend.config import settings
+
+
+@dataclass
+class PoolStats:
+    """Connection checkouts served from an idle pooled connection (hit) or a new one (miss)."""
+
+    checkouts: int = 0
+    new_connections: int = 0
+    recycled_sessions: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def record_new_connection(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    def record_recycle(self) -> None:
+        with self._lock:
+            self.recycled_sessions += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            hits = max(self.checkouts - self.new_connections, 0)
+            return {
+                "hits": hits,
+                "misses": self.new_connections,
+                "hitRate": round(hits / self.checkouts, 4) if self.checkouts else None,
+                "recycledSessions": self.recycled_sessions,
+            }
+
+
+def _counting_pool(base: type, stats: PoolStats) -> type:
+    class CountingPool(base):  # type: ignore[misc, valid-type]
+        def _get_conn(self, timeout=None):
+            stats.record_checkout()
+            return super()._get_conn(timeout=timeout)
+
+        def _new_conn(self):
+            stats.record_new_connection()
+            return super()._new_conn()
+
+    CountingPool.__name__ = f"Counting{base.__name__}"
+    return CountingPool
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host urllib3 pools report hit/miss counters."""
+
+    def __init__(self, stats: PoolStats, **kwargs) -> None:
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self.stats),
+            "https": _counting_pool(HTTPSConnectionPool, self.stats),
+        }
+
+
+class _PooledSession:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.stats = PoolStats()
+        self._lock = threading.Lock()
+        self._session = self._build()
+        self._last_used = time.monotonic()
+
+    def _build(self) -> requests.Session:
+        session = requests.Session()
+        adapter = PooledAdapter(
+            self.stats,
+            pool_connections=settings.http_pool_connections,
+            pool_maxsize=settings.http_pool_maxsize,
+            pool_block=settings.http_pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get(self) -> requests.Session:
+        with self._lock:
+            now = time.monotonic()
+            idle = now - self._last_used
+            if settings.http_keepalive_timeout > 0 and idle > settings.http_keepalive_timeout:
+                # Idle connections past the keep-alive window are most likely closed
+                # server-side, so start a fresh pool instead of paying for a failed reuse.
+                # The old session is not closed: other threads may still be mid-request
+                # on it. Its pools close their sockets once the last user drops it.
+                self._session = self._build()
+                self.stats.record_recycle()
+            self._last_used = now
+            return self._session
+
+    def close(self) -> None:
+        with self._lock:
+            self._session.close()
+
+
+_sessions: Dict[str, _PooledSession] = {}
+_registry_lock = threading.Lock()
+
+
+def get_session(name: str = "default") -> requests.Session:
+    """Return the shared pooled session registered under ``name``."""
+    pooled = _sessions.get(name)
+    if pooled is None:
+        with _registry_lock:
+            pooled = _sessions.get(name)
+            if pooled is None:
+                pooled = _PooledSession(name)
+                _sessions[name] = pooled
+    return pooled.get()
+
+
+def pool_stats() -> Dict[str, dict]:
+    return {name: pooled.stats.to_dict() for name, pooled in list(_sessions.items())}
+
+
+def close_sessions() -> None:
+    with _registry_lock:
+        for pooled in _sessions.values():
+            pooled.close()
+        _sessions.clear()
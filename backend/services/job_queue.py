@@ -0,0 +1,341 @@
+"""Persistent background job queue backed by SQLite.
+
+Requests that would otherwise hold a connection for the whole fetch + LLM round
+trip can be submitted as jobs instead. :meth:`JobQueue.submit` stores the job and
+returns its id immediately. A bounded set of worker threads in each process
+claims queued jobs (lowest priority value first, then FIFO) and runs the handler
+registered for the job's kind.
+
+Several processes (gunicorn workers) can share one database file. Claiming is a
+single ``BEGIN IMMEDIATE`` transaction, so a job runs in one worker only. A
+running job carries a lease that its owner renews. If the process dies, the lease
+expires and another worker, or the same one after a restart, queues the job again.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from .metrics import stage
+from .resilience import BATCH, INTERACTIVE, priority_scope
+
+
+logger = logging.getLogger(__name__)
+
+
+JOB_PRIORITIES = {"high": 0, "normal": 5, "low": 9}
+TERMINAL_STATES = ("done", "failed", "cancelled")
+# Longest pause between retries after a database error (e.g. "database is locked").
+MAX_DB_BACKOFF = 30.0
+
+
+class QueueFullError(RuntimeError):
+    """Too many jobs are waiting; the caller should retry later."""
+
+
+class JobQueue:
+    def __init__(
+        self,
+        path: str,
+        handlers: Dict[str, Callable[[dict], Any]],
+        workers: int = 4,
+        lease: float = 30.0,
+        max_attempts: int = 3,
+        max_queued: int = 1000,
+        ttl: float = 86400.0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.handlers = handlers
+        self.workers = max(1, workers)
+        self.lease = max(1.0, lease)
+        self.max_attempts = max(1, max_attempts)
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running: Dict[str, float] = {}
+        self._connection = self._connect()
+        self._pid = os.getpid()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Same fork rule as SQLiteCache: workers forked from a preloaded master reopen the file.
+        if self._pid != os.getpid():
+            self._connection = self._connect()
+            self._pid = os.getpid()
+            self.owner = uuid.uuid4().hex
+            self._threads = []
+            self._running = {}
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " params TEXT NOT NULL,"
+            " priority INTEGER NOT NULL,"
+            " status TEXT NOT NULL,"
+            " result TEXT,"
+            " error TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " owner TEXT,"
+            " lease_until REAL,"
+            " created_at REAL NOT NULL,"
+            " started_at REAL,"
+            " finished_at REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, created_at)")
+        return conn
+
+    # -- client side -------------------------------------------------------
+
+    def submit(self, kind: str, params: dict, priority: int = JOB_PRIORITIES["normal"]) -> dict:
+        if kind not in self.handlers:
+            raise ValueError(f"지원하지 않는 작업 종류입니다: {kind}")
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            (queued,) = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()
+            if queued >= self.max_queued:
+                raise QueueFullError("작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해 주세요.")
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, params, priority, status, created_at) VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, kind, json.dumps(params, ensure_ascii=False), priority, time.time()),
+            )
+        # Hosts that never call start() (``flask run``, gunicorn without our config) would
+        # otherwise accept jobs that never run. Only serving processes submit, never a
+        # preloading master, so starting here is safe.
+        self.start()
+        self._notify()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, priority, status, result, error, attempts, created_at, started_at, finished_at"
+                " FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, kind, priority, status, result, error, attempts, created_at, started_at, finished_at = row
+        return {
+            "jobId": job_id,
+            "kind": kind,
+            "priority": priority,
+            "status": status,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "attempts": attempts,
+            "createdAt": created_at,
+            "startedAt": started_at,
+            "finishedAt": finished_at,
+        }
+
+    def wait(self, job_id: str, timeout: float) -> Optional[dict]:
+        """Long-poll: return the job once it is finished, or its current state after ``timeout`` seconds."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job["status"] in TERMINAL_STATES or remaining <= 0:
+                return job
+            # Local workers notify; jobs finished by other processes are seen on the next poll.
+            with self._changed:
+                self._changed.wait(min(remaining, self.poll_interval))
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """Cancel a queued or running job. A running handler is not interrupted; its result is discarded."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ?, owner = NULL"
+                " WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id),
+            )
+        self._notify()
+        return self.get(job_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {"workers": self.workers, "runningHere": len(self._running), **dict(rows)}
+
+    # -- worker side -------------------------------------------------------
+
+    def start(self) -> None:
+        """Start this process's worker threads (idempotent, and again after a fork).
+
+        Called from the serving process only (gunicorn ``post_worker_init``, ASGI
+        ``before_serving``, the dev server, or the first :meth:`submit`), never from
+        a preloading master. Does nothing once :meth:`stop` has been called.
+        """
+        with self._lock:
+            self._conn  # pylint: disable=pointless-statement  # resets thread state after a fork
+            if self._threads or self._stop.is_set():
+                return
+            self._threads = [
+                threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+                for index in range(self.workers)
+            ]
+            self._threads.append(threading.Thread(target=self._maintain, name="job-lease", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float) -> None:
+        """Stop claiming jobs, wait up to ``timeout`` for running ones, then hand the rest back to the queue."""
+        self._stop.set()
+        self._notify()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            released = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, lease_until = NULL,"
+                " attempts = MAX(attempts - 1, 0) WHERE owner = ? AND status = 'running'",
+                (self.owner,),
+            ).rowcount
+        if released:
+            logger.warning("종료 전에 끝나지 않은 작업 %d건을 대기열로 되돌렸습니다.", released)
+
+    def _work(self) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+                if job is not None:
+                    # If recording the result fails, the job keeps its lease, which is
+                    # no longer renewed; it expires and the job is queued again.
+                    self._run(*job)
+            except sqlite3.Error as exc:
+                failures += 1
+                logger.warning("작업 대기열 DB 오류(%d회 연속): %s", failures, exc)
+                self._stop.wait(self._backoff(failures))
+                continue
+            failures = 0
+            if job is None:
+                with self._changed:
+                    self._changed.wait(self.poll_interval)
+
+    def _claim(self) -> Optional[tuple]:
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, kind, params, priority FROM jobs WHERE status = 'queued'"
+                    " ORDER BY priority, created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, lease_until = ?, started_at = ?,"
+                        " attempts = attempts + 1 WHERE id = ?",
+                        (self.owner, now + self.lease, now, row[0]),
+                    )
+                    self._running[row[0]] = now
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def _run(self, job_id: str, kind: str, params: str, priority: int) -> None:
+        result: Optional[str] = None
+        error: Optional[str] = None
+        upstream_priority = INTERACTIVE if priority <= JOB_PRIORITIES["high"] else BATCH
+        try:
+            with stage(f"job_{kind}"), priority_scope(upstream_priority):
+                result = json.dumps(self.handlers[kind](json.loads(params)), ensure_ascii=False)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("작업 %s(%s) 실패: %s", job_id, kind, exc)
+            error = str(exc) or exc.__class__.__name__
+        with self._lock:
+            self._running.pop(job_id, None)
+            # The owner check drops the result if the job was cancelled or re-leased meanwhile.
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, owner = NULL, lease_until = NULL"
+                " WHERE id = ? AND owner = ? AND status = 'running'",
+                ("failed" if error else "done", result, error, time.time(), job_id, self.owner),
+            )
+        self._notify()
+
+    def _maintain(self) -> None:
+        interval = self.lease / 3
+        last_purge = 0.0
+        delay = interval
+        failures = 0
+        while not self._stop.wait(delay):
+            now = time.time()
+            purge = bool(self.ttl) and now - last_purge > 60
+            try:
+                requeued = self._maintain_once(now, purge)
+            except sqlite3.Error as exc:
+                failures += 1
+                logger.warning("작업 임대 갱신 중 DB 오류(%d회 연속): %s", failures, exc)
+                # Retry before the next round so the leases of running jobs do not lapse.
+                delay = min(interval, self._backoff(failures))
+                continue
+            failures, delay = 0, interval
+            if purge:
+                last_purge = now
+            if requeued:
+                logger.info("임대가 만료된 작업 %d건을 다시 대기열에 넣었습니다.", requeued)
+                self._notify()
+
+    def _maintain_once(self, now: float, purge: bool) -> int:
+        """Renew this process's leases, requeue or fail expired jobs and optionally purge old ones."""
+        with self._lock:
+            if self._running:
+                self._conn.execute(
+                    "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = 'running'",
+                    (now + self.lease, self.owner),
+                )
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, owner = NULL"
+                " WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                ("작업이 여러 번 중단되어 실패 처리했습니다.", now, now, self.max_attempts),
+            )
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, lease_until = NULL"
+                " WHERE status = 'running' AND lease_until < ?",
+                (now,),
+            ).rowcount
+            if purge:
+                self._conn.execute(
+                    "DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND finished_at < ?",
+                    (now - self.ttl,),
+                )
+        return requeued
+
+    def _backoff(self, failures: int) -> float:
+        return min(MAX_DB_BACKOFF, self.poll_interval * 2 ** min(failures - 1, 10))
+
+    def _notify(self) -> None:
+        with self._changed:
+            self._changed.notify_all()
+
+
+def parse_priority(raw: Any) -> int:
+    """``"high"``/``"normal"``/``"low"`` or an integer 0-9 (lower runs first)."""
+    if raw is None or raw == "":
+        return JOB_PRIORITIES["normal"]
+    if isinstance(raw, str) and raw.strip().lower() in JOB_PRIORITIES:
+        return JOB_PRIORITIES[raw.strip().lower()]
+    try:
+        value = int(raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"priority는 high, normal, low 또는 0-9 사이 정수여야 합니다: {raw}") from exc
+    return min(9, max(0, value))
@@ -0,0 +1,267 @@
+"""Map-reduce summarization for documents that do not fit one prompt (``mode=long``).
+
+The full extracted text is cut into paragraph-aligned chunks of at most
+``long_chunk_tokens``. The chunks are summarized in parallel (map), and one final
+call merges the partial notes (reduce). Each chunk summary is cached by a hash
+of its content. Chunk boundaries are chosen from the paragraphs themselves, not
+from the document length, so after an edit only the chunks around it change and
+only those are sent again. When there are more than ``long_max_chunks`` partial
+notes, neighbouring notes are joined before the reduce call.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from backend.config import settings
+
+from .async_fetcher import afetch_page
+from .cache import SummaryCache
+from .content_fetcher import FetchedPage, fetch_page, normalize_url
+from .metrics import in_context
+from .perplexity_client import PerplexityClient
+from .prompt_builder import estimate_tokens
+from .url_service import _build_payload, _describe_http_error, cached_by_url, local_summary_fallback
+
+
+LONG_NAMESPACE = "long"
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。])\s+")
+# A chunk is not cut at a content-defined point before it holds this share of the token limit.
+MIN_CHUNK_FRACTION = 0.25
+
+_map_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def summarize_long_url(
+    url: str,
+    client: Optional[PerplexityClient],
+    client_error: Optional[str] = None,
+    cache: Optional[SummaryCache] = None,
+) -> Tuple[str, Dict]:
+    requested_url = normalize_url(url)
+    cached = cached_by_url(requested_url, cache, LONG_NAMESPACE)
+    if cached is not None:
+        return cached["summary"], cached
+    page = fetch_page(requested_url, text_budget=settings.long_text_budget)
+    plan = _LongPlan(page, requested_url, client, cache)
+    if client is None:
+        return plan.finish(None, [], client_error or "Perplexity API를 사용할 수 없습니다.")
+
+    try:
+        if len(plan.chunks) == 1:
+            summary, citations = client.summarize_webpage(page.title, plan.chunks[0])
+            return plan.finish(summary, citations, None)
+        pool = _get_map_pool()
+        futures = [
+            (
+                index,
+                pool.submit(in_context(client.summarize_chunk, page.title, plan.chunks[index], index, len(plan.chunks))),
+            )
+            for index in plan.pending()
+        ]
+        for index, future in futures:
+            plan.partial_done(index, future.result())
+        summary, citations = client.reduce_summaries(page.title, plan.partials())
+    except requests.HTTPError as exc:
+        return plan.finish(None, [], _describe_http_error(exc))
+    except requests.RequestException as exc:
+        return plan.finish(None, [], f"Perplexity API 네트워크 오류: {exc}")
+    return plan.finish(summary, citations, None)
+
+
+async def asummarize_long_url(
+    url: str,
+    client: Optional[PerplexityClient],
+    client_error: Optional[str] = None,
+    cache: Optional[SummaryCache] = None,
+) -> Tuple[str, Dict]:
+    """asyncio variant of :func:`summarize_long_url`."""
+    requested_url = normalize_url(url)
+    cached = cached_by_url(requested_url, cache, LONG_NAMESPACE)
+    if cached is not None:
+        return cached["summary"], cached
+    page = await afetch_page(requested_url, text_budget=settings.long_text_budget)
+    plan = _LongPlan(page, requested_url, client, cache)
+    if client is None:
+        return plan.finish(None, [], client_error or "Perplexity API를 사용할 수 없습니다.")
+
+    gate = asyncio.Semaphore(max(1, settings.long_map_concurrency))
+
+    async def run(index: int) -> None:
+        async with gate:
+            partial = await client.asummarize_chunk(page.title, plan.chunks[index], index, len(plan.chunks))
+        plan.partial_done(index, partial)
+
+    try:
+        if len(plan.chunks) == 1:
+            summary, citations = await client.asummarize_webpage(page.title, plan.chunks[0])
+            return plan.finish(summary, citations, None)
+        await asyncio.gather(*(run(index) for index in plan.pending()))
+        summary, citations = await client.areduce_summaries(page.title, plan.partials())
+    except requests.HTTPError as exc:
+        return plan.finish(None, [], _describe_http_error(exc))
+    except requests.RequestException as exc:
+        return plan.finish(None, [], f"Perplexity API 네트워크 오류: {exc}")
+    return plan.finish(summary, citations, None)
+
+
+def chunk_text(text: str, model: str, chunk_tokens: int) -> List[str]:
+    """Group paragraphs into chunks of at most ``chunk_tokens``, cutting at content-defined paragraph boundaries."""
+    paragraphs = [line.strip() for line in text.split("\n") if line.strip()]
+    return _pack(paragraphs, max(1, chunk_tokens), model)
+
+
+def merge_partials(partials: List[str], max_chunks: int) -> List[str]:
+    """Join neighbouring partial notes so that at most ``max_chunks`` reach the reduce call."""
+    size = math.ceil(len(partials) / max(1, max_chunks))
+    if size <= 1:
+        return partials
+    return ["\n".join(partials[start:start + size]) for start in range(0, len(partials), size)]
+
+
+class _LongPlan:
+    def __init__(
+        self,
+        page: FetchedPage,
+        requested_url: str,
+        client: Optional[PerplexityClient],
+        cache: Optional[SummaryCache],
+    ) -> None:
+        if not page.text:
+            raise ValueError("콘텐츠를 추출하지 못했습니다. 다른 URL을 시도해 주세요.")
+        self.page = page
+        self.requested_url = requested_url
+        self.client = client
+        self.cache = cache
+        model = client.model if client else ""
+        self.chunks = chunk_text(page.text, model, settings.long_chunk_tokens)
+        self.keys = [self._chunk_key(chunk) for chunk in self.chunks]
+        self._partials: Dict[int, str] = {}
+        self.cached_chunks = 0
+        self.prompt_tokens = 0
+        self._lock = threading.Lock()
+        if cache is not None and client is not None and len(self.chunks) > 1:
+            for index, key in enumerate(self.keys):
+                hit = cache.get_chunk(key)
+                if hit is not None:
+                    self._partials[index] = hit
+                    self.cached_chunks += 1
+
+    def pending(self) -> List[int]:
+        return [index for index in range(len(self.chunks)) if index not in self._partials]
+
+    def partial_done(self, index: int, partial: str) -> None:
+        with self._lock:
+            self._partials[index] = partial
+            self.prompt_tokens += estimate_tokens(self.chunks[index], self.client.model)
+        if self.cache is not None:
+            self.cache.store_chunk(self.keys[index], partial)
+
+    def partials(self) -> List[str]:
+        partials = merge_partials(
+            [self._partials[index] for index in range(len(self.chunks))], settings.long_max_chunks
+        )
+        self.prompt_tokens += estimate_tokens("\n\n".join(partials), self.client.model)
+        return partials
+
+    def finish(
+        self, summary: Optional[str], citations: list, fallback_reason: Optional[str]
+    ) -> Tuple[str, Dict]:
+        page = self.page
+        if fallback_reason is not None:
+            summary = local_summary_fallback(page.title, page.text)
+        elif len(self.chunks) == 1:
+            self.prompt_tokens = self.client.summary_prompt_tokens(page.title, self.chunks[0])
+        payload = _build_payload(
+            summary,
+            citations,
+            page.title,
+            page.final_url,
+            fallback_reason is not None,
+            fallback_reason,
+            page.revalidated,
+            self.prompt_tokens if self.client else None,
+            page.security,
+        )
+        payload.update(mode=LONG_NAMESPACE, chunks=len(self.chunks), chunksCached=self.cached_chunks)
+        if self.cache is not None and fallback_reason is None:
+            self.cache.store([self.requested_url, page.final_url], None, payload, namespace=LONG_NAMESPACE)
+        return summary, {**payload, "cached": False, "cacheLevel": None}
+
+    def _chunk_key(self, chunk: str) -> str:
+        digest = hashlib.sha256()
+        model = self.client.model if self.client else ""
+        temperature = self.client.temperature if self.client else 0.0
+        for part in (model, repr(float(temperature)), self.page.title, chunk):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return f"chunk:{digest.hexdigest()}"
+
+
+def _pack(paragraphs: List[str], limit: int, model: str) -> List[str]:
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for paragraph in paragraphs:
+        for piece in _split_oversized(paragraph, limit, model):
+            cost = estimate_tokens(piece, model) + 1
+            if current and used + cost > limit:
+                chunks.append("\n".join(current))
+                current, used = [], 0
+            current.append(piece)
+            used += cost
+            # Cut where the content says so rather than where the running total lands:
+            # an edit then moves boundaries only up to the next cut point after it.
+            if used >= limit * MIN_CHUNK_FRACTION and _is_cut_point(piece, cost, limit):
+                chunks.append("\n".join(current))
+                current, used = [], 0
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _is_cut_point(piece: str, cost: int, limit: int) -> bool:
+    """Whether a chunk may end after ``piece``; longer pieces are proportionally likelier cut points."""
+    digest = hashlib.blake2b(piece.encode("utf-8"), digest_size=8).digest()
+    # On average a cut comes about half a chunk past the minimum size.
+    return int.from_bytes(digest, "big") / 2 ** 64 < cost * 2 / limit
+
+
+def _split_oversized(paragraph: str, limit: int, model: str) -> List[str]:
+    if estimate_tokens(paragraph, model) <= limit:
+        return [paragraph]
+    pieces: List[str] = []
+    current = ""
+    for sentence in SENTENCE_BOUNDARY.split(paragraph):
+        candidate = f"{current} {sentence}".strip()
+        if current and estimate_tokens(candidate, model) > limit:
+            pieces.append(current)
+            candidate = sentence
+        while estimate_tokens(candidate, model) > limit:
+            # A single sentence longer than a chunk: hard cut by characters.
+            cut = max(1, len(candidate) * limit // max(1, estimate_tokens(candidate, model)))
+            pieces.append(candidate[:cut])
+            candidate = candidate[cut:]
+        current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _get_map_pool() -> ThreadPoolExecutor:
+    global _map_pool  # pylint: disable=global-statement
+    if _map_pool is None:
+        with _pool_lock:
+            if _map_pool is None:
+                _map_pool = ThreadPoolExecutor(
+                    max_workers=max(1, settings.long_map_concurrency), thread_name_prefix="long-map"
+                )
+    return _map_pool
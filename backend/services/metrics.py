@@ -0,0 +1,162 @@
+"""In-process latency histograms with Prometheus text exposition and Server-Timing support.
+
+Code wraps each pipeline stage (fetch attempt, download, parse, LLM call,
+wiki call, fallback, ...) in :func:`stage`. The duration goes into a histogram
+labelled with the current route, the stage name and its outcome. The route
+comes from a context variable that the web app sets per request (see
+:func:`begin_request`). Code that runs on thread pools keeps those labels when
+it is submitted through :func:`in_context`.
+
+Recording a sample takes one lock and a bisect over a few bucket bounds.
+Rendering only walks the series that exist, so frequent scrapes stay cheap.
+"""
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.config import settings
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+NO_ROUTE = "-"
+
+_route: contextvars.ContextVar[str] = contextvars.ContextVar("metrics_route", default=NO_ROUTE)
+_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "metrics_timings", default=None
+)
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[label_values] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = [(labels, list(series[0]), series[1], series[2]) for labels, series in self._series.items()]
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, counts, total, count in sorted(snapshot):
+            base = ",".join(f'{key}="{_escape(value)}"' for key, value in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{base}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+stage_seconds = Histogram(
+    "summarizer_stage_duration_seconds",
+    "Duration of one pipeline stage (fetch attempt, parse, LLM call, ...).",
+    ("route", "stage", "outcome"),
+)
+request_seconds = Histogram(
+    "summarizer_request_duration_seconds",
+    "End-to-end HTTP request duration.",
+    ("route", "method", "status"),
+)
+HISTOGRAMS = (request_seconds, stage_seconds)
+
+
+class StageTimer:
+    __slots__ = ("outcome",)
+
+    def __init__(self) -> None:
+        self.outcome = "ok"
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageTimer]:
+    """Time the block as stage ``name``; an exception marks it ``error`` unless an outcome was set."""
+    timer = StageTimer()
+    started = time.perf_counter()
+    try:
+        yield timer
+    except BaseException:
+        if timer.outcome == "ok":
+            timer.outcome = "error"
+        raise
+    finally:
+        observe_stage(name, time.perf_counter() - started, timer.outcome)
+
+
+def observe_stage(name: str, seconds: float, outcome: str = "ok") -> None:
+    if not settings.metrics_enabled:
+        return
+    stage_seconds.observe(seconds, _route.get(), name, outcome)
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def in_context(fn: Callable, *args, **kwargs) -> Callable[[], object]:
+    """Bind ``fn`` to a copy of the current context so pool threads keep the request's labels."""
+    context = contextvars.copy_context()
+    return lambda: context.run(fn, *args, **kwargs)
+
+
+def begin_request(route: str) -> None:
+    _route.set(route)
+    _timings.set([])
+
+
+def end_request() -> None:
+    # Plain set instead of token reset: streamed responses finish outside the hook's context.
+    _route.set(NO_ROUTE)
+    _timings.set(None)
+
+
+def observe_request(route: str, method: str, status: int, seconds: float) -> None:
+    if settings.metrics_enabled:
+        request_seconds.observe(seconds, route, method, str(status))
+
+
+def server_timing_header(total_seconds: Optional[float] = None) -> str:
+    """``Server-Timing`` value for the current request; repeated stages are summed."""
+    totals: Dict[str, List[float]] = {}
+    for name, seconds in list(_timings.get() or ()):
+        entry = totals.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = [
+        f'{name};dur={seconds * 1000:.1f}' + (f';desc="x{count}"' if count > 1 else "")
+        for name, (seconds, count) in totals.items()
+    ]
+    if total_seconds is not None:
+        parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,53 +1,256 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
-from typing import Any, Dict, List, Tuple
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
 
+from backend.config import settings
+
+from .async_http import get_async_client
+from .http_session import get_session
+from .metrics import stage
+from .prompt_builder import estimate_tokens
+from .resilience import CircuitBreaker, RetryPolicy, TokenBucket, UpstreamGuard
+from .singleflight import get_flight
+
 logger = logging.getLogger(__name__)
 
+_STREAM_DONE = object()
+_guard: UpstreamGuard | None = None
+_guard_lock = threading.Lock()
+
+
+def perplexity_guard() -> UpstreamGuard:
+    """Process-wide limiter/breaker shared by every client instance, sized by settings."""
+    global _guard  # pylint: disable=global-statement
+    if _guard is None:
+        with _guard_lock:
+            if _guard is None:
+                _guard = UpstreamGuard(
+                    TokenBucket(settings.perplexity_rate_per_minute / 60, settings.perplexity_burst),
+                    CircuitBreaker(settings.perplexity_breaker_threshold, settings.perplexity_breaker_reset),
+                    RetryPolicy(
+                        max_attempts=settings.perplexity_max_attempts,
+                        deadline=settings.perplexity_retry_deadline,
+                        base_delay=settings.perplexity_backoff_base,
+                        max_delay=settings.perplexity_backoff_max,
+                    ),
+                    timeout=settings.request_timeout,
+                )
+    return _guard
+
 
 class PerplexityClient:
     """Lightweight wrapper around the Perplexity chat-completions API."""
 
     API_URL = "https://api.perplexity.ai/chat/completions"
 
-    def __init__(self, api_key: str, model: str, temperature: float, timeout: int = 20) -> None:
+    def __init__(self, api_key: str, model: str, temperature: float, api_url: Optional[str] = None) -> None:
         if not api_key:
             raise ValueError("PERPLEXITY_API_KEY가 설정되어 있지 않습니다.")
+        self.api_url = api_url or self.API_URL
         self.api_key = api_key
         self.model = model
         self.temperature = temperature
-        self.timeout = timeout
 
-    def _post(self, messages: List[Dict[str, str]], **extra: Any) -> Dict[str, Any]:
-        headers = {
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
-        payload: Dict[str, Any] = {
+
+    def _payload(self, messages: List[Dict[str, str]], **extra: Any) -> Dict[str, Any]:
+        return {
             "model": self.model,
             "messages": messages,
             "temperature": self.temperature,
             **extra,
         }
-        response = requests.post(
-            self.API_URL,
-            headers=headers,
-            json=payload,
-            timeout=self.timeout,
+
+    def _post(self, messages: List[Dict[str, str]], **extra: Any) -> Dict[str, Any]:
+        """POST through the shared rate limiter, retry policy and circuit breaker."""
+        return perplexity_guard().call(lambda timeout: self._post_once(messages, timeout, **extra))
+
+    def _post_once(self, messages: List[Dict[str, str]], timeout: float, **extra: Any) -> Dict[str, Any]:
+        with stage("llm"):
+            response = get_session("perplexity").post(
+                self.api_url,
+                headers=self._headers(),
+                json=self._payload(messages, **extra),
+                timeout=timeout,
+            )
+            try:
+                response.raise_for_status()
+            except requests.HTTPError as exc:  # pragma: no cover - network errors
+                body = response.text[:500]
+                raise requests.HTTPError(f"{exc}; body={body}", response=response) from exc
+            return response.json()
+
+    async def _apost(self, messages: List[Dict[str, str]], **extra: Any) -> Dict[str, Any]:
+        """Async ``_post``; httpx errors are re-raised as the matching ``requests`` exceptions
+        so callers (and the retry policy) handle both paths with the same ``except`` clauses."""
+        return await perplexity_guard().acall(lambda timeout: self._apost_once(messages, timeout, **extra))
+
+    async def _apost_once(self, messages: List[Dict[str, str]], timeout: float, **extra: Any) -> Dict[str, Any]:
+        import httpx  # pylint: disable=import-outside-toplevel
+
+        with stage("llm"):
+            try:
+                response = await get_async_client().post(
+                    self.api_url,
+                    headers=self._headers(),
+                    json=self._payload(messages, **extra),
+                    timeout=timeout,
+                )
+            except httpx.TimeoutException as exc:
+                raise requests.Timeout(str(exc)) from exc
+            except httpx.HTTPError as exc:
+                raise requests.ConnectionError(str(exc)) from exc
+            if response.is_error:
+                body = response.text[:500]
+                raise requests.HTTPError(
+                    f"{response.status_code} {response.reason_phrase} for url: {self.api_url}; body={body}",
+                    response=response,
+                )
+            return response.json()
+
+    def summarize_webpage(self, title: str, text: str) -> Tuple[str, List[Dict[str, str]]]:
+        """Summarize a page; identical in-flight requests share one API call."""
+        return get_flight("perplexity-summary").do(
+            self._summary_key(title, text),
+            lambda: self._parse_summary(self._post(self._summary_messages(title, text), return_citations=True)),
         )
+
+    async def asummarize_webpage(self, title: str, text: str) -> Tuple[str, List[Dict[str, str]]]:
+        async def call() -> Tuple[str, List[Dict[str, str]]]:
+            data = await self._apost(self._summary_messages(title, text), return_citations=True)
+            return self._parse_summary(data)
+
+        return await get_flight("perplexity-summary").ado(self._summary_key(title, text), call)
+
+    def _summary_key(self, title: str, text: str) -> str:
+        digest = hashlib.sha256()
+        for part in (self.model, repr(float(self.temperature)), title, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def stream_summary(self, title: str, text: str) -> Iterator[Tuple[str, Any]]:
+        """Stream a summary with ``stream: true``.
+
+        Yields ``("token", str)`` for each content delta and, last, ``("citations", list)``.
+        HTTP and network errors are raised like :meth:`_post`, possibly after some tokens.
+        """
+        messages = self._summary_messages(title, text)
+        # Retries only cover opening the stream; once tokens flow, errors propagate. The guard counts
+        # the call as in flight until the body is read, so draining waits for live streams.
+        with perplexity_guard().stream(lambda timeout: self._open_stream(messages, timeout)) as response:
+            with response:
+                citations: List[Dict[str, str]] = []
+                for line in response.iter_lines(decode_unicode=True):
+                    chunk = self._parse_stream_line(line)
+                    if chunk is None:
+                        continue
+                    if chunk is _STREAM_DONE:
+                        break
+                    choice = (chunk.get("choices") or [{}])[0]
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yield "token", delta
+                    citations = chunk.get("citations") or choice.get("citations") or citations
+        yield "citations", citations
+
+    def _open_stream(self, messages: List[Dict[str, str]], timeout: float) -> requests.Response:
+        # Only time-to-headers is timed here; the token stream itself is part of the request.
+        with stage("llm_stream_open"):
+            response = get_session("perplexity").post(
+                self.api_url,
+                headers={**self._headers(), "Accept": "text/event-stream"},
+                json=self._payload(messages, return_citations=True, stream=True),
+                timeout=timeout,
+                stream=True,
+            )
+            try:
+                response.raise_for_status()
+            except requests.HTTPError as exc:  # pragma: no cover - network errors
+                body = response.text[:500]
+                response.close()
+                raise requests.HTTPError(f"{exc}; body={body}", response=response) from exc
+            return response
+
+    @staticmethod
+    def _parse_stream_line(line: str | bytes | None) -> Any:
+        if not line:
+            return None
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        if not line.startswith("data:"):
+            return None
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return _STREAM_DONE
         try:
-            response.raise_for_status()
-        except requests.HTTPError as exc:  # pragma: no cover - network errors
-            body = response.text[:500]
-            raise requests.HTTPError(f"{exc}; body={body}", response=response) from exc
-        return response.json()
+            return json.loads(data)
+        except json.JSONDecodeError:
+            logger.warning("스트리밍 청크를 해석하지 못했습니다: %s", data[:200])
+            return None
 
-    def summarize_webpage(self, title: str, text: str) -> Tuple[str, List[Dict[str, str]]]:
-        messages = [
+    def summarize_chunk(self, title: str, chunk: str, index: int, total: int) -> str:
+        """Map step of long-document mode: dense notes for one section."""
+        data = self._post(self._chunk_messages(title, chunk, index, total))
+        return data["choices"][0]["message"]["content"].strip()
+
+    async def asummarize_chunk(self, title: str, chunk: str, index: int, total: int) -> str:
+        data = await self._apost(self._chunk_messages(title, chunk, index, total))
+        return data["choices"][0]["message"]["content"].strip()
+
+    def reduce_summaries(self, title: str, partials: List[str]) -> Tuple[str, List[Dict[str, str]]]:
+        """Reduce step of long-document mode: one summary from the per-chunk notes."""
+        data = self._post(self._reduce_messages(title, partials), return_citations=True)
+        return self._parse_summary(data)
+
+    async def areduce_summaries(self, title: str, partials: List[str]) -> Tuple[str, List[Dict[str, str]]]:
+        data = await self._apost(self._reduce_messages(title, partials), return_citations=True)
+        return self._parse_summary(data)
+
+    def _chunk_messages(self, title: str, chunk: str, index: int, total: int) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": "system",
+                "content": "You condense one section of a long document into dense factual notes for a later merge step.",
+            },
+            {
+                "role": "user",
+                "content": (
+                    f"제목이 '{title}'인 긴 문서의 {index + 1}/{total}번째 부분입니다.\n"
+                    "이 부분의 핵심 사실, 수치, 경고를 빠짐없이 5줄 이내 bullet로 정리해 주세요.\n"
+                    "본문:\n"
+                    f"{chunk}"
+                ),
+            },
+        ]
+
+    def _reduce_messages(self, title: str, partials: List[str]) -> List[Dict[str, str]]:
+        notes = "\n\n".join(f"[{i + 1}]\n{partial}" for i, partial in enumerate(partials))
+        messages = self._summary_messages(title, notes)
+        messages[1]["content"] = (
+            f"제목이 '{title}'인 긴 문서를 부분별로 정리한 메모입니다.\n"
+            "문서 전체의 핵심 개념, 주요 경고, 실행 가능한 인사이트를 8줄 이내 bullet 형식으로 요약해 주세요.\n"
+            "메모:\n"
+            f"{notes}"
+        )
+        return messages
+
+    def summary_prompt_tokens(self, title: str, text: str) -> int:
+        """Estimated prompt tokens of a summary request for ``text``."""
+        return sum(estimate_tokens(message["content"], self.model) + 4 for message in self._summary_messages(title, text))
+
+    def _summary_messages(self, title: str, text: str) -> List[Dict[str, str]]:
+        return [
             {
                 "role": "system",
                 "content": (
@@ -65,26 +268,60 @@ class PerplexityClient:
                 ),
             },
         ]
-        data = self._post(messages, return_citations=True)
+
+    def _parse_summary(self, data: Dict[str, Any]) -> Tuple[str, List[Dict[str, str]]]:
         choice = data["choices"][0]
         content = choice["message"]["content"].strip()
         citations = choice.get("citations") or []
         return content, citations
 
-    def research_resources(self, keyword: str) -> List[Dict[str, str]]:
+    def research_group(self, keywords: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        """Research several keywords in one call; resources are grouped by the keyword they answer."""
+        data = self._post(self._group_research_messages(keywords))
+        return self._split_by_keyword(keywords, data["choices"][0]["message"]["content"])
+
+    async def aresearch_group(self, keywords: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        data = await self._apost(self._group_research_messages(keywords))
+        return self._split_by_keyword(keywords, data["choices"][0]["message"]["content"])
+
+    def _group_research_messages(self, keywords: List[str]) -> List[Dict[str, str]]:
+        if len(keywords) == 1:
+            return self._research_messages(keywords[0])
+        topics = "\n".join(f"- {keyword}" for keyword in keywords)
+        prompt = (
+            "You are a metasearch analyst. For EACH focus topic below, return 3-5 helpful resources.\n"
+            "JSON schema: [{\"keyword\": str, \"title\": str, \"summary\": str, \"url\": str}], "
+            "where keyword repeats the focus topic exactly as written. "
+            "Only include trustworthy official sources when possible.\n"
+            f"Focus topics:\n{topics}"
+        )
+        return [
+            {"role": "system", "content": "You output valid JSON arrays only."},
+            {"role": "user", "content": prompt},
+        ]
+
+    def _split_by_keyword(self, keywords: List[str], text: str) -> Dict[str, List[Dict[str, str]]]:
+        grouped: Dict[str, List[Dict[str, str]]] = {keyword: [] for keyword in keywords}
+        lookup = {keyword.lower(): keyword for keyword in keywords}
+        for item in self._parse_json_array(text):
+            answered = lookup.get(item.pop("keyword", "").strip().lower())
+            if answered is None:
+                haystack = f"{item['title']} {item['summary']}".lower()
+                answered = next((kw for kw in keywords if kw.lower() in haystack), keywords[0])
+            grouped[answered].append(item)
+        return grouped
+
+    def _research_messages(self, keyword: str) -> List[Dict[str, str]]:
         prompt = (
             "You are a metasearch analyst. Return JSON with 3-5 helpful resources.\n"
             "JSON schema: [{\"title\": str, \"summary\": str, \"url\": str}]. "
             "Only include trustworthy official sources when possible.\n"
             f"Focus topic: {keyword}"
         )
-        messages = [
+        return [
             {"role": "system", "content": "You output valid JSON arrays only."},
             {"role": "user", "content": prompt},
         ]
-        data = self._post(messages)
-        text = data["choices"][0]["message"]["content"]
-        return self._parse_json_array(text)
 
     def _parse_json_array(self, text: str) -> List[Dict[str, str]]:
         """Extract and parse a JSON array from the model response."""
@@ -98,13 +335,14 @@ class PerplexityClient:
                 for item in parsed:
                     if not isinstance(item, dict):
                         continue
-                    normalized.append(
-                        {
-                            "title": str(item.get("title", "제목 없음")),
-                            "summary": str(item.get("summary", "요약이 제공되지 않았습니다.")),
-                            "url": str(item.get("url", "")),
-                        }
-                    )
+                    entry = {
+                        "title": str(item.get("title", "제목 없음")),
+                        "summary": str(item.get("summary", "요약이 제공되지 않았습니다.")),
+                        "url": str(item.get("url", "")),
+                    }
+                    if item.get("keyword"):
+                        entry["keyword"] = str(item["keyword"])
+                    normalized.append(entry)
                 return normalized
         except (ValueError, json.JSONDecodeError) as exc:
             logger.warning("JSON 파싱에 실패했습니다: %s", exc)
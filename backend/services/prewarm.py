@@ -0,0 +1,209 @@
+"""Refresh-ahead prewarming of hot wiki keywords and URL summaries.
+
+``search_keyword``/``summarize_keyword`` and the standard-mode URL summaries
+count their requests in decaying :class:`~backend.services.cache.HitTracker`
+instances. Every ``prewarm_interval`` seconds the :class:`Prewarmer` takes the
+hottest keys and re-fetches those whose cache entry is missing or expires within
+``prewarm_ahead`` seconds, so the request after an expiry is still a hit.
+
+Prewarming never competes with live traffic:
+
+* Refreshes draw from their own token bucket (``prewarm_budget_per_minute``).
+* LLM calls run at batch priority, so the Perplexity limiter serves interactive
+  requests first.
+* URL refreshes are deferred while live requests are queued on that limiter or
+  the circuit breaker is not closed.
+
+A seed list can be warmed synchronously at startup, before the worker takes
+traffic. The file has one entry per line: a URL, or ``wiki:<lang>:<keyword>``.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Hashable, List, Optional, Tuple
+
+from .cache import SummaryCache
+from .content_fetcher import fetch_page, normalize_url
+from .metrics import stage
+from .perplexity_client import PerplexityClient, perplexity_guard
+from .resilience import BATCH, TokenBucket, priority_scope
+from .url_service import summarize_page, url_hits
+from .wiki_service import DEFAULT_SENTENCES, keyword_hits, keyword_ttl_remaining, refresh_keyword
+
+
+logger = logging.getLogger(__name__)
+
+
+SEED_CONCURRENCY = 4
+
+
+class Prewarmer:
+    def __init__(
+        self,
+        client: Optional[PerplexityClient],
+        client_error: Optional[str],
+        cache: Optional[SummaryCache],
+        budget_per_minute: float = 10.0,
+        interval: float = 60.0,
+        top_n: int = 50,
+        ahead: float = 300.0,
+        min_hits: float = 2.0,
+    ) -> None:
+        self.client = client
+        self.client_error = client_error
+        self.cache = cache
+        # Burst of roughly ten seconds' worth so one pass cannot spend a minute's budget at once.
+        self.budget = TokenBucket(budget_per_minute / 60, max(1, int(budget_per_minute // 6)))
+        self.interval = interval
+        self.top_n = top_n
+        self.ahead = ahead
+        self.min_hits = min_hits
+        self.counts = {"refreshed": 0, "failed": 0, "deferred": 0, "overBudget": 0, "seeded": 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def warms_urls(self) -> bool:
+        # Without a client every summary is a fallback, and fallbacks are never cached.
+        return self.cache is not None and self.client is not None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="prewarm", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("프리워밍 중 오류")
+
+    def run_once(self) -> int:
+        """Refresh due entries, hottest first, until the budget or the due list runs out."""
+        refreshed = 0
+        for kind, key in self._due():
+            if kind == "url" and self._live_traffic_waiting():
+                self._count("deferred")
+                continue
+            if not self.budget.acquire(BATCH, time.monotonic()):
+                self._count("overBudget")
+                break
+            refreshed += self._refresh(kind, key)
+        return refreshed
+
+    def _due(self) -> List[Tuple[str, Hashable]]:
+        candidates: List[Tuple[float, str, Hashable]] = []
+        for key, score in keyword_hits.top(self.top_n, self.min_hits):
+            lang, keyword, sentences = key
+            if self._expiring(keyword_ttl_remaining(keyword, lang, sentences)):
+                candidates.append((score, "wiki", key))
+        if self.warms_urls:
+            for url, score in url_hits.top(self.top_n, self.min_hits):
+                if self._expiring(self.cache.url_ttl_remaining(url)):
+                    candidates.append((score, "url", url))
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        return [(kind, key) for _, kind, key in candidates]
+
+    def _expiring(self, remaining: Optional[float]) -> bool:
+        return remaining is None or remaining < self.ahead
+
+    def _refresh(self, kind: str, key: Hashable) -> bool:
+        try:
+            with stage(f"prewarm_{kind}"), priority_scope(BATCH):
+                if kind == "wiki":
+                    lang, keyword, sentences = key
+                    refresh_keyword(keyword, lang, sentences)
+                else:
+                    summarize_page(fetch_page(key), key, self.client, self.client_error, self.cache)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.info("프리워밍 실패 (%s %s): %s", kind, key, exc)
+            self._count("failed")
+            return False
+        self._count("refreshed")
+        return True
+
+    @staticmethod
+    def _live_traffic_waiting() -> bool:
+        guard = perplexity_guard()
+        return guard.breaker.state != "closed" or guard.bucket.to_dict()["waiting"] > 0
+
+    def warm_seeds(self, path: str, timeout: float) -> int:
+        """Fill the caches for the seed list (skipping fresh entries) within ``timeout`` seconds."""
+        seeds = [(kind, key) for kind, key in load_seeds(path) if kind == "wiki" or self.warms_urls]
+        if not seeds:
+            return 0
+        pool = ThreadPoolExecutor(max_workers=SEED_CONCURRENCY, thread_name_prefix="prewarm-seed")
+        futures = [pool.submit(self._warm_seed, kind, key) for kind, key in seeds]
+        done, pending = wait(futures, timeout=timeout)
+        pool.shutdown(wait=False, cancel_futures=True)
+        warmed = sum(1 for future in done if future.result())
+        self._count("seeded", warmed)
+        if pending:
+            logger.warning("프리워밍 시드 %d건 중 %d건이 %.0f초 안에 끝나지 않았습니다.", len(seeds), len(pending), timeout)
+        logger.info("프리워밍 시드 %d/%d건 완료", warmed, len(seeds))
+        return warmed
+
+    def _warm_seed(self, kind: str, key: Hashable) -> bool:
+        # Seeds start in the hot set, then decay like any other key unless traffic keeps them there.
+        if kind == "wiki":
+            keyword_hits.record(key, self.min_hits)
+            lang, keyword, sentences = key
+            remaining = keyword_ttl_remaining(keyword, lang, sentences)
+        else:
+            url_hits.record(key, self.min_hits)
+            remaining = self.cache.url_ttl_remaining(key)
+        if not self._expiring(remaining):
+            return True
+        return self._refresh(kind, key)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += amount
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+        return {
+            **counts,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "trackedUrls": len(url_hits),
+            "trackedKeywords": len(keyword_hits),
+            "budget": self.budget.to_dict(),
+        }
+
+
+def load_seeds(path: str) -> List[Tuple[str, Hashable]]:
+    """Parse a seed file into ``("url", url)`` and ``("wiki", (lang, keyword, sentences))`` entries."""
+    if not path:
+        return []
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except OSError as exc:
+        logger.warning("프리워밍 시드 파일을 읽지 못했습니다: %s", exc)
+        return []
+    seeds: List[Tuple[str, Hashable]] = []
+    for line in lines:
+        entry = line.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        if entry.startswith("wiki:"):
+            lang, _, keyword = entry[len("wiki:"):].partition(":")
+            if lang and keyword.strip():
+                seeds.append(("wiki", (lang.strip(), keyword.strip(), DEFAULT_SENTENCES)))
+                continue
+        elif entry.startswith(("http://", "https://")):
+            seeds.append(("url", normalize_url(entry)))
+            continue
+        logger.warning("프리워밍 시드 형식을 알 수 없습니다: %s", entry)
+    return seeds
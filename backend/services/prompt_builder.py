@@ -0,0 +1,188 @@
+"""Fit extracted page text into a token budget before it goes into an LLM prompt.
+
+Paragraphs that look like boilerplate or repeat an earlier paragraph are
+dropped. The rest are ranked by TF-IDF similarity to the title plus a bonus
+for appearing early. The best ones that fit the budget are kept in their
+original order. Token counts are estimates, with rough per-model ratios for
+Latin text and for Hangul/CJK.
+"""
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+# (characters per token for Latin text, tokens per Hangul/CJK character)
+TOKEN_RATIOS: Dict[str, Tuple[float, float]] = {
+    "sonar": (4.0, 0.9),
+    "llama": (4.0, 0.9),
+    "mistral": (3.6, 1.2),
+    "gpt": (4.0, 0.8),
+}
+DEFAULT_TOKEN_RATIO = (4.0, 1.0)
+DUPLICATE_THRESHOLD = 0.8
+POSITION_WEIGHT = 0.35
+
+CJK_PATTERN = re.compile(r"[\u1100-\u11FF\u3040-\u30FF\u3130-\u318F\u4E00-\u9FFF\uAC00-\uD7A3]")
+WORD_PATTERN = re.compile(r"[0-9A-Za-z]+|[\uAC00-\uD7A3]+|[\u3040-\u30FF\u4E00-\u9FFF]+")
+BOILERPLATE_PATTERN = re.compile(
+    r"cookie|privacy policy|terms of (use|service)|all rights reserved|subscribe|newsletter|sign (in|up)"
+    r"|log ?in|share (this|on)|follow us|advertisement|copyright|©"
+    r"|무단\s*(전재|배포)|저작권|구독|로그인|회원가입|광고|공유하기|개인정보\s*처리방침|이용약관|기자\s*=|제보",
+    re.IGNORECASE,
+)
+STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "is", "are", "was", "with", "by", "as",
+    "at", "it", "this", "that", "be", "from", "및", "등", "이", "그", "저", "것", "수",
+}
+
+
+@dataclass
+class PromptContext:
+    text: str
+    tokens: int
+    paragraphs: int
+    kept: int
+    duplicates: int
+    boilerplate: int
+
+
+def estimate_tokens(text: str, model: str = "") -> int:
+    chars_per_token, cjk_ratio = _ratio_for(model)
+    cjk = len(CJK_PATTERN.findall(text))
+    return math.ceil((len(text) - cjk) / chars_per_token + cjk * cjk_ratio)
+
+
+def build_context(title: str, text: str, model: str, budget: int) -> PromptContext:
+    """Select paragraphs of ``text`` (newline separated) that best fit ``budget`` tokens."""
+    paragraphs = [line.strip() for line in text.split("\n") if line.strip()]
+    candidates, duplicates, boilerplate = _filter_paragraphs(paragraphs)
+    if not candidates:
+        # Everything looked like boilerplate; better to send it than an empty prompt.
+        candidates = list(enumerate(paragraphs))
+
+    scores = _score(title, [paragraph for _, paragraph in candidates])
+    ranked = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+    chosen: List[Tuple[int, str]] = []
+    used = 0
+    for i in ranked:
+        index, paragraph = candidates[i]
+        cost = estimate_tokens(paragraph, model) + 1
+        if used + cost <= budget:
+            chosen.append((index, paragraph))
+            used += cost
+        elif not chosen:
+            chosen.append((index, _truncate_to_tokens(paragraph, budget, model)))
+            used = budget
+            break
+    chosen.sort()
+    selected = "\n".join(paragraph for _, paragraph in chosen)
+    return PromptContext(
+        text=selected,
+        tokens=estimate_tokens(selected, model),
+        paragraphs=len(paragraphs),
+        kept=len(chosen),
+        duplicates=duplicates,
+        boilerplate=boilerplate,
+    )
+
+
+def _ratio_for(model: str) -> Tuple[float, float]:
+    lowered = (model or "").lower()
+    for prefix, ratio in TOKEN_RATIOS.items():
+        if prefix in lowered:
+            return ratio
+    return DEFAULT_TOKEN_RATIO
+
+
+def _filter_paragraphs(paragraphs: Sequence[str]) -> Tuple[List[Tuple[int, str]], int, int]:
+    kept: List[Tuple[int, str]] = []
+    kept_shingles: List[Set[str]] = []
+    seen_exact: Set[str] = set()
+    duplicates = boilerplate = 0
+    for index, paragraph in enumerate(paragraphs):
+        if _is_boilerplate(paragraph):
+            boilerplate += 1
+            continue
+        normalized = " ".join(terms(paragraph))
+        if normalized in seen_exact:
+            duplicates += 1
+            continue
+        shingles = _shingles(normalized)
+        if any(_jaccard(shingles, other) >= DUPLICATE_THRESHOLD for other in kept_shingles):
+            duplicates += 1
+            continue
+        seen_exact.add(normalized)
+        kept_shingles.append(shingles)
+        kept.append((index, paragraph))
+    return kept, duplicates, boilerplate
+
+
+def _is_boilerplate(paragraph: str) -> bool:
+    # Long paragraphs that merely mention "cookie" or "광고" are usually real content.
+    if len(paragraph) < 200 and BOILERPLATE_PATTERN.search(paragraph):
+        return True
+    letters = sum(ch.isalpha() for ch in paragraph)
+    return letters < len(paragraph) * 0.4
+
+
+def terms(text: str) -> List[str]:
+    """Lowercased index terms without stopwords; Hangul words become syllable bigrams."""
+    result = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        if CJK_PATTERN.match(word) and len(word) > 2:
+            # Korean attaches particles to nouns, so compare overlapping syllable bigrams.
+            result.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            result.append(word)
+    return result
+
+
+def _shingles(normalized: str, size: int = 5) -> Set[str]:
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def _jaccard(left: Set[str], right: Set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _score(title: str, paragraphs: Sequence[str]) -> List[float]:
+    """TF-IDF cosine similarity to the title plus a decaying bonus for early paragraphs."""
+    docs = [Counter(terms(paragraph)) for paragraph in paragraphs]
+    df: Counter = Counter()
+    for doc in docs:
+        df.update(doc.keys())
+    total = len(docs) + 1
+
+    def weights(counts: Counter) -> Dict[str, float]:
+        return {term: (1 + math.log(tf)) * math.log(total / (1 + df.get(term, 0)) + 1) for term, tf in counts.items()}
+
+    query = weights(Counter(terms(title)))
+    query_norm = math.sqrt(sum(w * w for w in query.values())) or 1.0
+    scores = []
+    for position, doc in enumerate(docs):
+        doc_weights = weights(doc)
+        norm = math.sqrt(sum(w * w for w in doc_weights.values())) or 1.0
+        similarity = sum(w * doc_weights.get(term, 0.0) for term, w in query.items()) / (norm * query_norm)
+        scores.append((1 - POSITION_WEIGHT) * similarity + POSITION_WEIGHT / (1 + position / 3))
+    return scores
+
+
+def _truncate_to_tokens(text: str, budget: int, model: str) -> str:
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle], model) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
@@ -0,0 +1,416 @@
+"""Client-side protection for an upstream API: rate limiting, retries and a circuit breaker.
+
+* :class:`TokenBucket` limits the request rate. Waiters are served by priority
+  (interactive before batch), then FIFO. After a 429 the rate drops
+  (multiplicative decrease) and climbs back on successes.
+* :class:`CircuitBreaker` opens after consecutive failures and rejects calls
+  immediately until ``reset_timeout`` has passed. Then a single probe is let through.
+* :class:`UpstreamGuard` combines both with jittered exponential backoff that
+  honors ``Retry-After``, all inside an overall deadline.
+
+Rejections raise ``requests.RequestException`` subclasses, so callers that already
+fall back on network errors need no extra handling.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Tuple
+
+import requests
+
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("upstream_priority", default=INTERACTIVE)
+
+
+class CircuitOpenError(requests.RequestException):
+    """The breaker is open; the call was rejected without touching the network."""
+
+
+class RateLimitTimeout(requests.RequestException):
+    """No rate-limit token became available before the deadline."""
+
+
+@contextmanager
+def priority_scope(priority: int) -> Iterator[None]:
+    """Run upstream calls made inside the block with ``priority`` (lower is served first)."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int, min_rate_ratio: float = 0.1) -> None:
+        self.max_rate = rate
+        self.min_rate = rate * min_rate_ratio
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rate > 0
+
+    def acquire(self, priority: int, deadline: float) -> bool:
+        if not self.enabled:
+            return True
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                wait = self._try_take(ticket)
+                if wait == 0:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(wait, remaining))
+        finally:
+            self._dequeue(ticket)
+
+    async def aacquire(self, priority: int, deadline: float) -> bool:
+        if not self.enabled:
+            return True
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                wait = self._try_take(ticket)
+                if wait == 0:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                await asyncio.sleep(min(wait, remaining))
+        finally:
+            self._dequeue(ticket)
+
+    def penalize(self) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def reward(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "ratePerMinute": round(self.rate * 60, 2),
+                "maxRatePerMinute": round(self.max_rate * 60, 2),
+                "tokens": round(self.tokens, 2),
+                "waiting": len(self._waiters),
+            }
+
+    def _enqueue(self, priority: int) -> Tuple[int, int]:
+        ticket = (priority, next(self._seq))
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: Tuple[int, int]) -> None:
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self, ticket: Tuple[int, int]) -> float:
+        """Take a token if ``ticket`` is first in line; otherwise return how long to wait."""
+        with self._lock:
+            self._refill(time.monotonic())
+            until_token = max(0.0, (1 - self.tokens) / self.rate)
+            if self._waiters[0] != ticket:
+                return max(until_token, 0.01)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                heapq.heappop(self._waiters)
+                return 0
+            return until_token
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "open" or (self.state == "half_open" and self._probing):
+                self.rejected += 1
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+                raise CircuitOpenError(
+                    f"업스트림 API 연속 실패로 호출을 잠시 중단했습니다 ({retry_in:.0f}초 후 재시도)."
+                )
+            if self.state == "half_open":
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Forget an in-flight probe whose outcome says nothing about upstream health."""
+        with self._lock:
+            self._probing = False
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "consecutiveFailures": self.failures, "rejected": self.rejected}
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    deadline: float = 30.0
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's ``Retry-After``."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        return max(backoff, retry_after or 0.0)
+
+
+@dataclass
+class GuardStats:
+    calls: int = 0
+    retries: int = 0
+    gave_up: int = 0
+    rate_limited: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "gaveUp": self.gave_up,
+                "rateLimitTimeouts": self.rate_limited,
+            }
+
+
+class UpstreamGuard:
+    """Runs ``attempt(timeout)`` under the limiter, breaker and retry policy.
+
+    ``attempt`` receives the per-try timeout (never beyond the overall deadline) and
+    must raise ``requests`` exceptions, with ``exc.response`` set for HTTP errors.
+    """
+
+    def __init__(self, bucket: TokenBucket, breaker: CircuitBreaker, policy: RetryPolicy, timeout: float) -> None:
+        self.bucket = bucket
+        self.breaker = breaker
+        self.policy = policy
+        self.timeout = timeout
+        self.stats = GuardStats()
+        self._inflight = 0
+        self._idle = threading.Condition()
+
+    def call(self, attempt: Callable[[float], Any]) -> Any:
+        deadline = time.monotonic() + self.policy.deadline
+        self.stats.record("calls")
+        with self._tracked():
+            for tries in itertools.count(1):
+                self._admit_breaker()
+                try:
+                    acquired = self.bucket.acquire(current_priority(), deadline)
+                except BaseException:
+                    self.breaker.release_probe()
+                    raise
+                if not acquired:
+                    self._reject_rate_limit()
+                try:
+                    result = attempt(self._attempt_timeout(deadline))
+                except requests.RequestException as exc:
+                    delay = self._after_failure(exc, tries, deadline)
+                    time.sleep(delay)
+                    continue
+                except BaseException as exc:
+                    self._after_abort(exc)
+                    raise
+                self._after_success()
+                return result
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def acall(self, attempt: Callable[[float], Awaitable[Any]]) -> Any:
+        deadline = time.monotonic() + self.policy.deadline
+        self.stats.record("calls")
+        with self._tracked():
+            for tries in itertools.count(1):
+                self._admit_breaker()
+                try:
+                    acquired = await self.bucket.aacquire(current_priority(), deadline)
+                except BaseException:  # cancelled while waiting for a token
+                    self.breaker.release_probe()
+                    raise
+                if not acquired:
+                    self._reject_rate_limit()
+                try:
+                    result = await attempt(self._attempt_timeout(deadline))
+                except requests.RequestException as exc:
+                    delay = self._after_failure(exc, tries, deadline)
+                    await asyncio.sleep(delay)
+                    continue
+                except BaseException as exc:
+                    self._after_abort(exc)
+                    raise
+                self._after_success()
+                return result
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    @contextmanager
+    def stream(self, attempt: Callable[[float], Any]) -> Iterator[Any]:
+        """Open a streamed response through :meth:`call` and count it as in flight until the block exits.
+
+        Retries only cover opening; a network error while reading the body is a breaker failure.
+        """
+        with self._tracked():
+            response = self.call(attempt)
+            try:
+                yield response
+            except requests.RequestException:
+                self.breaker.record_failure()
+                raise
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def drain(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for in-flight calls to finish; ``True`` once idle."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._inflight == 0, timeout=max(0.0, timeout))
+
+    def to_dict(self) -> dict:
+        return {
+            **self.stats.to_dict(),
+            "inflight": self._inflight,
+            "breaker": self.breaker.to_dict(),
+            "limiter": self.bucket.to_dict() if self.bucket.enabled else None,
+        }
+
+    @contextmanager
+    def _tracked(self) -> Iterator[None]:
+        with self._idle:
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            with self._idle:
+                self._inflight -= 1
+                if self._inflight == 0:
+                    self._idle.notify_all()
+
+    def _admit_breaker(self) -> None:
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.stats.record("gave_up")
+            raise
+
+    def _reject_rate_limit(self) -> None:
+        self.breaker.release_probe()
+        self.stats.record("rate_limited")
+        self.stats.record("gave_up")
+        raise RateLimitTimeout("요청 한도 대기 시간이 초과되었습니다.")
+
+    def _attempt_timeout(self, deadline: float) -> float:
+        return max(1.0, min(self.timeout, deadline - time.monotonic()))
+
+    def _after_success(self) -> None:
+        self.breaker.record_success()
+        self.bucket.reward()
+
+    def _after_abort(self, exc: BaseException) -> None:
+        """An attempt ended without a ``requests`` error. A bad response (e.g. invalid JSON) counts
+        against the breaker; a cancellation only frees the half-open probe slot. Neither is retried."""
+        self.stats.record("gave_up")
+        if isinstance(exc, Exception):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release_probe()
+
+    def _after_failure(self, exc: requests.RequestException, tries: int, deadline: float) -> float:
+        """Record the failure and return the backoff delay, or re-raise when giving up."""
+        status, retry_after = _status_and_retry_after(exc)
+        if status == 429:
+            self.bucket.penalize()
+        if status is None or status >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.release_probe()
+
+        retryable = status is None or status in RETRYABLE_STATUS
+        delay = self.policy.delay(tries - 1, retry_after)
+        if not retryable or tries >= self.policy.max_attempts or time.monotonic() + delay >= deadline:
+            self.stats.record("gave_up")
+            raise exc
+        self.stats.record("retries")
+        return delay
+
+
+def _status_and_retry_after(exc: requests.RequestException) -> Tuple[Optional[int], Optional[float]]:
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None, None
+    return response.status_code, _parse_retry_after(response.headers.get("Retry-After"))
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import re
-from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
-import wikipedia
+from backend.config import settings
 
+from .cache import MemoryCache
+from .metrics import in_context
 from .perplexity_client import PerplexityClient
+from .wiki_service import cached_lookup_many, cached_search
 
 
 KOREAN_REGEX = re.compile(r"[\u3130-\u318F\uAC00-\uD7A3]")
@@ -32,52 +38,164 @@ CURATED_RESOURCES = [
 ]
 
 
+# Perplexity resources per (model, keyword), so overlapping keyword lists pay for each keyword once.
+research_cache = MemoryCache(max_entries=settings.research_cache_max_entries, ttl=settings.research_cache_ttl)
+
+
 def research_by_keywords(
     keywords: List[str],
     client: Optional[PerplexityClient],
     client_error: Optional[str] = None,
 ) -> Tuple[List[dict], dict]:
-    query = ", ".join(kw.strip() for kw in keywords if kw.strip())
-    if not query:
-        raise ValueError("키워드가 비어 있습니다.")
-
-    used_fallback = False
-    fallback_reason = None
-    resources: List[dict] = []
+    """Research each keyword (cached individually), sending uncached ones in parallel groups.
 
+    Results are merged in keyword order, de-duplicated by URL and tagged with ``keyword``.
+    Groups whose call fails are answered by :func:`fallback_resources` instead.
+    """
+    plan = _ResearchPlan(keywords, client)
+    if client is None:
+        plan.fail_all(client_error or "Perplexity API를 사용할 수 없습니다.")
+    elif plan.groups:
+        workers = max(1, min(settings.research_concurrency, len(plan.groups)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="research") as pool:
+            futures = [(group, pool.submit(in_context(client.research_group, group))) for group in plan.groups]
+            for group, future in futures:
+                try:
+                    plan.answered(group, future.result())
+                except Exception as exc:  # pylint: disable=broad-except
+                    plan.failed(group, exc)
+    fallback = fallback_resources(plan.fallback_query) if plan.fallback_query else []
+    return plan.finish(fallback)
+
+
+async def aresearch_by_keywords(
+    keywords: List[str],
+    client: Optional[PerplexityClient],
+    client_error: Optional[str] = None,
+) -> Tuple[List[dict], dict]:
+    """asyncio variant of :func:`research_by_keywords`."""
+    plan = _ResearchPlan(keywords, client)
     if client is None:
-        used_fallback = True
-        fallback_reason = client_error or "Perplexity API를 사용할 수 없습니다."
-        resources = fallback_resources(query)
-    else:
-        try:
-            resources = client.research_resources(query)
-            resources = [_attach_source(item, "perplexity") for item in resources]
-        except Exception as exc:  # pylint: disable=broad-except
-            used_fallback = True
-            fallback_reason = f"Perplexity 호출 실패: {exc}"
-            resources = fallback_resources(query)
-
-    meta = {"usedFallback": used_fallback, "fallbackReason": fallback_reason}
-    return resources, meta
+        plan.fail_all(client_error or "Perplexity API를 사용할 수 없습니다.")
+    elif plan.groups:
+        gate = asyncio.Semaphore(max(1, settings.research_concurrency))
+
+        async def run(group: List[str]) -> Dict[str, List[dict]]:
+            async with gate:
+                return await client.aresearch_group(group)
+
+        outcomes = await asyncio.gather(*(run(group) for group in plan.groups), return_exceptions=True)
+        for group, outcome in zip(plan.groups, outcomes):
+            if isinstance(outcome, Exception):
+                plan.failed(group, outcome)
+            else:
+                plan.answered(group, outcome)
+    fallback = await asyncio.to_thread(fallback_resources, plan.fallback_query) if plan.fallback_query else []
+    return plan.finish(fallback)
+
+
+class _ResearchPlan:
+    """Per-keyword cache lookups, grouping of the misses, and the merge of all answers."""
+
+    def __init__(self, keywords: List[str], client: Optional[PerplexityClient]) -> None:
+        unique: Dict[str, str] = {}
+        for keyword in keywords:
+            keyword = keyword.strip()
+            if keyword:
+                unique.setdefault(keyword.casefold(), keyword)
+        if not unique:
+            raise ValueError("키워드가 비어 있습니다.")
+        self.keywords = list(unique.values())
+        self.model = client.model if client else ""
+        self.results: Dict[str, List[dict]] = {}
+        self.cached: List[str] = []
+        self.failed_keywords: List[str] = []
+        self.fallback_reason: Optional[str] = None
+
+        misses = []
+        for keyword in self.keywords:
+            hit = research_cache.get(self._key(keyword)) if client else None
+            if hit is None:
+                misses.append(keyword)
+            else:
+                self.results[keyword] = hit
+                self.cached.append(keyword)
+        size = max(1, settings.research_group_size)
+        self.groups = [misses[start:start + size] for start in range(0, len(misses), size)]
+
+    @property
+    def fallback_query(self) -> str:
+        return ", ".join(self.failed_keywords)
+
+    def _key(self, keyword: str) -> str:
+        return f"{self.model}\0{keyword.casefold()}"
+
+    def answered(self, group: List[str], grouped: Dict[str, List[dict]]) -> None:
+        for keyword in group:
+            items = [_attach_source(item, "perplexity") for item in grouped.get(keyword, [])]
+            self.results[keyword] = items
+            # Parse failures come back as a placeholder without a URL; don't keep those.
+            if items and all(item.get("url") for item in items):
+                research_cache.set(self._key(keyword), items)
+
+    def failed(self, group: List[str], exc: Exception) -> None:
+        self.failed_keywords.extend(group)
+        self.fallback_reason = self.fallback_reason or f"Perplexity 호출 실패: {exc}"
+
+    def fail_all(self, reason: str) -> None:
+        self.failed_keywords = list(self.keywords)
+        self.fallback_reason = reason
+
+    def finish(self, fallback: List[dict]) -> Tuple[List[dict], dict]:
+        merged: List[dict] = []
+        seen = set()
+
+        def add(item: dict, keyword: Optional[str]) -> None:
+            key = _dedup_key(item)
+            if key in seen:
+                return
+            seen.add(key)
+            merged.append({**item, "keyword": keyword} if keyword else item)
+
+        for keyword in self.keywords:
+            for item in self.results.get(keyword, []):
+                add(item, keyword)
+        for item in fallback:
+            add(item, None)
+
+        meta = {
+            "usedFallback": bool(self.failed_keywords),
+            "fallbackReason": self.fallback_reason,
+            "cachedKeywords": self.cached,
+        }
+        return merged, meta
+
+
+def _dedup_key(item: dict) -> str:
+    url = (item.get("url") or "").strip()
+    if not url:
+        return f"title:{(item.get('title') or '').strip().casefold()}"
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/")
+    return f"{parts.netloc.lower()}{path}?{parts.query}"
 
 
 def fallback_resources(query: str, limit: int = 3) -> List[dict]:
     lang = "ko" if KOREAN_REGEX.search(query) else "en"
-    wikipedia.set_lang(lang)
     entries = []
-    for title in wikipedia.search(query)[:limit]:
-        try:
-            summary = wikipedia.summary(title, sentences=2)
-        except wikipedia.exceptions.DisambiguationError as exc:
-            summary = f"관련 문서가 많습니다: {', '.join(exc.options[:3])}"
-        except wikipedia.exceptions.PageError:
+    titles = cached_search(query, lang)[:limit]
+    for title, page in zip(titles, cached_lookup_many(titles, lang, 2)):
+        if page.disambiguation:
+            summary = f"관련 문서가 많습니다: {', '.join(page.options[:3])}"
+        elif page.missing:
             summary = "문서를 찾을 수 없습니다."
+        else:
+            summary = page.summary
         entries.append(
             {
                 "title": title,
                 "summary": summary,
-                "url": f"https://{lang}.wikipedia.org/wiki/{title.replace(' ', '_')}",
+                "url": page.url or f"https://{lang}.wikipedia.org/wiki/{title.replace(' ', '_')}",
             }
         )
 
@@ -0,0 +1,144 @@
+"""Request coalescing: concurrent calls with the same key share one execution.
+
+The first caller for a key runs the function; callers arriving while it is in
+flight wait and receive the same result, or the same exception. Nothing is kept
+once the call finishes, so this complements the caches rather than replacing them.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class FlightStats:
+    calls: int = 0
+    executions: int = 0
+    coalesced: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, leader: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            if leader:
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "savedRate": round(self.coalesced / self.calls, 4) if self.calls else None,
+            }
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.stats = FlightStats()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], _AsyncCall] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        self.stats.record(leader)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """asyncio variant of :meth:`do`; calls are only shared within one event loop.
+
+        ``fn`` runs in its own task that every caller, the first one included, awaits
+        through :func:`asyncio.shield`. A cancelled caller only stops waiting; the task
+        is cancelled once no caller is left.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            call = self._async_calls.get(loop_key)
+            leader = call is None
+            if leader:
+                call = _AsyncCall(loop.create_task(fn()))
+                call.task.add_done_callback(lambda _task: self._finish_async(loop_key, call))
+                self._async_calls[loop_key] = call
+            call.waiters += 1
+        self.stats.record(leader)
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0 and not call.task.done()
+                if abandoned and self._async_calls.get(loop_key) is call:
+                    del self._async_calls[loop_key]
+            if abandoned:
+                call.task.cancel()
+
+    def _finish_async(self, loop_key: Tuple[int, Hashable], call: _AsyncCall) -> None:
+        with self._lock:
+            if self._async_calls.get(loop_key) is call:
+                del self._async_calls[loop_key]
+        if not call.task.cancelled():
+            call.task.exception()  # mark retrieved: every waiter may have left before it finished
+
+
+_flights: Dict[str, SingleFlight] = {}
+_registry_lock = threading.Lock()
+
+
+def get_flight(name: str) -> SingleFlight:
+    """Return the shared :class:`SingleFlight` registered under ``name``."""
+    flight = _flights.get(name)
+    if flight is None:
+        with _registry_lock:
+            flight = _flights.get(name)
+            if flight is None:
+                flight = SingleFlight(name)
+                _flights[name] = flight
+    return flight
+
+
+def flight_stats() -> Dict[str, dict]:
+    return {name: flight.stats.to_dict() for name, flight in list(_flights.items())}
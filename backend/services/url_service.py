@@ -1,62 +1,331 @@
 from __future__ import annotations
 
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator, Optional, Tuple
 
 import requests
 
-from .content_fetcher import fetch_webpage
+from backend.config import settings
+
+from .cache import HitTracker, SummaryCache
+from .async_fetcher import afetch_page
+from .content_fetcher import FetchedPage, fetch_page, normalize_url
+from .extractive import summarize_extractive
+from .metrics import stage
 from .perplexity_client import PerplexityClient
+from .prompt_builder import build_context
 
 
-def summarize_url(url: str, client: Optional[PerplexityClient], client_error: Optional[str] = None) -> Tuple[str, Dict]:
-    title, text, final_url, _ = fetch_webpage(url)
-    if not text:
-        raise ValueError("콘텐츠를 추출하지 못했습니다. 다른 URL을 시도해 주세요.")
-    used_fallback = False
+# Normalized URLs of standard-mode summaries, read by the prewarmer.
+url_hits = HitTracker(max_keys=settings.prewarm_max_tracked, half_life=settings.prewarm_half_life)
+
+
+def summarize_url(
+    url: str,
+    client: Optional[PerplexityClient],
+    client_error: Optional[str] = None,
+    cache: Optional[SummaryCache] = None,
+) -> Tuple[str, Dict]:
+    requested_url = normalize_url(url)
+    url_hits.record(requested_url)
+    cached = cached_by_url(requested_url, cache)
+    if cached is not None:
+        return cached["summary"], cached
+
+    page = fetch_page(requested_url)
+    return summarize_page(page, requested_url, client, client_error, cache)
+
+
+def cached_by_url(requested_url: str, cache: Optional[SummaryCache], namespace: str = "") -> Optional[Dict]:
+    if cache is None:
+        return None
+    hit = cache.get_by_url(requested_url, namespace=namespace)
+    if hit is None:
+        return None
+    return {**hit, "cached": True, "cacheLevel": "url"}
+
+
+def summarize_page(
+    page: FetchedPage,
+    requested_url: str,
+    client: Optional[PerplexityClient],
+    client_error: Optional[str] = None,
+    cache: Optional[SummaryCache] = None,
+) -> Tuple[str, Dict]:
+    """Summarize an already fetched page, consulting the content-level cache first."""
+    cached, content_key = _lookup_content(page, requested_url, client, cache)
+    if cached is not None:
+        return cached["summary"], cached
+
+    citations = []
     fallback_reason = None
+    prompt_text, prompt_tokens = prepare_prompt(page, client)
+    if client is None:
+        fallback_reason = client_error or "Perplexity API를 사용할 수 없습니다."
+    else:
+        try:
+            summary, citations = client.summarize_webpage(page.title, prompt_text)
+        except requests.HTTPError as exc:
+            fallback_reason = _describe_http_error(exc)
+        except requests.RequestException as exc:
+            fallback_reason = f"Perplexity API 네트워크 오류: {exc}"
+    if fallback_reason is not None:
+        summary = local_summary_fallback(page.title, page.text)
+    return _finish(page, requested_url, cache, content_key, summary, citations, fallback_reason, prompt_tokens)
+
+
+async def asummarize_url(
+    url: str,
+    client: Optional[PerplexityClient],
+    client_error: Optional[str] = None,
+    cache: Optional[SummaryCache] = None,
+) -> Tuple[str, Dict]:
+    """asyncio variant of :func:`summarize_url` using the async fetcher and Perplexity calls."""
+    requested_url = normalize_url(url)
+    url_hits.record(requested_url)
+    cached = cached_by_url(requested_url, cache)
+    if cached is not None:
+        return cached["summary"], cached
+
+    page = await afetch_page(requested_url)
+    return await asummarize_page(page, requested_url, client, client_error, cache)
+
+
+async def asummarize_page(
+    page: FetchedPage,
+    requested_url: str,
+    client: Optional[PerplexityClient],
+    client_error: Optional[str] = None,
+    cache: Optional[SummaryCache] = None,
+) -> Tuple[str, Dict]:
+    cached, content_key = _lookup_content(page, requested_url, client, cache)
+    if cached is not None:
+        return cached["summary"], cached
+
     citations = []
+    fallback_reason = None
+    prompt_text, prompt_tokens = prepare_prompt(page, client)
+    if client is None:
+        fallback_reason = client_error or "Perplexity API를 사용할 수 없습니다."
+    else:
+        try:
+            summary, citations = await client.asummarize_webpage(page.title, prompt_text)
+        except requests.HTTPError as exc:
+            fallback_reason = _describe_http_error(exc)
+        except requests.RequestException as exc:
+            fallback_reason = f"Perplexity API 네트워크 오류: {exc}"
+    if fallback_reason is not None:
+        summary = local_summary_fallback(page.title, page.text)
+    return _finish(page, requested_url, cache, content_key, summary, citations, fallback_reason, prompt_tokens)
+
+
+def fast_summarize_url(url: str) -> Tuple[str, Dict]:
+    """Extractive summary only (``mode=fast``): no LLM call, so no summary cache either."""
+    return fast_summarize_page(fetch_page(normalize_url(url)))
+
+
+async def afast_summarize_url(url: str) -> Tuple[str, Dict]:
+    return fast_summarize_page(await afetch_page(normalize_url(url)))
+
+
+def fast_summarize_page(page: FetchedPage) -> Tuple[str, Dict]:
+    with stage("extractive"):
+        summary = _extractive_bullets(page.title, page.text) or page.text[:500]
+    payload = _build_payload(
+        summary, [], page.title, page.final_url, False, None, page.revalidated, security=page.security
+    )
+    return summary, {**payload, "mode": "fast", "cached": False, "cacheLevel": None}
+
+
+def stream_summarize_url(
+    url: str,
+    client: Optional[PerplexityClient],
+    client_error: Optional[str] = None,
+    cache: Optional[SummaryCache] = None,
+) -> Iterator[Tuple[str, Dict]]:
+    """Fetch the page now (raising like :func:`summarize_url`) and return an event iterator.
+
+    Events are ``source`` (title/URL, sent before the LLM call), ``token`` for each
+    summary delta, ``fallback`` with the local summary if Perplexity fails, and a
+    final ``done`` carrying the same payload :func:`summarize_url` would return.
+    """
+    requested_url = normalize_url(url)
+    url_hits.record(requested_url)
+    cached = cached_by_url(requested_url, cache)
+    if cached is None:
+        page = fetch_page(requested_url)
+        cached, content_key = _lookup_content(page, requested_url, client, cache)
+    if cached is not None:
+        return iter(_cached_events(cached))
+    return _stream_events(page, requested_url, client, client_error, cache, content_key)
+
+
+def _cached_events(payload: Dict) -> list:
+    return [
+        ("source", _source_event(payload["sourceTitle"], payload["sourceUrl"], payload.get("revalidated", False), True)),
+        ("token", {"text": payload["summary"]}),
+        ("done", payload),
+    ]
+
+
+def _source_event(title: str, url: str, revalidated: bool, cached: bool) -> Dict:
+    return {"sourceTitle": title, "sourceUrl": url, "revalidated": revalidated, "cached": cached}
+
+
+def _stream_events(
+    page: FetchedPage,
+    requested_url: str,
+    client: Optional[PerplexityClient],
+    client_error: Optional[str],
+    cache: Optional[SummaryCache],
+    content_key: Optional[str],
+) -> Iterator[Tuple[str, Dict]]:
+    yield "source", _source_event(page.title, page.final_url, page.revalidated, False)
+
+    summary = ""
+    citations: list = []
+    fallback_reason = None
+    prompt_text, prompt_tokens = prepare_prompt(page, client)
     if client is None:
         fallback_reason = client_error or "Perplexity API를 사용할 수 없습니다."
-        summary = local_summary_fallback(title, text)
-        used_fallback = True
     else:
+        parts = []
         try:
-            summary, citations = client.summarize_webpage(title, text)
+            for kind, value in client.stream_summary(page.title, prompt_text):
+                if kind == "token":
+                    parts.append(value)
+                    yield "token", {"text": value}
+                else:
+                    citations = value
         except requests.HTTPError as exc:
             fallback_reason = _describe_http_error(exc)
-            summary = local_summary_fallback(title, text)
-            used_fallback = True
         except requests.RequestException as exc:
             fallback_reason = f"Perplexity API 네트워크 오류: {exc}"
-            summary = local_summary_fallback(title, text)
-            used_fallback = True
-    payload = {
+        summary = "".join(parts).strip()
+        if fallback_reason is None and not summary:
+            fallback_reason = "Perplexity API가 빈 응답을 반환했습니다."
+    if fallback_reason is not None:
+        summary = local_summary_fallback(page.title, page.text)
+        citations = []
+        yield "fallback", {"summary": summary, "reason": fallback_reason}
+    _, payload = _finish(page, requested_url, cache, content_key, summary, citations, fallback_reason, prompt_tokens)
+    yield "done", payload
+
+
+def _lookup_content(
+    page: FetchedPage,
+    requested_url: str,
+    client: Optional[PerplexityClient],
+    cache: Optional[SummaryCache],
+) -> Tuple[Optional[Dict], Optional[str]]:
+    if not page.text:
+        raise ValueError("콘텐츠를 추출하지 못했습니다. 다른 URL을 시도해 주세요.")
+    if cache is None or client is None:
+        return None, None
+    content_key = content_key_for(page, client)
+    hit = cache.get_by_content(content_key)
+    if hit is None:
+        return None, content_key
+    payload = _build_payload(
+        hit["summary"], hit["citations"], page.title, page.final_url, False, None, page.revalidated,
+        security=page.security,
+    )
+    cache.store([requested_url, page.final_url], None, payload)
+    return {**payload, "cached": True, "cacheLevel": "content"}, content_key
+
+
+def _finish(
+    page: FetchedPage,
+    requested_url: str,
+    cache: Optional[SummaryCache],
+    content_key: Optional[str],
+    summary: str,
+    citations: list,
+    fallback_reason: Optional[str],
+    prompt_tokens: Optional[int] = None,
+) -> Tuple[str, Dict]:
+    used_fallback = fallback_reason is not None
+    payload = _build_payload(
+        summary,
+        citations,
+        page.title,
+        page.final_url,
+        used_fallback,
+        fallback_reason,
+        page.revalidated,
+        prompt_tokens,
+        page.security,
+    )
+    if cache is not None and not used_fallback:
+        # Fallback summaries are never cached so the next request retries Perplexity.
+        cache.store([requested_url, page.final_url], content_key, payload)
+    return summary, {**payload, "cached": False, "cacheLevel": None}
+
+
+def prepare_prompt(page: FetchedPage, client: Optional[PerplexityClient]) -> Tuple[str, Optional[int]]:
+    """Page text trimmed to ``prompt_token_budget`` and the estimated prompt size (``None`` without a client)."""
+    if client is None:
+        return page.text, None
+    with stage("prompt"):
+        context = build_context(page.title, page.text, client.model, settings.prompt_token_budget)
+        return context.text, client.summary_prompt_tokens(page.title, context.text)
+
+
+def content_key_for(page: FetchedPage, client: Optional[PerplexityClient]) -> str:
+    if client is None:
+        return SummaryCache.content_key(page.text, "", 0.0)
+    return SummaryCache.content_key(page.text, client.model, client.temperature)
+
+
+def _build_payload(
+    summary: str,
+    citations: list,
+    title: str,
+    final_url: str,
+    used_fallback: bool,
+    fallback_reason: Optional[str],
+    revalidated: bool = False,
+    prompt_tokens: Optional[int] = None,
+    security: Optional[dict] = None,
+) -> Dict:
+    return {
         "summary": summary,
         "citations": citations,
         "sourceTitle": title,
         "sourceUrl": final_url,
         "usedFallback": used_fallback,
         "fallbackReason": fallback_reason,
+        "revalidated": revalidated,
+        "promptTokens": prompt_tokens,
+        "security": security,
     }
-    return summary, payload
 
 
 def local_summary_fallback(title: str, text: str) -> str:
-    paragraphs = [line.strip() for line in text.split("\n") if line.strip()]
-    snippet = "\n".join(paragraphs[:5])
-    if not snippet:
-        snippet = text[:500]
+    with stage("fallback"):
+        snippet = _extractive_bullets(title, text) or text[:500]
     return (
-        f"[로컬 요약] Perplexity API와 통신하지 못해 단순 요약을 제공합니다.\n"
+        f"[로컬 요약] Perplexity API와 통신하지 못해 본문에서 핵심 문장을 추출했습니다.\n"
         f"제목: {title}\n\n"
         f"{snippet}"
     )
 
 
+def _extractive_bullets(title: str, text: str) -> str:
+    sentences = summarize_extractive(
+        title,
+        text,
+        settings.extractive_sentences,
+        settings.extractive_method,
+        settings.extractive_max_candidates,
+    )
+    return "\n".join(f"- {sentence}" for sentence in sentences)
+
+
 def _describe_http_error(exc: requests.HTTPError) -> str:
     response = getattr(exc, "response", None)
     if response is not None:
-        status = f"{response.status_code} {response.reason}"
+        reason = getattr(response, "reason", None) or getattr(response, "reason_phrase", "")
+        status = f"{response.status_code} {reason}"
         try:
             payload = response.json()
             message = payload.get("error") if isinstance(payload, dict) else None
@@ -0,0 +1,158 @@
+"""Minimal MediaWiki API client, one instance per language, over a pooled session.
+
+Replaces the ``wikipedia`` package, whose ``set_lang`` rewrites a module global
+and makes concurrent ``ko``/``en`` lookups race each other.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Dict, List
+from urllib.parse import quote
+
+from backend.config import settings
+
+from .http_session import get_session
+from .metrics import stage
+
+
+LANG_PATTERN = re.compile(r"^[a-z][a-z0-9-]{1,15}$")
+# TextExtracts returns at most 20 intro extracts per request.
+MAX_TITLES_PER_QUERY = 20
+# ``lang`` comes from requests, so only the most recently used languages keep a client.
+MAX_CLIENTS = 32
+USER_AGENT = "SideProject-Summarizer/1.0 (https://github.com/nihcod/SideProject---summarizer)"
+
+
+@dataclass(frozen=True)
+class WikiPage:
+    """Intro extract plus canonical URL and disambiguation info for one resolved title."""
+
+    title: str
+    summary: str = ""
+    url: str | None = None
+    missing: bool = False
+    disambiguation: bool = False
+    options: List[str] = field(default_factory=list)
+
+    @property
+    def found(self) -> bool:
+        return not self.missing and not self.disambiguation
+
+
+class WikiClient:
+    def __init__(self, lang: str, timeout: float | None = None) -> None:
+        if not LANG_PATTERN.match(lang or ""):
+            raise ValueError(f"지원하지 않는 언어 코드입니다: {lang}")
+        self.lang = lang
+        self.api_url = settings.wiki_api_url.format(lang=lang)
+        self.timeout = timeout or settings.wiki_timeout
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        data = self._get({"list": "search", "srsearch": query, "srlimit": limit, "srprop": ""})
+        return [item["title"] for item in data.get("query", {}).get("search", [])]
+
+    def lookup(self, title: str, sentences: int = 8) -> WikiPage:
+        """Resolve ``title`` (following redirects) in a single extracts+info+pageprops query."""
+        return self.lookup_many([title], sentences)[title]
+
+    def lookup_many(self, titles: List[str], sentences: int = 8) -> Dict[str, WikiPage]:
+        """Resolve many titles with one query per ``MAX_TITLES_PER_QUERY``, keyed by requested title.
+
+        Option links for any disambiguation pages among them cost one extra query in total.
+        """
+        titles = list(dict.fromkeys(titles))
+        resolved: Dict[str, WikiPage] = {}
+        for start in range(0, len(titles), MAX_TITLES_PER_QUERY):
+            resolved.update(self._query_pages(titles[start:start + MAX_TITLES_PER_QUERY], sentences))
+        ambiguous = sorted({page.title for page in resolved.values() if page.disambiguation})
+        if ambiguous:
+            links = self._links(ambiguous)
+            resolved = {
+                requested: replace(page, options=links.get(page.title, [])) if page.disambiguation else page
+                for requested, page in resolved.items()
+            }
+        return resolved
+
+    def _query_pages(self, titles: List[str], sentences: int) -> Dict[str, WikiPage]:
+        data = self._get(
+            {
+                "prop": "extracts|info|pageprops",
+                "titles": "|".join(titles),
+                "redirects": 1,
+                "exintro": 1,
+                "explaintext": 1,
+                "exsentences": sentences,
+                "exlimit": len(titles),
+                "inprop": "url",
+                "ppprop": "disambiguation",
+            }
+        )
+        query = data.get("query", {})
+        renamed = {item["from"]: item["to"] for key in ("normalized", "redirects") for item in query.get(key, [])}
+        pages = {page.get("title"): page for page in query.get("pages", [])}
+
+        result: Dict[str, WikiPage] = {}
+        for title in titles:
+            target = renamed.get(title, title)
+            target = renamed.get(target, target)  # normalized first, then redirected
+            page = pages.get(target)
+            if page is None or page.get("missing") or page.get("invalid"):
+                result[title] = WikiPage(title=target, missing=True)
+                continue
+            url = page.get("canonicalurl") or page.get("fullurl") or self.page_url(target)
+            if "disambiguation" in (page.get("pageprops") or {}):
+                result[title] = WikiPage(title=target, url=url, disambiguation=True)
+            else:
+                result[title] = WikiPage(title=target, summary=(page.get("extract") or "").strip(), url=url)
+        return result
+
+    def page_url(self, title: str) -> str:
+        return f"https://{self.lang}.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+
+    def _links(self, titles: List[str]) -> Dict[str, List[str]]:
+        data = self._get(
+            {"prop": "links", "titles": "|".join(titles), "plnamespace": 0, "pllimit": "max", "redirects": 1}
+        )
+        return {
+            page.get("title"): [link["title"] for link in page.get("links", [])]
+            for page in data.get("query", {}).get("pages", [])
+        }
+
+    def _get(self, params: dict) -> dict:
+        with stage("wiki"):
+            response = get_session("wikipedia").get(
+                self.api_url,
+                params={"action": "query", "format": "json", "formatversion": 2, **params},
+                headers={"User-Agent": USER_AGENT},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+            if "error" in data:
+                raise ValueError(f"MediaWiki API 오류: {data['error'].get('info', data['error'])}")
+            return data
+
+
+_clients: "OrderedDict[str, WikiClient]" = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def get_wiki_client(lang: str) -> WikiClient:
+    """Client for ``lang`` from a small LRU.
+
+    Clients share the ``wikipedia`` pooled session, whose per-host pools urllib3
+    already bounds, so an evicted client holds nothing that needs closing.
+    """
+    with _clients_lock:
+        client = _clients.get(lang)
+        if client is not None:
+            _clients.move_to_end(lang)
+            return client
+        client = WikiClient(lang)
+        _clients[lang] = client
+        if len(_clients) > MAX_CLIENTS:
+            _clients.popitem(last=False)
+    return client
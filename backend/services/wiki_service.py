@@ -1,62 +1,182 @@
 from __future__ import annotations
 
-from urllib.parse import quote
+import asyncio
 
-import wikipedia
+from backend.config import settings
+
+from .cache import CacheStats, HitTracker, MemoryCache
+from .singleflight import get_flight
+from .wiki_client import WikiPage, get_wiki_client
 
 
 PREFERRED_KEYWORDS = {
     "배": ["과일", "fruit", "나무", "식물", "선박", "동음이의어"],
 }
+DEFAULT_SENTENCES = 8
+
+
+# Shared by every wiki lookup (including search_service). Missing and
+# disambiguation pages are negative results kept for ``wiki_cache_negative_ttl`` seconds.
+wiki_cache = MemoryCache(max_entries=settings.wiki_cache_max_entries, ttl=settings.wiki_cache_ttl)
+_negative_stats = CacheStats()
+# (lang, keyword, sentences) of search_keyword/summarize_keyword calls, read by the prewarmer.
+keyword_hits = HitTracker(max_keys=settings.prewarm_max_tracked, half_life=settings.prewarm_half_life)
 
 
-def summarize_keyword(keyword: str, lang: str = "ko", max_sentences: int = 8) -> dict | str:
-    wikipedia.set_lang(lang)
+def cached_lookup(title: str, lang: str, sentences: int = DEFAULT_SENTENCES) -> WikiPage:
+    return cached_lookup_many([title], lang, sentences)[0]
+
+
+def cached_lookup_many(titles: list[str], lang: str, sentences: int = DEFAULT_SENTENCES) -> list[WikiPage]:
+    """Pages for ``titles`` in the same order; cache misses share one multi-title query."""
+    pages: dict[str, WikiPage] = {}
+    for title in titles:
+        page = wiki_cache.get(_page_key(title, lang, sentences))
+        if page is None:
+            continue
+        if not page.found:
+            _negative_stats.record("hits")
+        pages[title] = page
+    misses = [title for title in dict.fromkeys(titles) if title not in pages]
+    if misses:
+        pages.update(_fetch_pages(misses, lang, sentences))
+    return [pages[title] for title in titles]
+
+
+def _fetch_pages(titles: list[str], lang: str, sentences: int) -> dict[str, WikiPage]:
+    fetched = get_flight("wiki").do(
+        ("pages", lang, sentences, tuple(titles)),
+        lambda: get_wiki_client(lang).lookup_many(titles, sentences),
+    )
+    for title, page in fetched.items():
+        wiki_cache.set(
+            _page_key(title, lang, sentences),
+            page,
+            ttl=None if page.found else settings.wiki_cache_negative_ttl,
+        )
+    return fetched
+
+
+def refresh_keyword(keyword: str, lang: str = "ko", max_sentences: int = DEFAULT_SENTENCES) -> None:
+    """Re-fetch ``keyword``, and the option its disambiguation page resolves to, whatever is cached."""
+    page = _fetch_pages([keyword], lang, max_sentences)[keyword]
+    if page.disambiguation:
+        options = _dedup_options(_prioritize_options(page.options, target=keyword))
+        if options:
+            _fetch_pages(options[:1], lang, max_sentences)
+
+
+def keyword_ttl_remaining(keyword: str, lang: str = "ko", max_sentences: int = DEFAULT_SENTENCES) -> float | None:
+    return wiki_cache.ttl_remaining(_page_key(keyword, lang, max_sentences))
+
+
+def _page_key(title: str, lang: str, sentences: int) -> str:
+    return f"page\0{lang}\0{title}\0{sentences}"
+
+
+def cached_search(query: str, lang: str) -> list[str]:
+    key = f"search\0{lang}\0{query}"
+    titles = wiki_cache.get(key)
+    if titles is None:
+        titles = get_flight("wiki").do(("search", lang, query), lambda: get_wiki_client(lang).search(query))
+        wiki_cache.set(key, titles, ttl=None if titles else settings.wiki_cache_negative_ttl)
+    elif not titles:
+        _negative_stats.record("hits")
+    return titles
+
+
+def wiki_cache_stats() -> dict:
+    return {
+        **wiki_cache.stats.to_dict(),
+        "negativeHits": _negative_stats.hits,
+        "entries": len(wiki_cache),
+        "trackedKeywords": len(keyword_hits),
+    }
+
+
+def search_keyword(keyword: str, lang: str = "ko", max_sentences: int = DEFAULT_SENTENCES) -> dict:
+    """Summary, canonical URL, resolved title and disambiguation options for ``keyword``.
+
+    The common case is one extracts+info+pageprops query (or none on a cache hit).
+    A disambiguation page is resolved to its best-ranked option, and the ranked
+    options are returned alongside so the client can pick another one.
+    """
+    keyword_hits.record((lang, keyword, max_sentences))
+    result = {"summary": None, "url": None, "title": None, "options": None, "message": None}
     try:
-        summary = wikipedia.summary(keyword, sentences=max_sentences, auto_suggest=False)
-        return summary
-    except wikipedia.exceptions.DisambiguationError:
+        page = cached_lookup(keyword, lang, max_sentences)
+        if page.disambiguation:
+            options = _dedup_options(_prioritize_options(page.options, target=keyword))
+            result["options"] = options
+            page = _first_found(options[:1], lang, max_sentences) or page
+    except Exception as exc:  # pylint: disable=broad-except
+        result["message"] = f"알 수 없는 오류가 발생 하였습니다.: {exc}"
+        return result
+    if page.missing:
+        result["message"] = "검색 결과가 없습니다."
+    elif page.disambiguation:
+        result["message"] = "검색어가 모호합니다. 아래 항목 중에서 선택해 주세요."
+    else:
+        result.update(summary=page.summary, url=page.url, title=page.title)
+    return result
+
+
+def _first_found(titles: list[str], lang: str, max_sentences: int) -> WikiPage | None:
+    for title in titles:
+        page = cached_lookup(title, lang, max_sentences)
+        if page.found:
+            return page
+    return None
+
+
+def summarize_keyword(keyword: str, lang: str = "ko", max_sentences: int = DEFAULT_SENTENCES) -> dict | str:
+    keyword_hits.record((lang, keyword, max_sentences))
+    try:
+        page = cached_lookup(keyword, lang, max_sentences)
+    except Exception as exc:  # pylint: disable=broad-except
+        return f"알 수 없는 오류가 발생 하였습니다.: {exc}"
+    if page.disambiguation:
         summary, _ = force_summary(keyword, lang, max_sentences)
         return summary
-    except wikipedia.exceptions.PageError:
+    if page.missing:
         return "검색 결과가 없습니다."
-    except Exception as exc:  # pylint: disable=broad-except
-        return f"알 수 없는 오류가 발생 하였습니다.: {exc}"
+    return page.summary
 
 
-def force_summary(keyword: str, lang: str = "ko", max_sentences: int = 8) -> tuple[str, str | None]:
-    wikipedia.set_lang(lang)
-    ordered = _prioritize_options(wikipedia.search(keyword), target=keyword)
-    for title in ordered:
-        try:
-            summary = wikipedia.summary(title, sentences=max_sentences, auto_suggest=False)
-            link = f"https://{lang}.wikipedia.org/wiki/{quote(title)}"
-            return summary, link
-        except wikipedia.exceptions.DisambiguationError as exc:
-            preferred = _pick_best_candidate(keyword, exc.options)
-            if preferred:
-                try:
-                    summary = wikipedia.summary(preferred, sentences=max_sentences, auto_suggest=False)
-                    link = f"https://{lang}.wikipedia.org/wiki/{quote(preferred)}"
-                    return summary, link
-                except Exception:
-                    continue
-            continue
-        except wikipedia.exceptions.PageError:
-            continue
-        except Exception as exc:  # pylint: disable=broad-except
-            return f"알 수 없는 오류 발생: {exc}", None
+def force_summary(keyword: str, lang: str = "ko", max_sentences: int = DEFAULT_SENTENCES) -> tuple[str, str | None]:
+    """Best-ranked search hit that resolves to a page, checking all candidates in two batched lookups."""
+    try:
+        ordered = _prioritize_options(cached_search(keyword, lang), target=keyword)
+        pages = cached_lookup_many(ordered, lang, max_sentences)
+        preferred = {
+            title: _pick_best_candidate(keyword, page.options)
+            for title, page in zip(ordered, pages)
+            if page.disambiguation
+        }
+        wanted = [option for option in preferred.values() if option]
+        resolved = dict(zip(wanted, cached_lookup_many(wanted, lang, max_sentences))) if wanted else {}
+    except Exception as exc:  # pylint: disable=broad-except
+        return f"알 수 없는 오류 발생: {exc}", None
+
+    for title, page in zip(ordered, pages):
+        if page.disambiguation:
+            page = resolved.get(preferred[title] or "", page)
+        if page.found:
+            return page.summary, page.url
     return "항목을 찾을 수 없습니다.", None
 
 
-def original_link(keyword: str, lang: str = "ko") -> str | None:
-    try:
-        wikipedia.set_lang(lang)
-        wikipedia.page(keyword, auto_suggest=False)
-        encoded = quote(keyword)
-        return f"https://{lang}.wikipedia.org/wiki/{encoded}"
-    except Exception:  # pragma: no cover - optional
-        return None
+# The wiki client is blocking, so the async variants run it on the default executor.
+async def asearch_keyword(keyword: str, lang: str = "ko", max_sentences: int = DEFAULT_SENTENCES) -> dict:
+    return await asyncio.to_thread(search_keyword, keyword, lang, max_sentences)
+
+
+async def asummarize_keyword(keyword: str, lang: str = "ko", max_sentences: int = DEFAULT_SENTENCES) -> dict | str:
+    return await asyncio.to_thread(summarize_keyword, keyword, lang, max_sentences)
+
+
+async def aforce_summary(keyword: str, lang: str = "ko", max_sentences: int = DEFAULT_SENTENCES) -> tuple[str, str | None]:
+    return await asyncio.to_thread(force_summary, keyword, lang, max_sentences)
 
 
 def _pick_best_candidate(keyword: str, options: list[str]) -> str | None:
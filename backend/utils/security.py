@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import re
+from collections import Counter
 from dataclasses import asdict, dataclass, field
-from typing import List
+from typing import Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 
@@ -16,6 +17,19 @@ SUSPICIOUS_KEYWORDS = [
 
 SUSPICIOUS_TAGS = ("script", "iframe", "object", "embed", "form")
 
+# Scanning works on raw bytes as they arrive: every needle is ASCII, so any
+# ASCII-compatible charset can be matched before decoding, and bytes.lower() is
+# much cheaper than str.lower(). All tag openers are counted in one regex pass
+# (its literal "<" prefix gets the regex engine's fast search). Keywords only
+# need to be seen once, so each one is a C substring search that stops being run
+# after its first hit.
+TAG_PATTERN = re.compile(rb"<(" + b"|".join(tag.encode() for tag in SUSPICIOUS_TAGS) + rb")")
+_KEYWORD_BYTES = {keyword: keyword.encode() for keyword in SUSPICIOUS_KEYWORDS}
+_KEYWORD_CARRY = max(len(needle) for needle in _KEYWORD_BYTES.values()) - 1
+_TAG_CARRY = max(len(tag) for tag in SUSPICIOUS_TAGS)
+# Strict prefixes of "<tag" that may be completed by the next chunk.
+_TAG_PREFIXES = {f"<{tag}"[:size].encode() for tag in SUSPICIOUS_TAGS for size in range(1, len(tag) + 1)}
+
 
 @dataclass
 class SecurityFinding:
@@ -29,6 +43,7 @@ class SecurityReport:
     original_url: str
     final_url: str
     findings: List[SecurityFinding] = field(default_factory=list)
+    scanned_bytes: int = 0
 
     @property
     def risk_score(self) -> int:
@@ -41,20 +56,54 @@ class SecurityReport:
             "finalUrl": self.final_url,
             "riskScore": self.risk_score,
             "findings": [asdict(f) for f in self.findings],
+            "scannedBytes": self.scanned_bytes,
         }
 
 
 class SecurityScanner:
-    """Light-weight heuristic scanner to flag suspicious characteristics in a URL response."""
+    """Light-weight heuristic scanner to flag suspicious characteristics in a URL response.
+
+    Markup can be given whole (``html``) or fed chunk by chunk with :meth:`feed`
+    while the page downloads; :meth:`run_all` then only evaluates the counts.
+    """
 
-    def __init__(self, original_url: str, final_url: str, html: str) -> None:
+    def __init__(self, original_url: str, final_url: str, html: str = "") -> None:
         self.original_url = original_url
         self.final_url = final_url
-        self.html = html or ""
         self.report = SecurityReport(original_url=original_url, final_url=final_url)
         self.parsed = urlparse(final_url or original_url)
-
-    def run_all(self) -> SecurityReport:
+        self.tag_counts: Counter = Counter()
+        self.keywords_found: List[str] = []
+        self._pending = list(SUSPICIOUS_KEYWORDS)
+        self._tag_carry = b""
+        self._keyword_carry = b""
+        if html:
+            self.feed(html)
+
+    def feed(self, chunk: Union[bytes, str]) -> None:
+        if not chunk:
+            return
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8", "replace")
+        self.report.scanned_bytes += len(chunk)
+        lowered = chunk.lower()
+
+        window = self._tag_carry + lowered
+        self.tag_counts.update(TAG_PATTERN.findall(window))
+        self._tag_carry = _partial_tag(window[-_TAG_CARRY:])
+
+        if self._pending:
+            window = self._keyword_carry + lowered
+            found = [keyword for keyword in self._pending if _KEYWORD_BYTES[keyword] in window]
+            if found:
+                self.keywords_found.extend(found)
+                self._pending = [keyword for keyword in self._pending if keyword not in found]
+            self._keyword_carry = window[-_KEYWORD_CARRY:]
+
+    def run_all(self, final_url: Optional[str] = None) -> SecurityReport:
+        if final_url:
+            self.final_url = self.report.final_url = final_url
+            self.parsed = urlparse(final_url)
         self._check_scheme()
         self._check_ip_hostname()
         self._check_keyword_patterns()
@@ -82,8 +131,7 @@ class SecurityScanner:
             )
 
     def _check_keyword_patterns(self) -> None:
-        lowered = self.html.lower()
-        hits = [kw for kw in SUSPICIOUS_KEYWORDS if kw in lowered]
+        hits = [kw for kw in SUSPICIOUS_KEYWORDS if kw in self.keywords_found]
         if hits:
             self._add_finding(
                 name="Suspicious markup",
@@ -92,8 +140,7 @@ class SecurityScanner:
             )
 
     def _check_tag_density(self) -> None:
-        lowered = self.html.lower()
-        counts = {tag: lowered.count(f"<{tag}") for tag in SUSPICIOUS_TAGS}
+        counts: Dict[str, int] = {tag: self.tag_counts[tag.encode()] for tag in SUSPICIOUS_TAGS}
         flagged = {
             tag: count
             for tag, count in counts.items()
@@ -106,3 +153,12 @@ class SecurityScanner:
                 level="warning",
                 detail=f"다량의 활성 태그가 포함되어 있습니다 ({detail}).",
             )
+
+
+def _partial_tag(tail: bytes) -> bytes:
+    """The trailing ``<ta`` fragment of ``tail`` if a tag opener may continue in the next chunk."""
+    start = tail.rfind(b"<")
+    if start < 0:
+        return b""
+    fragment = tail[start:]
+    return fragment if fragment in _TAG_PREFIXES else b""
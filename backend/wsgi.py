@@ -0,0 +1,15 @@
+"""Production WSGI entry point: ``gunicorn -c gunicorn.conf.py backend.wsgi:app``.
+
+Importing this module builds the Flask app once and, unless ``WARM_UP=false``,
+loads the lazily imported dependencies too. With ``preload_app`` the gunicorn
+master does this before forking, so workers share the imported code and start
+serving immediately.
+"""
+from backend.app import app
+from backend.common import warm_up
+from backend.config import settings
+
+if settings.warm_up:
+    warm_up()
+
+__all__ = ["app"]
@@ -0,0 +1,81 @@
+"""Time the offline extractive summarizer on ~5 KB documents (median and p95 per method).
+
+Uses the stored HTML corpus when present, otherwise a built-in Korean/English sample.
+
+    python benchmarks/bench_extractive.py --repeat 200 --show
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+from backend.services.extractive import METHODS, summarize_extractive  # noqa: E402
+from backend.services.extractors import get_extractor  # noqa: E402
+
+SAMPLE_TITLE = "캐시와 커넥션 풀링으로 웹 서비스 지연 줄이기"
+SAMPLE = """
+웹 서비스의 응답 지연은 대부분 네트워크 왕복과 외부 API 호출에서 발생한다. 커넥션 풀링은 TCP와 TLS 핸드셰이크를 재사용해 요청마다 드는 비용을 줄인다.
+캐시는 같은 요청을 반복해서 처리하지 않도록 해 준다. 특히 요약처럼 비싼 LLM 호출 결과는 URL과 본문 해시 두 단계로 캐시하는 것이 효과적이다.
+Connection pooling keeps sockets open between requests, so the handshake cost is paid once. Dr. Kim measured a 40% drop in p95 latency after enabling keep-alive.
+Caching summaries by content hash means a page that moved to a new URL is still served from cache. The U.S. team saw similar results, e.g. fewer upstream calls during peaks.
+하지만 캐시는 오래된 데이터를 돌려줄 위험이 있다. 그래서 ETag 같은 검증자를 저장해 두었다가 조건부 요청으로 변경 여부를 확인한다.
+Rate limiting and circuit breakers protect the upstream API when traffic spikes. Without them, retries amplify an outage instead of riding it out.
+요청 병합은 동시에 들어온 같은 요청을 하나로 합쳐 업스트림 호출 수를 줄인다. 캐시가 비어 있는 순간에 몰리는 요청을 막는 데 유용하다.
+Streaming responses let users see the first tokens within a few hundred milliseconds, even when the full summary takes several seconds.
+"""
+
+
+def load_documents(corpus: Path, size: int) -> list[tuple[str, str]]:
+    pages = sorted(corpus.glob("*.html"))
+    if not pages:
+        text = (SAMPLE.strip() + "\n") * (size // len(SAMPLE) + 1)
+        return [(SAMPLE_TITLE, text[:size])]
+    extractor = get_extractor("htmlparser")
+    documents = []
+    for path in pages:
+        title, text = extractor.extract(path.read_text(encoding="utf-8", errors="replace"), path.name, size)
+        if text:
+            documents.append((title, text[:size]))
+    return documents
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=ROOT / "corpus")
+    parser.add_argument("--size", type=int, default=5000, help="characters per document")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--sentences", type=int, default=5)
+    parser.add_argument("--show", action="store_true", help="print the summary of the first document")
+    args = parser.parse_args()
+
+    documents = load_documents(args.corpus, args.size)
+    print(f"documents: {len(documents)}, ~{args.size} chars each, repeat {args.repeat}")
+    print(f"{'method':<10}{'median ms':>12}{'p95 ms':>10}{'max ms':>10}")
+    for method in METHODS:
+        summarize_extractive(*documents[0], args.sentences, method)  # warm up
+        timings = []
+        for _ in range(args.repeat):
+            for title, text in documents:
+                started = time.perf_counter()
+                summarize_extractive(title, text, args.sentences, method)
+                timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{method:<10}{statistics.median(timings):>12.2f}{p95:>10.2f}{timings[-1]:>10.2f}")
+
+    if args.show:
+        title, text = documents[0]
+        print(f"\n{title}")
+        for sentence in summarize_extractive(title, text, args.sentences):
+            print(f"- {sentence}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Compare extractor backends over the stored corpus: pages/sec, peak RSS and parity with bs4.
+
+Each backend runs in its own subprocess so peak RSS is not shared between them.
+
+    python benchmarks/fetch_corpus.py
+    python benchmarks/bench_extractors.py --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+from backend.services.extractors import EXTRACTORS, SoupExtractor, get_extractor  # noqa: E402
+
+REFERENCE = SoupExtractor.name
+
+
+def load_corpus(corpus: Path) -> list[tuple[str, str]]:
+    return [(path.name, path.read_text(encoding="utf-8", errors="replace")) for path in sorted(corpus.glob("*.html"))]
+
+
+def run_worker(backend: str, corpus: Path, repeat: int, text_budget: int) -> dict:
+    pages = load_corpus(corpus)
+    extractor = get_extractor(backend)
+    if extractor.name != backend:
+        return {"backend": backend, "error": f"{backend} 추출기를 불러오지 못했습니다."}
+    outputs = {}
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name, html in pages:
+            outputs[name] = extractor.extract(html, name, text_budget)
+    elapsed = time.perf_counter() - started
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    return {
+        "backend": backend,
+        "pages": len(pages) * repeat,
+        "seconds": elapsed,
+        "pagesPerSec": (len(pages) * repeat) / elapsed if elapsed else None,
+        "peakRssMb": round(rss_mb, 1),
+        "outputs": outputs,
+    }
+
+
+def parity(reference: dict, candidate: dict) -> dict:
+    exact = 0
+    ratios = []
+    for name, (ref_title, ref_text) in reference.items():
+        title, text = candidate.get(name, ("", ""))
+        if (title, text) == (ref_title, ref_text):
+            exact += 1
+            ratios.append(1.0)
+        else:
+            ratios.append(difflib.SequenceMatcher(None, ref_text, text, autojunk=False).ratio())
+    total = len(reference) or 1
+    return {"exact": exact / total, "meanSimilarity": sum(ratios) / total}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=ROOT / "corpus")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--text-budget", type=int, default=5000)
+    parser.add_argument("--backends", default=",".join(EXTRACTORS))
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(run_worker(args.worker, args.corpus, args.repeat, args.text_budget), sys.stdout)
+        return 0
+
+    if not load_corpus(args.corpus):
+        print(f"{args.corpus}에 HTML 파일이 없습니다. 먼저 benchmarks/fetch_corpus.py를 실행하세요.")
+        return 1
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if REFERENCE not in backends:
+        backends.insert(0, REFERENCE)
+    results = {}
+    for backend in backends:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", backend, "--corpus", str(args.corpus),
+             "--repeat", str(args.repeat), "--text-budget", str(args.text_budget)],
+            capture_output=True, text=True, check=True,
+        )
+        results[backend] = json.loads(proc.stdout)
+
+    reference = results[REFERENCE]["outputs"]
+    print(f"{'backend':<12}{'pages/sec':>12}{'peak RSS MB':>14}{'exact':>9}{'similarity':>12}")
+    for backend, result in results.items():
+        if "error" in result:
+            print(f"{backend:<12}  {result['error']}")
+            continue
+        match = parity(reference, result["outputs"])
+        print(
+            f"{backend:<12}{result['pagesPerSec']:>12.1f}{result['peakRssMb']:>14.1f}"
+            f"{match['exact']:>9.0%}{match['meanSimilarity']:>12.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
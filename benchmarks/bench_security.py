@@ -0,0 +1,100 @@
+"""Compare SecurityScanner throughput (MB/s) with the previous multi-pass implementation.
+
+``legacy`` is the old scan: ``html.lower()`` twice, then one ``in`` or ``str.count`` per
+keyword and tag. ``scan`` feeds a whole document to the current scanner and ``stream``
+feeds it in ``--chunk``-byte pieces, as the fetcher does during download.
+
+    python benchmarks/bench_security.py --size-mb 4 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+from backend.utils.security import SUSPICIOUS_KEYWORDS, SUSPICIOUS_TAGS, SecurityScanner  # noqa: E402
+
+ASCII_BLOCK = (
+    '<div class="post"><p>Connection pooling keeps sockets open between requests.</p>'
+    '<a href="/next" onclick="track()">next</a><script src="/app.js"></script></div>\n'
+)
+HANGUL_BLOCK = (
+    '<div class="기사"><p>캐시는 같은 요청을 반복해서 처리하지 않도록 해 준다.</p>'
+    '<a href="javascript:void(0)">더 보기</a><iframe src="/ad"></iframe></div>\n'
+)
+
+
+def legacy_counts(html: str) -> dict:
+    lowered = html.lower()
+    keywords = {kw: int(kw in lowered) for kw in SUSPICIOUS_KEYWORDS}
+    lowered = html.lower()
+    tags = {tag: lowered.count(f"<{tag}") for tag in SUSPICIOUS_TAGS}
+    return {**keywords, **tags}
+
+
+def scan_counts(html: str) -> dict:
+    scanner = SecurityScanner("", "", html)
+    return _normalize(scanner)
+
+
+def stream_counts(body: bytes, chunk: int) -> dict:
+    scanner = SecurityScanner("", "")
+    for start in range(0, len(body), chunk):
+        scanner.feed(body[start:start + chunk])
+    return _normalize(scanner)
+
+
+def _normalize(scanner: SecurityScanner) -> dict:
+    keywords = {kw: int(kw in scanner.keywords_found) for kw in SUSPICIOUS_KEYWORDS}
+    tags = {tag: scanner.tag_counts[tag.encode()] for tag in SUSPICIOUS_TAGS}
+    return {**keywords, **tags}
+
+
+def documents(size: int, corpus: Path) -> list[tuple[str, str]]:
+    docs = [
+        ("ascii", (ASCII_BLOCK * (size // len(ASCII_BLOCK) + 1))[:size]),
+        ("hangul", (HANGUL_BLOCK * (size // len(HANGUL_BLOCK.encode()) + 1))),
+    ]
+    for path in sorted(corpus.glob("*.html"))[:5]:
+        docs.append((path.name, path.read_text(encoding="utf-8", errors="replace")))
+    return docs
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=2.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=64 * 1024)
+    parser.add_argument("--corpus", type=Path, default=ROOT / "corpus")
+    args = parser.parse_args()
+
+    print(f"{'document':<24}{'MB':>7}{'legacy MB/s':>13}{'scan MB/s':>11}{'stream MB/s':>13}{'same counts':>13}")
+    for name, html in documents(int(args.size_mb * 1024 * 1024), args.corpus):
+        body = html.encode("utf-8")
+        megabytes = len(body) / (1024 * 1024)
+        legacy = best_of(args.repeat, lambda: legacy_counts(html))
+        scan = best_of(args.repeat, lambda: scan_counts(html))
+        stream = best_of(args.repeat, lambda: stream_counts(body, args.chunk))
+        same = legacy_counts(html) == scan_counts(html) == stream_counts(body, args.chunk)
+        print(
+            f"{name[:23]:<24}{megabytes:>7.2f}{megabytes / legacy:>13.1f}{megabytes / scan:>11.1f}"
+            f"{megabytes / stream:>13.1f}{str(same):>13}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
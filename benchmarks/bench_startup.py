@@ -0,0 +1,106 @@
+"""Measure cold-start import time and fail when it exceeds a budget.
+
+Each run imports ``--module`` in a fresh interpreter with ``python -X importtime``
+and reads the cumulative time of the top-level import. The script prints the
+median and the slowest imported packages. It also checks that heavy optional
+dependencies (``--forbid``) are still loaded lazily. It exits with status 1 when
+the median is over ``--budget-ms`` or a forbidden module was imported.
+``tests/test_startup.py`` runs the same checks under pytest.
+
+    python benchmarks/bench_startup.py --repeat 5 --budget-ms 150
+    python benchmarks/bench_startup.py --module backend.wsgi --budget-ms 0 --forbid ""
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# "import time:      self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+DEFAULT_FORBID = "numpy,bs4,httpx,requests,flask_cors"
+DEFAULT_BUDGET_MS = 150.0
+
+
+def import_once(module: str, forbid: list[str]) -> tuple[float, dict[str, float], list[str]]:
+    """Import ``module`` in a new interpreter; return total ms, per-package self ms and forbidden modules seen."""
+    probe = (
+        f"import sys, {module}\n"
+        f"print(','.join(name for name in {forbid!r} if name in sys.modules))"
+    )
+    env = {
+        **os.environ,
+        # A dummy key keeps the import from failing; nothing is sent upstream during import.
+        "PERPLEXITY_API_KEY": os.environ.get("PERPLEXITY_API_KEY", "pplx-startup-bench"),
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT.parent,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    packages: dict[str, float] = defaultdict(float)
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        packages[name.split(".")[0]] += int(self_us) / 1000
+        if name == module and len(indent) == 1:
+            total_us = int(cumulative_us)
+    loaded = [name for name in proc.stdout.strip().split(",") if name]
+    return total_us / 1000, dict(packages), loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="backend.app")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="0 disables the time check")
+    parser.add_argument("--forbid", default=DEFAULT_FORBID, help="comma-separated modules that must stay unloaded")
+    args = parser.parse_args()
+
+    forbid = [name.strip() for name in args.forbid.split(",") if name.strip()]
+    totals: list[float] = []
+    packages: dict[str, list[float]] = defaultdict(list)
+    loaded: set[str] = set()
+    for _ in range(max(1, args.repeat)):
+        total, per_package, seen = import_once(args.module, forbid)
+        totals.append(total)
+        for name, ms in per_package.items():
+            packages[name].append(ms)
+        loaded.update(seen)
+
+    median = statistics.median(totals)
+    print(f"import {args.module}: median {median:.1f} ms (min {min(totals):.1f}, max {max(totals):.1f}, n={len(totals)})")
+    print(f"\n{'package':<28}{'self ms':>10}")
+    slowest = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, samples in slowest[:args.top]:
+        print(f"{name:<28}{statistics.median(samples):>10.1f}")
+
+    failed = False
+    if args.budget_ms and median > args.budget_ms:
+        print(f"\nFAIL: median import time {median:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if loaded:
+        print(f"\nFAIL: imported eagerly: {', '.join(sorted(loaded))}")
+        failed = True
+    if not failed:
+        print("\nOK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Download the pages listed in corpus_urls.txt into benchmarks/corpus/ for the extractor benchmark."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+from backend.services.content_fetcher import BASE_HEADERS  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--urls", type=Path, default=ROOT / "corpus_urls.txt")
+    parser.add_argument("--out", type=Path, default=ROOT / "corpus")
+    args = parser.parse_args()
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    urls = [line.strip() for line in args.urls.read_text().splitlines() if line.strip() and not line.startswith("#")]
+    failures = 0
+    for url in urls:
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12] + ".html"
+        try:
+            response = requests.get(url, headers=BASE_HEADERS, timeout=15)
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            print(f"skip {url}: {exc}")
+            failures += 1
+            continue
+        (args.out / name).write_text(response.text, encoding="utf-8")
+        print(f"saved {url} -> {name} ({len(response.content)} bytes)")
+    return 1 if failures == len(urls) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""Load-test the gunicorn deployment against a local stub upstream: requests/sec and p50/p99 per route.
+
+The script starts a stub server that plays the web pages, the Perplexity API and
+the MediaWiki API (with a configurable delay). It then launches
+``gunicorn -c gunicorn.conf.py`` pointed at the stub and drives each scenario
+with a fixed number of concurrent clients for a fixed duration. Pass
+``--target`` to test an already running server instead. Its upstream URLs
+must then point at a stub started with ``--stub-only``.
+
+    python benchmarks/loadtest.py --duration 10 --concurrency 32
+    python benchmarks/loadtest.py --stub-only --stub-port 9100
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PARAGRAPH = (
+    "Connection pooling keeps sockets open between requests so the TLS handshake is paid once. "
+    "캐시는 같은 요청을 반복해서 처리하지 않도록 해 주며 본문 해시로 저장하면 주소가 바뀌어도 재사용된다. "
+)
+
+
+class StubUpstream(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.05
+
+    def log_message(self, *args) -> None:  # noqa: D401 - silence per-request logging
+        pass
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        if parsed.path.endswith("/api.php"):
+            time.sleep(self.latency)
+            return self._json(_wiki_response({k: v[0] for k, v in parse_qs(parsed.query).items()}))
+        body = "".join(f"<p>{parsed.path} #{i}. {PARAGRAPH}</p>" for i in range(20))
+        html = f"<html><head><title>Stub {parsed.path}</title></head><body><article>{body}</article></body></html>"
+        self._send(200, "text/html; charset=utf-8", html.encode())
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.latency)
+        prompt = " ".join(message.get("content", "") for message in request.get("messages", []))
+        if "JSON" in prompt:
+            content = json.dumps(
+                [{"title": "Stub resource", "summary": "stub", "url": f"https://stub.example/{abs(hash(prompt))}"}]
+            )
+        else:
+            content = "- 스텁 요약 첫 줄\n- stub summary second line"
+        self._json({"choices": [{"message": {"content": content}}], "citations": []})
+
+    def _json(self, payload: dict) -> None:
+        self._send(200, "application/json", json.dumps(payload, ensure_ascii=False).encode())
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _wiki_response(query: dict) -> dict:
+    if query.get("list") == "search":
+        return {"query": {"search": [{"title": query.get("srsearch", "")}]}}
+    pages = [
+        {"title": title, "extract": f"{title}은(는) 부하 테스트용 문서이다.", "canonicalurl": f"https://stub.wiki/{title}"}
+        for title in query.get("titles", "").split("|")
+    ]
+    return {"query": {"pages": pages}}
+
+
+def start_stub(port: int, latency: float) -> ThreadingHTTPServer:
+    StubUpstream.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubUpstream)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def scenarios(stub: str) -> dict:
+    """Route name → function(sequence number) returning (method, path, json body or params)."""
+    return {
+        "health": lambda n: ("GET", "/health", None),
+        "summarize (cached)": lambda n: ("POST", "/api/summarize-url", {"url": f"{stub}/hot/{n % 20}"}),
+        "summarize (miss)": lambda n: ("POST", "/api/summarize-url", {"url": f"{stub}/page/{n}"}),
+        "summarize fast": lambda n: ("POST", "/api/summarize-url", {"url": f"{stub}/fast/{n}", "mode": "fast"}),
+        "wiki search": lambda n: ("GET", "/api/wiki/search", {"term": f"키워드{n}", "lang": "ko"}),
+        "resources search": lambda n: ("POST", "/api/resources/search", {"keywords": [f"topic{n}", f"topic{n + 1}"]}),
+    }
+
+
+def drive(target: str, build, duration: float, concurrency: int) -> dict:
+    counter = itertools.count()
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client() -> None:
+        nonlocal errors
+        session = requests.Session()
+        while time.monotonic() < stop_at:
+            method, path, body = build(next(counter))
+            started = time.perf_counter()
+            try:
+                if method == "GET":
+                    response = session.get(target + path, params=body, timeout=60)
+                else:
+                    response = session.post(target + path, json=body, timeout=60)
+                ok = response.status_code < 400
+            except requests.RequestException:
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                errors += not ok
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.monotonic() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / wall if wall else 0.0,
+        "p50": _percentile(latencies, 0.50),
+        "p99": _percentile(latencies, 0.99),
+    }
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def launch_gunicorn(port: int, stub: str, workers: int, threads: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "BACKEND_PORT": str(port),
+        "PERPLEXITY_API_KEY": os.environ.get("PERPLEXITY_API_KEY", "pplx-loadtest"),
+        "PERPLEXITY_API_URL": f"{stub}/chat/completions",
+        "PERPLEXITY_RATE_PER_MINUTE": "0",
+        "WIKI_API_URL": f"{stub}/w/{{lang}}/api.php",
+        "SUMMARY_CACHE_BACKEND": "memory",
+        "WSGI_WORKERS": str(workers),
+        "WSGI_THREADS": str(threads),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--access-logfile", "/dev/null"],
+        cwd=ROOT,
+        env=env,
+    )
+
+
+def wait_ready(target: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{target}/health", timeout=2).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{target}가 {timeout:.0f}초 안에 응답하지 않았습니다.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="already running server, e.g. http://127.0.0.1:8000")
+    parser.add_argument("--port", type=int, default=8055, help="port for the spawned gunicorn")
+    parser.add_argument("--stub-port", type=int, default=0)
+    parser.add_argument("--stub-only", action="store_true", help="only run the stub upstream")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="seconds per stub API call")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per route")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--routes", help="comma separated subset of route names")
+    args = parser.parse_args()
+
+    stub_server = start_stub(args.stub_port, args.upstream_latency)
+    stub = f"http://127.0.0.1:{stub_server.server_port}"
+    if args.stub_only:
+        print(f"stub upstream: {stub} (Ctrl+C로 종료)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            return 0
+
+    process = None
+    target = args.target
+    if target is None:
+        process = launch_gunicorn(args.port, stub, args.workers, args.threads)
+        target = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_ready(target)
+        selected = scenarios(stub)
+        if args.routes:
+            wanted = {name.strip() for name in args.routes.split(",")}
+            selected = {name: build for name, build in selected.items() if name in wanted}
+        print(f"target {target}, stub {stub}, {args.concurrency} clients × {args.duration:.0f}s per route")
+        print(f"{'route':<20}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, build in selected.items():
+            result = drive(target, build, args.duration, args.concurrency)
+            print(
+                f"{name:<20}{result['requests']:>10}{result['errors']:>8}{result['rps']:>10.1f}"
+                f"{result['p50']:>10.1f}{result['p99']:>10.1f}"
+            )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=60)
+        stub_server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
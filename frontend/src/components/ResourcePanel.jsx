@@ -70,6 +70,7 @@ export default function ResourcePanel({ apiBase }) {
               <div className="resource-card__meta">
                 <h3>{item.title}</h3>
                 {item.via && <span className={`tag tag--${item.via}`}>{item.via}</span>}
+                {item.keyword && <span className="tag">#{item.keyword}</span>}
               </div>
               <p>{item.summary}</p>
               {item.url && (
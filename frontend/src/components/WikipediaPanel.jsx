@@ -78,21 +78,22 @@ export default function WikipediaPanel({ apiBase }) {
             {result.summary ? (
               <pre className="panel__summary">{result.summary}</pre>
             ) : (
+              <p>{result.message || "결과를 찾지 못했습니다."}</p>
+            )}
+            {result.options?.length ? (
               <>
-                <p>{result.message || "결과를 찾지 못했습니다."}</p>
-                {result.options?.length ? (
-                  <ul className="option-list">
-                    {result.options.map((option) => (
-                      <li key={option}>
-                        <button type="button" className="chip" onClick={() => search(option, true)} disabled={loading}>
-                          {option}
-                        </button>
-                      </li>
-                    ))}
-                  </ul>
-                ) : null}
+                {result.summary && <p>다른 뜻으로 찾으셨나요?</p>}
+                <ul className="option-list">
+                  {result.options.map((option) => (
+                    <li key={option}>
+                      <button type="button" className="chip" onClick={() => search(option, true)} disabled={loading}>
+                        {option}
+                      </button>
+                    </li>
+                  ))}
+                </ul>
               </>
-            )}
+            ) : null}
           </article>
         </div>
       )}
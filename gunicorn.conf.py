@@ -0,0 +1,52 @@
+"""gunicorn settings for the Flask backend, driven by ``backend.config.Settings``.
+
+    gunicorn -c gunicorn.conf.py backend.wsgi:app
+
+Threaded workers (``gthread``) suit this app: requests mostly wait on page fetches
+and Perplexity, so one process serves many of them concurrently. Each worker
+has its own caches, connection pools and Perplexity rate limiter.
+"""
+import multiprocessing
+
+from backend.config import settings
+
+wsgi_app = "backend.wsgi:app"
+bind = f"0.0.0.0:{settings.backend_port}"
+preload_app = True
+worker_class = "gthread"
+workers = settings.wsgi_workers or multiprocessing.cpu_count() * 2 + 1
+threads = settings.wsgi_threads
+timeout = settings.wsgi_timeout
+graceful_timeout = settings.wsgi_graceful_timeout
+keepalive = settings.wsgi_keepalive
+max_requests = settings.wsgi_max_requests
+max_requests_jitter = settings.wsgi_max_requests // 10
+accesslog = "-"
+
+
+def worker_abort(worker):
+    worker.log.warning("worker %s exceeded the %ss request timeout", worker.pid, timeout)
+
+
+def post_worker_init(worker):
+    # Background threads are started per worker, never in the preloading master. The worker
+    # accepts requests only after this returns, so seeds are warm before it takes traffic.
+    from backend.common import start_background_work  # pylint: disable=import-outside-toplevel
+    from backend.wsgi import app  # pylint: disable=import-outside-toplevel
+
+    start_background_work(app.config["job_queue"], app.config["prewarmer"])
+
+
+def worker_exit(server, worker):
+    # gthread has already waited for in-flight requests (up to graceful_timeout); give
+    # Perplexity calls still running on background pools the same grace before exiting.
+    # Unfinished jobs go back to the queue for the other workers.
+    from backend.common import drain_upstream  # pylint: disable=import-outside-toplevel
+    from backend.wsgi import app  # pylint: disable=import-outside-toplevel
+
+    if app.config["prewarmer"] is not None:
+        app.config["prewarmer"].stop()
+    if app.config["job_queue"] is not None:
+        app.config["job_queue"].stop(graceful_timeout)
+    if not drain_upstream(graceful_timeout):
+        server.log.warning("worker %s exited with Perplexity calls still in flight", worker.pid)
@@ -0,0 +1,8 @@
+"""ASGI entrypoint: `python run_asgi.py` serves backend.asgi with uvicorn."""
+import uvicorn
+
+from backend.config import settings
+
+
+if __name__ == "__main__":
+    uvicorn.run("backend.asgi:app", host="0.0.0.0", port=settings.backend_port)
@@ -0,0 +1,42 @@
+"""Buffered (bs4) sessions stop early at the text budget without changing the extracted text."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.services.extractors import SoupExtractor  # noqa: E402
+
+PARAGRAPH = "<p>Connection pooling keeps sockets open between requests to the same host.</p>\n"
+PAGE = "<html><head><title>Pooling</title><script>var x = 1;</script></head><body>" + PARAGRAPH * 400 + "</body></html>"
+CHUNK = 4096
+
+
+def feed_until_done(session, html: str) -> int:
+    """Feed ``html`` in chunks like the fetcher does; return how many characters were fed."""
+    fed = 0
+    while fed < len(html) and not session.done:
+        session.feed(html[fed:fed + CHUNK])
+        fed += CHUNK
+    return fed
+
+
+def test_bs4_session_stops_once_budget_is_full():
+    session = SoupExtractor().start(text_budget=2000)
+    fed = feed_until_done(session, PAGE)
+    assert session.done
+    assert fed < len(PAGE) // 4
+
+
+def test_bs4_session_text_matches_whole_document_extraction():
+    extractor = SoupExtractor()
+    session = extractor.start(text_budget=2000)
+    feed_until_done(session, PAGE)
+    assert session.finish("fallback") == extractor.extract(PAGE, "fallback", 2000)
+
+
+def test_bs4_session_reads_everything_under_budget():
+    session = SoupExtractor().start(text_budget=10 ** 6)
+    assert feed_until_done(session, PAGE) >= len(PAGE)
+    assert not session.done
@@ -0,0 +1,48 @@
+"""Job queue: jobs run without an explicit start() and workers survive database errors."""
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.services.job_queue import JobQueue  # noqa: E402
+
+
+def make_queue(tmp_path: Path) -> JobQueue:
+    return JobQueue(str(tmp_path / "jobs.db"), {"echo": lambda params: params}, workers=1, lease=3, poll_interval=0.05)
+
+
+def test_submit_starts_workers_when_host_did_not(tmp_path):
+    queue = make_queue(tmp_path)
+    job = queue.submit("echo", {"value": 1})
+    try:
+        assert queue.wait(job["jobId"], 5)["result"] == {"value": 1}
+    finally:
+        queue.stop(1)
+
+
+def test_worker_and_lease_threads_survive_database_errors(tmp_path, monkeypatch):
+    queue = make_queue(tmp_path)
+    claim, maintain_once = queue._claim, queue._maintain_once
+    errors = {"claim": 2, "maintain": 2}
+
+    def flaky(name, fn):
+        def wrapper(*args):
+            if errors[name]:
+                errors[name] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            return fn(*args)
+        return wrapper
+
+    monkeypatch.setattr(queue, "_claim", flaky("claim", claim))
+    monkeypatch.setattr(queue, "_maintain_once", flaky("maintain", maintain_once))
+    job = queue.submit("echo", {"value": 2})
+    try:
+        assert queue.wait(job["jobId"], 5)["status"] == "done"
+        queue._stop.wait(2.5)
+        assert errors == {"claim": 0, "maintain": 0}
+        assert all(thread.is_alive() for thread in queue._threads)
+    finally:
+        queue.stop(1)
@@ -0,0 +1,52 @@
+"""Long-document chunking: boundaries are stable, so an edit invalidates only the chunk it touches."""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.services.long_summary import chunk_text, merge_partials  # noqa: E402
+from backend.services.prompt_builder import estimate_tokens  # noqa: E402
+
+MODEL = "sonar"
+CHUNK_TOKENS = 1500
+WORDS = "pool socket latency cache queue request thread lease worker summary chunk token budget".split()
+EDIT = " The pool now keeps idle sockets for ninety seconds."
+
+
+def make_paragraphs(count: int = 60) -> list[str]:
+    rng = random.Random(0)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 120))) + "." for _ in range(count)]
+
+
+def changed_chunks(before: list[str], after: list[str]) -> int:
+    return len(set(after) - set(before))
+
+
+def test_chunks_cover_the_text_within_the_limit():
+    paragraphs = make_paragraphs()
+    chunks = chunk_text("\n".join(paragraphs), MODEL, CHUNK_TOKENS)
+    assert len(chunks) > 1
+    assert "\n".join(chunks) == "\n".join(paragraphs)
+    assert all(estimate_tokens(chunk, MODEL) <= CHUNK_TOKENS for chunk in chunks)
+
+
+def test_edit_invalidates_only_the_affected_chunk():
+    paragraphs = make_paragraphs()
+    before = chunk_text("\n".join(paragraphs), MODEL, CHUNK_TOKENS)
+    for index in (1, len(paragraphs) // 2):
+        edited = list(paragraphs)
+        edited[index] += EDIT
+        after = chunk_text("\n".join(edited), MODEL, CHUNK_TOKENS)
+        assert changed_chunks(before, after) == 1, f"edit of paragraph {index}"
+        assert sum(EDIT.strip() in chunk for chunk in after) == 1
+
+
+def test_partials_are_merged_to_max_chunks_in_order():
+    partials = [f"note {index}" for index in range(10)]
+    merged = merge_partials(partials, 4)
+    assert len(merged) <= 4
+    assert "\n".join(merged) == "\n".join(partials)
+    assert merge_partials(partials[:3], 4) == partials[:3]
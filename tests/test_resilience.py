@@ -0,0 +1,74 @@
+"""Circuit breaker: a half-open probe that ends without a requests error must not wedge the breaker."""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.services.resilience import CircuitBreaker, RetryPolicy, TokenBucket, UpstreamGuard  # noqa: E402
+
+RESET = 0.05
+
+
+def make_guard() -> UpstreamGuard:
+    return UpstreamGuard(
+        TokenBucket(0, 1),
+        CircuitBreaker(failure_threshold=1, reset_timeout=RESET),
+        RetryPolicy(max_attempts=1, deadline=5, base_delay=0, max_delay=0),
+        timeout=5,
+    )
+
+
+def open_breaker(guard: UpstreamGuard) -> None:
+    def fail(_timeout):
+        raise requests.ConnectionError("down")
+
+    with pytest.raises(requests.ConnectionError):
+        guard.call(fail)
+    assert guard.breaker.state == "open"
+    time.sleep(RESET * 1.5)
+
+
+def test_probe_failing_with_non_requests_error_reopens_then_recovers():
+    guard = make_guard()
+    open_breaker(guard)
+
+    def bad_json(_timeout):
+        raise ValueError("Expecting value: line 1 column 1")
+
+    with pytest.raises(ValueError):
+        guard.call(bad_json)
+    assert guard.breaker.state == "open"
+    time.sleep(RESET * 1.5)
+    assert guard.call(lambda _timeout: "ok") == "ok"
+    assert guard.breaker.state == "closed"
+
+
+def test_cancelled_async_probe_frees_the_probe_slot():
+    guard = make_guard()
+    open_breaker(guard)
+
+    async def main():
+        async def hang(_timeout):
+            await asyncio.sleep(10)
+
+        probe = asyncio.create_task(guard.acall(hang))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        async def ok(_timeout):
+            return "ok"
+
+        return await guard.acall(ok)
+
+    assert asyncio.run(main()) == "ok"
+    assert guard.breaker.state == "closed"
+    assert guard.inflight == 0
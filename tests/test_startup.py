@@ -0,0 +1,25 @@
+"""Cold-start regression checks: importing the app stays under budget and heavy dependencies stay lazy."""
+from __future__ import annotations
+
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from bench_startup import DEFAULT_BUDGET_MS, DEFAULT_FORBID, import_once  # noqa: E402
+
+FORBID = DEFAULT_FORBID.split(",")
+REPEAT = 3
+
+
+def test_app_import_within_budget():
+    totals = [import_once("backend.app", FORBID)[0] for _ in range(REPEAT)]
+    median = statistics.median(totals)
+    assert median > 0, "importtime output did not include backend.app"
+    assert median <= DEFAULT_BUDGET_MS, f"import backend.app took {median:.1f} ms (budget {DEFAULT_BUDGET_MS:.0f} ms)"
+
+
+def test_app_import_keeps_heavy_dependencies_lazy():
+    _, _, loaded = import_once("backend.app", FORBID)
+    assert loaded == [], f"imported eagerly: {', '.join(loaded)}"